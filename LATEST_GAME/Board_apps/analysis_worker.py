@@ -0,0 +1,114 @@
+"""
+Preemptible Position Analysis
+file: /AI_Chess_Senior_Design/Board_apps/analysis_worker.py
+
+A Pi that is not playing (the white Pi in user vs CPU) is used by the GUI
+server as an analysis worker: /api/analyze runs a full-strength search of a
+position (no ELO limit, skill 20, several lines) for hints, the eval bar
+and post-game annotation. Play always comes first:
+
+    with analysis_worker.playing():
+        ... engine.analysis(...) / engine.configure(...) for the game ...
+
+stops a running analysis (its partial result is still returned, marked
+preempted) and keeps new ones from starting until the block ends. An
+analysis asked for while the engine is playing is refused right away
+instead of waiting.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+
+import chess
+import chess.engine
+
+from engine_info import SEARCH_INFO, search_info
+
+# Options for the analysis search only; the game settings are restored afterwards
+ANALYSIS_OPTIONS = {"UCI_LimitStrength": False, "Skill Level": 20}
+
+
+class AnalysisWorker:
+    """One analysis at a time on the Pi's engine, always yielding to play"""
+
+    def __init__(self):
+        self._engine_lock = threading.Lock()    # held while the engine analyses or plays
+        self._state_lock = threading.Lock()
+        self._running = None                    # engine.analysis() of the running analysis
+        self._play_waiting = 0
+        self.completed = 0
+        self.preempted = 0
+        self.refused = 0
+
+    @contextmanager
+    def playing(self):
+        """Hold the engine for the game; a running analysis is stopped first"""
+        with self._state_lock:
+            self._play_waiting += 1
+            if self._running is not None:
+                self._running.stop()
+        self._engine_lock.acquire()
+        with self._state_lock:
+            self._play_waiting -= 1
+        try:
+            yield
+        finally:
+            self._engine_lock.release()
+
+    def analyse(self, engine, board, seconds, multipv=1, root_moves=None):
+        """Full-strength analysis of board for up to seconds
+
+        root_moves limits the search to those moves (UCI searchmoves), so the
+        GUI server can split one position's moves across several Pis.
+        Returns a dict with one search_info() entry per line (best first),
+        or None when the engine is busy playing.
+        """
+        if not self._engine_lock.acquire(blocking=False):
+            self.refused += 1
+            return None
+        try:
+            options = {name: value for name, value in ANALYSIS_OPTIONS.items() if name in engine.options}
+            start = time.perf_counter()
+            with engine.analysis(board, chess.engine.Limit(time=seconds), multipv=multipv,
+                                 info=SEARCH_INFO, root_moves=root_moves, options=options) as analysis:
+                with self._state_lock:
+                    self._running = analysis
+                    if self._play_waiting:
+                        # A move was asked for between our lock and here
+                        analysis.stop()
+                try:
+                    analysis.wait()
+                finally:
+                    with self._state_lock:
+                        self._running = None
+                        preempted = self._play_waiting > 0
+            elapsed = time.perf_counter() - start
+            # search_info() gives the PV in SAN; 'move' is the line's first move in UCI
+            lines = [dict(search_info(info, board, elapsed), move=info['pv'][0].uci())
+                     for info in analysis.multipv if info.get('pv')]
+        finally:
+            self._engine_lock.release()
+
+        if preempted:
+            self.preempted += 1
+        else:
+            self.completed += 1
+        return {
+            'fen': board.fen(),
+            'searchmoves': [move.uci() for move in root_moves] if root_moves else None,
+            'lines': lines,
+            'depth': lines[0]['depth'] if lines else None,
+            'budget': seconds,
+            'elapsed': round(elapsed, 4),
+            'preempted': preempted
+        }
+
+    def stats(self):
+        return {
+            'running': self._running is not None,
+            'completed': self.completed,
+            'preempted': self.preempted,
+            'refused': self.refused,
+            'play_waiting': self._play_waiting
+        }
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Display Animation Benchmark
+file: /AI_Chess_Senior_Design/Board_apps/bench_display.py
+
+Runs every RingLed effect and LCD screen against the in-memory framebuffer
+backends and reports frames per second, CPU time per frame and frame-time
+jitter. Needs no Pi hardware, so it can run on any Linux box.
+
+Usage:
+    python bench_display.py                 # all effects, real frame delays
+    python bench_display.py --no-delay      # skip sleeps, measure render cost only
+    python bench_display.py --only lcd      # just the LCD screens
+    python bench_display.py --burst 0.05    # LCD output thread fed a scene every 50 ms
+"""
+
+import argparse
+import statistics
+import time
+
+from display_backends import FramebufferPixels, FramebufferDisplay
+from display_output import DisplayOutputThread
+from LED_Program import RingLed, num_pixels, ORDER
+from lcd_animation import LCD
+
+RING_EFFECTS = ['game_win', 'game_lose', 'game_draw', 'under_attack', 'thinking']
+LCD_SCREENS = [
+    ('selection', None),
+    ('victory', None),
+    ('lose', None),
+    ('score', 42),
+    ('prob', 73),
+    ('draw', None),
+    ('off', None),
+]
+
+
+def frame_stats(timestamps, cpu_seconds, wall_seconds):
+    """Summarize a run from its frame timestamps and measured CPU/wall time"""
+    frames = len(timestamps)
+    intervals = [b - a for a, b in zip(timestamps, timestamps[1:])]
+    return {
+        'frames': frames,
+        'fps': frames / wall_seconds if wall_seconds > 0 else 0.0,
+        'cpu_ms_per_frame': (cpu_seconds * 1000 / frames) if frames else 0.0,
+        'mean_frame_ms': statistics.mean(intervals) * 1000 if intervals else 0.0,
+        'jitter_ms': statistics.pstdev(intervals) * 1000 if len(intervals) > 1 else 0.0,
+    }
+
+
+def run_timed(fn, frames):
+    """Call fn() and return stats for the frames it appended to the given list"""
+    start_index = len(frames)
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    fn()
+    cpu_seconds = time.process_time() - cpu_start
+    wall_seconds = time.perf_counter() - wall_start
+    timestamps = [frame[0] for frame in frames[start_index:]]
+    return frame_stats(timestamps, cpu_seconds, wall_seconds)
+
+
+def bench_ring(sleep):
+    """Benchmark every RingLed effect"""
+    pixels = FramebufferPixels(num_pixels, brightness=0.3, bpp=len(ORDER))
+    ring = RingLed(pixels=pixels, sleep=sleep)
+    results = []
+    for effect in RING_EFFECTS:
+        stats = run_timed(getattr(ring, effect), pixels.frames)
+        results.append((f"ring.{effect}", stats))
+    return results
+
+
+def bench_lcd(sleep, repeat):
+    """Benchmark every LCD screen (static screens are repeated to get a stable rate)"""
+    disp = FramebufferDisplay()
+    lcd = LCD(disp=disp, sleep=sleep)
+    results = []
+    for screen, value in LCD_SCREENS:
+        def draw_screen():
+            for _ in range(repeat):
+                lcd.show_screen(screen, value)
+        stats = run_timed(draw_screen, disp.frames)
+        sent = sum(frame[2] for frame in disp.frames[-stats['frames']:]) if stats['frames'] else 0
+        stats['spi_kb_per_frame'] = sent / 1024 / stats['frames'] if stats['frames'] else 0.0
+        results.append((f"lcd.{screen}", stats))
+    return results
+
+
+def bench_output_thread(interval, count=100):
+    """Feed the LCD output thread a scene every `interval` seconds, like a maxed speed slider
+
+    Mixes score updates with the victory animation, which takes far longer than
+    the interval, and reports how many submissions were dropped or cut short.
+    """
+    disp = FramebufferDisplay()
+    output = DisplayOutputThread(LCD(disp=disp), name='lcd')
+    latencies = []
+    for i in range(count):
+        start = time.perf_counter()
+        if i % 10 == 9:
+            output.show_screen('victory')
+        else:
+            output.show_screen('score', i)
+        latencies.append(time.perf_counter() - start)
+        time.sleep(interval)
+    output.flush(timeout=5.0)
+    output.close()
+    stats = output.stats()
+    print(f"output thread: {stats['submitted']} submitted, {stats['displayed']} displayed, "
+          f"{stats['dropped']} dropped, {stats['interrupted']} interrupted, "
+          f"{len(disp.frames)} SPI writes")
+    print(f"caller blocked: max {max(latencies) * 1000:.3f} ms, "
+          f"mean {statistics.mean(latencies) * 1000:.3f} ms per submission")
+
+
+def print_results(results):
+    print(f"{'effect':<20}{'frames':>8}{'fps':>10}{'cpu ms/f':>10}{'mean ms':>10}{'jitter ms':>11}{'SPI KB/f':>10}")
+    print("-" * 79)
+    for name, stats in results:
+        spi = stats.get('spi_kb_per_frame')
+        spi_text = f"{spi:>10.1f}" if spi is not None else f"{'-':>10}"
+        print(f"{name:<20}{stats['frames']:>8}{stats['fps']:>10.1f}{stats['cpu_ms_per_frame']:>10.3f}"
+              f"{stats['mean_frame_ms']:>10.3f}{stats['jitter_ms']:>11.3f}{spi_text}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark board LED/LCD animations off-device")
+    parser.add_argument('--only', choices=['ring', 'lcd'], help="benchmark only one output")
+    parser.add_argument('--no-delay', action='store_true', help="skip frame delays (pure render cost)")
+    parser.add_argument('--repeat', type=int, default=20, help="repetitions of each LCD screen (default 20)")
+    parser.add_argument('--burst', type=float, metavar='SECONDS',
+                        help="instead, feed the LCD output thread a scene every SECONDS")
+    args = parser.parse_args()
+
+    if args.burst is not None:
+        bench_output_thread(args.burst)
+        return
+
+    sleep = (lambda seconds: None) if args.no_delay else time.sleep
+
+    results = []
+    if args.only in (None, 'ring'):
+        results += bench_ring(sleep)
+    if args.only in (None, 'lcd'):
+        results += bench_lcd(sleep, args.repeat)
+    print_results(results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,170 @@
+"""
+Output Backends for the Board Displays (NeoPixel ring + GC9A01A LCD)
+file: /AI_Chess_Senior_Design/Board_apps/display_backends.py
+
+The RingLed and LCD classes draw through these backends instead of talking to
+the hardware directly. On the Pi the hardware backends wrap the Adafruit
+drivers; anywhere else the framebuffer backends keep every frame in memory
+(with a timestamp) so the animations can be profiled and checked on a laptop.
+
+Select the backend with the DISPLAY_BACKEND environment variable:
+    DISPLAY_BACKEND=hardware     (default) real NeoPixel / GC9A01A
+    DISPLAY_BACKEND=framebuffer  in-memory recording, no Pi libraries needed
+"""
+
+import os
+import time
+
+DISPLAY_BACKEND = os.environ.get('DISPLAY_BACKEND', 'hardware').lower()
+
+# GC9A01A wiring and SPI speed on the board
+LCD_WIDTH = 240
+LCD_HEIGHT = 240
+LCD_BAUDRATE = 24000000
+
+
+class FramebufferPixels:
+    """In-memory stand-in for neopixel.NeoPixel
+
+    Supports the parts of the NeoPixel API the ring effects use (indexing,
+    fill, brightness, show). Each show() appends a frame to self.frames as
+    (timestamp, brightness, pixel tuple).
+    """
+
+    def __init__(self, num_pixels, brightness=1.0, bpp=4, clock=time.perf_counter):
+        self.n = num_pixels
+        self.bpp = bpp
+        self.brightness = brightness
+        self.auto_write = False
+        self.clock = clock
+        self.frames = []
+        self._buf = [(0,) * bpp] * num_pixels
+
+    def _color(self, color):
+        """Pad/trim a color tuple to this strip's bytes-per-pixel"""
+        color = tuple(int(c) for c in color)
+        if len(color) < self.bpp:
+            color = color + (0,) * (self.bpp - len(color))
+        return color[:self.bpp]
+
+    def __len__(self):
+        return self.n
+
+    def __getitem__(self, index):
+        return self._buf[index]
+
+    def __setitem__(self, index, color):
+        self._buf[index] = self._color(color)
+
+    def fill(self, color):
+        self._buf = [self._color(color)] * self.n
+
+    def show(self):
+        self.frames.append((self.clock(), self.brightness, tuple(self._buf)))
+
+    def deinit(self):
+        pass
+
+
+class FramebufferDisplay:
+    """In-memory stand-in for the GC9A01A display driver
+
+    image() and _block() accept the same arguments as adafruit_rgb_display's
+    DisplaySPI. Each call appends (timestamp, (x, y, width, height), bytes
+    that would go over SPI) to self.frames. Set keep_images=True to also keep
+    a copy of every frame (PIL image for image(), RGB565 bytes for _block()).
+    """
+
+    def __init__(self, width=LCD_WIDTH, height=LCD_HEIGHT, keep_images=False,
+                 clock=time.perf_counter):
+        self.width = width
+        self.height = height
+        self.rotation = 0
+        self.keep_images = keep_images
+        self.clock = clock
+        self.frames = []
+        self.images = []
+
+    def image(self, img, rotation=None, x=0, y=0):
+        if img.mode not in ("RGB", "RGBA"):
+            raise ValueError("Image must be in mode RGB or RGBA")
+        width, height = img.size
+        if x + width > self.width or y + height > self.height:
+            raise ValueError("Image must not exceed dimensions of display")
+        # RGB565 is 2 bytes per pixel on the wire
+        self.frames.append((self.clock(), (x, y, width, height), width * height * 2))
+        if self.keep_images:
+            self.images.append(img.copy())
+
+    def _block(self, x0, y0, x1, y1, data=None):
+        """Write raw RGB565 data to the inclusive window (x0, y0)-(x1, y1)"""
+        width = x1 - x0 + 1
+        height = y1 - y0 + 1
+        if x0 < 0 or y0 < 0 or x1 >= self.width or y1 >= self.height:
+            raise ValueError("Window must not exceed dimensions of display")
+        if data is not None and len(data) != width * height * 2:
+            raise ValueError("Data length does not match the window size")
+        self.frames.append((self.clock(), (x0, y0, width, height), width * height * 2))
+        if self.keep_images and data is not None:
+            self.images.append(bytes(data))
+
+    def fill(self, color=0):
+        self.frames.append((self.clock(), (0, 0, self.width, self.height),
+                            self.width * self.height * 2))
+
+
+def create_pixels(pixel_pin, num_pixels, order, brightness=0.3):
+    """Create the pixel buffer for the NeoPixel ring
+
+    Args:
+        pixel_pin: board pin name, e.g. 'D18'
+        num_pixels: number of LEDs on the ring
+        order: pixel order string, e.g. 'GRBW'
+        brightness: starting brightness (0.0-1.0)
+    """
+    if DISPLAY_BACKEND == 'framebuffer':
+        return FramebufferPixels(num_pixels, brightness=brightness, bpp=len(order))
+
+    import board
+    import neopixel
+    return neopixel.NeoPixel(getattr(board, pixel_pin), num_pixels, brightness=brightness,
+                             auto_write=False, pixel_order=order)
+
+
+def create_lcd_display():
+    """Create the GC9A01A round LCD driver (or its framebuffer stand-in)"""
+    if DISPLAY_BACKEND == 'framebuffer':
+        return FramebufferDisplay()
+
+    import board
+    import busio
+    import digitalio
+    from adafruit_rgb_display import gc9a01a
+
+    dc_pin = digitalio.DigitalInOut(board.D25)
+    reset_pin = digitalio.DigitalInOut(board.D27)
+
+    spi = busio.SPI(
+        clock=board.SCLK,
+        MOSI=board.MOSI,
+        MISO=None
+    )
+
+    # Wait for SPI to be ready (important on Pi 5)
+    while not spi.try_lock():
+        pass
+
+    spi.configure(baudrate=LCD_BAUDRATE, phase=0, polarity=0)
+    spi.unlock()
+
+    return gc9a01a.GC9A01A(
+        spi,
+        rotation=0,
+        width=LCD_WIDTH,
+        height=LCD_HEIGHT,
+        x_offset=0,
+        y_offset=0,
+        cs=None,
+        dc=dc_pin,
+        rst=reset_pin,
+    )
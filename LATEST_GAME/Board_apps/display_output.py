@@ -0,0 +1,125 @@
+"""
+Latest-Frame-Wins Output Thread for the Board Displays
+file: /AI_Chess_Senior_Design/Board_apps/display_output.py
+
+Wraps an LCD or RingLed so that drawing never blocks the caller. Calls such as
+display_lcd.show_screen("score", 10) are stored in a single pending slot (the
+back buffer) and return immediately; one output thread owns the device and
+draws whatever is pending (the front buffer). A newer submission replaces an
+older one that has not been drawn yet, so a burst of updates costs one draw
+instead of a queue of them, and a running animation is cut short as soon as
+something newer arrives.
+
+    display_lcd = DisplayOutputThread(LCD(), name='lcd')
+    display_lcd.show_screen("score", 10)    # returns straight away
+    display_lcd.stats()                     # submitted / displayed / dropped / interrupted
+"""
+
+import threading
+
+
+class _Superseded(Exception):
+    """Raised inside a running scene when a newer one has been submitted"""
+
+
+class DisplayOutputThread:
+    """Run the drawing methods of one display device on a dedicated thread
+
+    Any public method of the wrapped device can be called on this object; the
+    call is submitted instead of run. The device's sleep hook is replaced so
+    animation delays wake up (and abandon the scene) when a newer scene is
+    submitted.
+    """
+
+    def __init__(self, device, name='display'):
+        self.device = device
+        self.name = name
+        self.submitted = 0
+        self.displayed = 0
+        self.dropped = 0
+        self.interrupted = 0
+        self._cond = threading.Condition()
+        self._pending = None    # (method name, args, kwargs) waiting to be drawn
+        self._busy = False
+        self._closed = False
+        device.sleep = self._sleep
+        self._thread = threading.Thread(target=self._run, name=f"{name}-output", daemon=True)
+        self._thread.start()
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        attr = getattr(self.device, name)
+        if not callable(attr):
+            return attr
+        return lambda *args, **kwargs: self.submit(name, *args, **kwargs)
+
+    def submit(self, method, *args, **kwargs):
+        """Queue device.method(*args, **kwargs), replacing anything not yet drawn"""
+        with self._cond:
+            if self._closed:
+                return
+            if self._pending is not None:
+                self.dropped += 1
+            self._pending = (method, args, kwargs)
+            self.submitted += 1
+            self._cond.notify_all()
+
+    def _sleep(self, seconds):
+        """Frame delay for the device; abandons the scene if a newer one is waiting"""
+        with self._cond:
+            if self._cond.wait_for(lambda: self._pending is not None or self._closed,
+                                   timeout=seconds):
+                raise _Superseded()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending is not None or self._closed)
+                if self._pending is None:
+                    return
+                method, args, kwargs = self._pending
+                self._pending = None
+                self._busy = True
+            outcome = None
+            try:
+                getattr(self.device, method)(*args, **kwargs)
+                outcome = 'displayed'
+            except _Superseded:
+                outcome = 'interrupted'
+            except Exception as e:
+                print(f"{self.name} output error in {method}: {e}")
+            finally:
+                with self._cond:
+                    # Counted under the lock, like the submitted/dropped counters stats() reads
+                    if outcome == 'displayed':
+                        self.displayed += 1
+                    elif outcome == 'interrupted':
+                        self.interrupted += 1
+                    self._busy = False
+                    self._cond.notify_all()
+
+    def flush(self, timeout=None):
+        """Block until everything submitted so far has been drawn; False on timeout"""
+        with self._cond:
+            return self._cond.wait_for(lambda: self._pending is None and not self._busy,
+                                       timeout=timeout)
+
+    def close(self, timeout=1.0):
+        """Stop the output thread (a running animation is interrupted)"""
+        with self._cond:
+            self._closed = True
+            self._pending = None
+            self._cond.notify_all()
+        self._thread.join(timeout)
+
+    def stats(self):
+        """Counters for the status endpoint and the benchmark"""
+        with self._cond:
+            return {
+                'submitted': self.submitted,
+                'displayed': self.displayed,
+                'dropped': self.dropped,
+                'interrupted': self.interrupted,
+                'pending': self._pending is not None,
+            }
@@ -0,0 +1,73 @@
+"""
+Engine Persona Configuration
+file: /AI_Chess_Senior_Design/Board_apps/engine_config.py
+
+The Stockfish options behind a bot persona (ELO, skill level, NNUE network),
+shared by the board Pi servers (/api/set-bot-difficulty) and the headless
+match runner, so both configure an engine the same way.
+"""
+
+import os
+
+STOCKFISH_PATH = "/usr/games/stockfish"
+
+# Stockfish's UCI_Elo range
+MIN_ELO = 1350
+MAX_ELO = 2850
+
+# NNUE networks by persona name (files live in the project's nnue/ folder)
+NNUE_BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(os.path.dirname(__file__)), 'nnue'))
+NNUE_FILES = {
+    'carlsen': 'carlsen_halfkav2_hm.nnue',
+    'fischer': 'fischer_01.nnue',
+    'yifan': 'yifan.nnue',
+    'spassky': 'spassky.nnue',
+    'nakamura': 'nakamura.nnue',
+    'krush': 'krush.nnue',
+}
+DEFAULT_NNUE_MODEL = 'carlsen'
+
+
+def elo_to_skill(elo):
+    """Map ELO to Stockfish skill level (0-20), same mapping as the GUI"""
+    if elo < MIN_ELO:
+        return 0
+    elif elo >= MAX_ELO:
+        return 20
+    else:
+        return int((elo - MIN_ELO) / 75)
+
+
+def nnue_path(nnue_model):
+    """Absolute path of a persona's NNUE file (unknown names fall back to carlsen)"""
+    filename = NNUE_FILES.get(nnue_model, NNUE_FILES[DEFAULT_NNUE_MODEL])
+    return os.path.join(NNUE_BASE_DIR, filename)
+
+
+def difficulty_options(elo, skill, use_nnue=False, nnue_model=DEFAULT_NNUE_MODEL):
+    """Engine options for a difficulty setting
+
+    Returns (options for engine.configure, clamped elo, clamped skill). The
+    NNUE file is only set when it exists; otherwise the engine keeps its
+    default evaluation.
+    """
+    # Ensure ELO is within Stockfish's supported range (1350-2850)
+    elo = max(MIN_ELO, min(MAX_ELO, elo))
+    skill = max(0, min(20, skill))
+
+    options = {
+        "Skill Level": skill,
+        "UCI_LimitStrength": True,
+        "UCI_Elo": elo
+    }
+
+    # If NNUE is requested, configure the evaluation file
+    if use_nnue:
+        path = nnue_path(nnue_model)
+        if os.path.exists(path):
+            options["EvalFile"] = path
+            print(f"Configuring NNUE evaluation file: {path} (model: {nnue_model})")
+        else:
+            print(f"Warning: NNUE file not found at {path}, using default evaluation")
+
+    return options, elo, skill
@@ -0,0 +1,104 @@
+"""
+Engine Search Telemetry
+file: /AI_Chess_Senior_Design/Board_apps/engine_info.py
+
+Helpers for turning the info python-chess collects while Stockfish searches
+(the info of an analysis or a PlayResult) into plain JSON for the GUI, and into the values
+shown on the board LCD. Nothing here talks to the engine beyond turning on
+WDL reporting; all numbers come from the search that picked the move.
+"""
+
+import chess
+import chess.engine
+
+# What the engine search should keep: depth/seldepth/nodes/nps/time + score + PV
+SEARCH_INFO = chess.engine.INFO_BASIC | chess.engine.INFO_SCORE | chess.engine.INFO_PV
+
+# Moves of the principal variation sent to the GUI
+PV_LENGTH = 8
+
+
+def enable_wdl(engine):
+    """Ask the engine to report win/draw/loss alongside its score (Stockfish 14+)"""
+    if "UCI_ShowWDL" in engine.options:
+        engine.configure({"UCI_ShowWDL": True})
+
+
+def search_info(info, board, elapsed=None):
+    """Convert a python-chess InfoDict into a JSON-serializable dict
+
+    Args:
+        info: info dict from engine.analysis() or engine.play()
+        board: position that was searched (before the move is pushed)
+        elapsed: wall-clock seconds measured around the search, if known
+
+    Scores and WDL are from White's point of view. When the engine does not
+    report WDL, it is estimated from the score with Stockfish's model. WDL is
+    in permille, as the engine reports it. The PV is a list of SAN moves.
+    """
+    nodes = info.get("nodes")
+    search_time = info.get("time")
+    nps = info.get("nps")
+    if nps is None and nodes and search_time:
+        nps = int(nodes / search_time)
+
+    data = {
+        'depth': info.get("depth"),
+        'seldepth': info.get("seldepth"),
+        'nodes': nodes,
+        'nps': nps,
+        'time': search_time,
+        'elapsed': round(elapsed, 4) if elapsed is not None else None,
+        'score_cp': None,
+        'mate': None,
+        'wdl': None,
+        'pv': None,
+    }
+
+    score = info.get("score")
+    if score is not None:
+        white_score = score.white()
+        data['score_cp'] = white_score.score()
+        data['mate'] = white_score.mate()
+
+    wdl = info.get("wdl")
+    if wdl is None and score is not None:
+        wdl = score.wdl(model="sf", ply=board.ply())
+    if wdl is not None:
+        white_wdl = wdl.white()
+        data['wdl'] = [white_wdl.wins, white_wdl.draws, white_wdl.losses]
+
+    pv = info.get("pv")
+    if pv:
+        line = board.copy(stack=False)
+        data['pv'] = []
+        for move in pv[:PV_LENGTH]:
+            if not line.is_legal(move):
+                break
+            data['pv'].append(line.san(move))
+            line.push(move)
+
+    return data
+
+
+def score_text(data, color='white'):
+    """Score as the LCD shows it, from `color`'s point of view: '+0.35', '-1.20', 'M3', '-M2'"""
+    sign = 1 if color == 'white' else -1
+    if data.get('mate') is not None:
+        mate = data['mate'] * sign
+        return f"M{mate}" if mate > 0 else f"-M{-mate}"
+    if data.get('score_cp') is None:
+        return "0.00"
+    return f"{data['score_cp'] * sign / 100:+.2f}"
+
+
+def win_percent(data, color='white'):
+    """Expected score for `color` in percent (wins plus half the draws), or None"""
+    wdl = data.get('wdl')
+    if not wdl:
+        return None
+    wins, draws, losses = wdl if color == 'white' else wdl[::-1]
+    total = wins + draws + losses
+    if total == 0:
+        return None
+    return round(100 * (wins + draws / 2) / total)
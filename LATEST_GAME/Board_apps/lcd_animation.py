@@ -1,46 +1,143 @@
+import os
+import math
 import time
-import digitalio
-import board
 import random
-import busio
+import numpy as np
 from PIL import Image, ImageDraw, ImageFont
-from adafruit_rgb_display import gc9a01a
+from display_backends import create_lcd_display
 
 BORDER = 20
 FONTSIZE = 24
 BOLD = "/usr/share/fonts/truetype/dejavu/DejaVuSans-BoldOblique.ttf"
-BAUDRATE = 24000000
+ASSET_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Text pre-rasterized into each glyph atlas: fixed labels first, then single characters
+ATLAS_LABELS = ("Score: ", "Probability", "Win: ", "Waiting for game ", " selection...")
+ATLAS_CHARS = "0123456789%-+.: "
+
+def load_asset(filename, size=(240, 240)):
+    """Open an image that lives next to this file (blank frame if it is missing)"""
+    path = os.path.join(ASSET_DIR, filename)
+    if os.path.exists(path):
+        return Image.open(path)
+    print(f"Warning: LCD asset not found at {path}, using a blank frame")
+    return Image.new("RGB", size, (0, 0, 0))
+
+def load_font(font_size):
+    """Load the bold TrueType font (Pillow's built-in font if it is not installed)"""
+    try:
+        return ImageFont.truetype(BOLD, font_size)
+    except OSError:
+        return ImageFont.load_default(font_size)
+
+def to_rgb565(image):
+    """Convert a PIL image (or an HxWx3 uint8 array) to an HxW RGB565 array with NumPy"""
+    if isinstance(image, Image.Image):
+        image = np.asarray(image.convert("RGB"))
+    rgb = image.astype(np.uint16)
+    return ((rgb[..., 0] & 0xF8) << 8) | ((rgb[..., 1] & 0xFC) << 3) | (rgb[..., 2] >> 3)
+
+def rgb565_bytes(frame_565):
+    """Big-endian bytes of an RGB565 array, the order the GC9A01A expects on SPI"""
+    return frame_565.astype(">u2").tobytes()
+
+class GlyphAtlas:
+    """Pre-rasterized glyph masks for one font size
+
+    Labels and characters are rasterized once as alpha masks (0.0-1.0) that
+    share a baseline. render() builds a text block by blitting the cached
+    masks, so numeric screens never touch the TrueType rasterizer. Anything
+    not in the atlas is rasterized the first time it is used and cached.
+    """
+
+    def __init__(self, font, labels=ATLAS_LABELS, chars=ATLAS_CHARS):
+        self.font = font
+        ascent, descent = font.getmetrics()
+        self.line_height = ascent + descent
+        # Same line pitch PIL uses for multiline text (height of "A" + 4px)
+        self.line_spacing = math.ceil(font.getbbox("A")[3]) + 4
+        self.entries = {}
+        for label in labels:
+            self.add(label)
+        for char in chars:
+            self.add(char)
+
+    def add(self, text):
+        """Rasterize text and cache it as (mask, x offset from pen, top, bottom, advance)
+
+        The mask covers PIL's bounding box of the text horizontally and the
+        full line height vertically; top/bottom are the box's vertical extent.
+        """
+        left, top, right, bottom = self.font.getbbox(text)
+        left = math.floor(left)
+        right = math.ceil(right)
+        mask = Image.new("L", (max(right - left, 1), self.line_height))
+        ImageDraw.Draw(mask).text((-left, 0), text, font=self.font, fill=255)
+        entry = (np.asarray(mask, dtype=np.float32) / 255.0, left,
+                 math.floor(top), math.ceil(bottom), self.font.getlength(text))
+        self.entries[text] = entry
+        return entry
+
+    def pieces(self, line):
+        """Split a line into cached entries, longest cached label first"""
+        pieces = []
+        i = 0
+        while i < len(line):
+            for size in range(len(line) - i, 0, -1):
+                if line[i:i + size] in self.entries:
+                    break
+            else:
+                size = 1
+                self.add(line[i])
+            pieces.append(self.entries[line[i:i + size]])
+            i += size
+        return pieces
+
+    def render(self, text):
+        """Alpha mask of the (center aligned, multi-line) text
+
+        Returns (mask, x offset, y offset): the mask covers the text's
+        bounding box and the offsets are that box's position relative to the
+        text origin, the same as PIL's multiline_textbbox()[:2].
+        """
+        lines = []
+        for line in text.split("\n"):
+            placed = []
+            pen = 0.0
+            for mask, left, top, bottom, advance in self.pieces(line):
+                placed.append((mask, pen, left, top, bottom))
+                pen += advance
+            lines.append((placed, pen))
+
+        # Center each line on the widest advance, like PIL's align="center"
+        widest = max(advance for _, advance in lines)
+        boxes = []
+        for row, (placed, advance) in enumerate(lines):
+            shift = (widest - advance) / 2
+            y = row * self.line_spacing
+            for mask, pen, left, top, bottom in placed:
+                x = int(round(shift + pen)) + left
+                boxes.append((mask, x, y, y + top, y + bottom))
+        if not boxes:
+            return np.zeros((0, 0), dtype=np.float32), 0, 0
+
+        x0 = min(x for _, x, _, _, _ in boxes)
+        x1 = max(x + mask.shape[1] for mask, x, _, _, _ in boxes)
+        y0 = min(top for _, _, _, top, _ in boxes)
+        y1 = max(bottom for _, _, _, _, bottom in boxes)
+        block = np.zeros((y1 - y0, x1 - x0), dtype=np.float32)
+        for mask, x, y, _, _ in boxes:
+            # Clip the glyph's line-height mask to the block's vertical extent
+            mask = mask[max(y0 - y, 0):y1 - y]
+            target = block[max(y - y0, 0):max(y - y0, 0) + mask.shape[0], x - x0:x - x0 + mask.shape[1]]
+            np.maximum(target, mask, out=target)
+        return block, x0, y0
 
 class LCD:
-    def __init__(self):
-#        cs_pin = digitalio.DigitalInOut(board.CE0)
-        dc_pin = digitalio.DigitalInOut(board.D25)
-        reset_pin = digitalio.DigitalInOut(board.D27)
-
-        spi = busio.SPI(
-            clock=board.SCLK,
-            MOSI=board.MOSI,
-            MISO=None
-        )
-
-        # Wait for SPI to be ready (important on Pi 5)
-        while not spi.try_lock():
-            pass
-
-        spi.configure(baudrate=BAUDRATE, phase=0, polarity=0)
-        spi.unlock()
-
-        self.disp = gc9a01a.GC9A01A(
-            spi,
-            rotation=0,
-            width=240,
-            height=240,
-            x_offset=0,
-            y_offset=0,
-            cs=None,
-            dc=dc_pin,
-            rst=reset_pin,
-        )
+    def __init__(self, disp=None, sleep=time.sleep):
+        # disp: output backend (see display_backends.py); sleep: delay function between frames
+        self.disp = disp if disp is not None else create_lcd_display()
+        self.sleep = sleep
 
         self.width = self.disp.width
         self.height = self.disp.height
@@ -48,7 +145,7 @@ class LCD:
 
 
         ######### Chess Board Code ###########
-        self.chessback = Image.open("8-bit_chess.png")
+        self.chessback = load_asset("8-bit_chess.png")
         scaled_width = self.width
         scaled_height = self.chessback.height * self.width // self.chessback.width
         self.chessback = self.chessback.resize((scaled_width, scaled_height), Image.BICUBIC)
@@ -65,14 +162,14 @@ class LCD:
 
 
         ####### Victory Code #######
-        self.victory = Image.open("victory.webp")
+        self.victory = load_asset("victory.webp")
         self.victory = self.victory.resize((scaled_width, scaled_height), Image.BICUBIC)
         self.victory = self.victory.crop((x, y, x + self.width, y + self.height))
         self.victory_rot = self.victory.rotate(270)  ## Copy for rotation
 
 
         ####### Loss Code #######
-        self.lose = Image.open("sad_pic.jpg")
+        self.lose = load_asset("sad_pic.jpg")
         self.lose = self.lose.resize((scaled_width, scaled_height), Image.BICUBIC)
         self.lose = self.lose.crop((x, y, x + self.width, y + self.height))
         self.lose_left_rot = self.lose.rotate(25)
@@ -83,16 +180,87 @@ class LCD:
         self.black = Image.new("RGB", (self.width, self.height), (0, 0, 0))
 
         ###### Draw Image ########
-        self.draw = Image.open("draw.png")
+        self.draw = load_asset("draw.png")
         self.draw = self.draw.resize((scaled_width, scaled_height), Image.BICUBIC)
         self.draw = self.draw.crop((x, y, x + self.width, y + self.height))
 
         ##### Player Icon #######
-        self.player_icon = Image.open("chess_icon.png")
+        self.player_icon = load_asset("chess_icon.png")
         self.player_icon = self.player_icon.resize((scaled_width, scaled_height), Image.BICUBIC)
         self.player_icon = self.player_icon.crop((x, y, x + self.width, y + self.height))
 
-
+        ##### Converted frames (RGB565, converted once) #######
+        self.chessback_rgb = np.asarray(self.chessback.convert("RGB"))
+        self.chessback_565 = to_rgb565(self.chessback_rgb)
+        self.black_565 = to_rgb565(self.black)
+        self.lose_left_565 = to_rgb565(self.lose_left_rot)
+        self.lose_right_565 = to_rgb565(self.lose_right_rot)
+        self.draw_565 = to_rgb565(self.draw)
+
+        # Window (x0, y0, x1, y1) of the text currently drawn over chessback,
+        # None when the screen shows anything else
+        self.text_rect = None
+
+        ##### Glyph atlases for the text screens #######
+        self.atlases = {}
+        for font_size in (FONTSIZE - 1, FONTSIZE + 5, FONTSIZE + 12):
+            self.get_atlas(font_size)
+
+    def push_frame(self, frame_565, x=0, y=0):
+        """Send an RGB565 array to the display window whose top-left corner is (x, y)"""
+        height, width = frame_565.shape
+        self.disp._block(x, y, x + width - 1, y + height - 1, rgb565_bytes(frame_565))
+
+    def show_image(self, frame):
+        """Send a full screen frame (PIL image or RGB565 array)"""
+        if isinstance(frame, Image.Image):
+            frame = to_rgb565(frame)
+        self.text_rect = None
+        self.push_frame(frame)
+
+    def get_font(self, font_size):
+        if font_size not in self.fonts:
+            self.fonts[font_size] = load_font(font_size)
+        return self.fonts[font_size]
+
+    def get_atlas(self, font_size):
+        if font_size not in self.atlases:
+            self.atlases[font_size] = GlyphAtlas(self.get_font(font_size))
+        return self.atlases[font_size]
+
+    def show_text(self, text, font_size, fill=(255, 255, 255)):
+        """Draw centered text over the chess background
+
+        The text is composed from the cached glyph atlas. Only the window
+        covering the old and new text is converted and sent; the first text
+        screen after any other screen sends the full frame.
+        """
+        mask, offset_x, offset_y = self.get_atlas(font_size).render(text)
+        text_height, text_width = mask.shape
+
+        # Same placement as draw_centered_text
+        x0 = (self.width - text_width) // 2 + offset_x
+        y0 = (self.height - text_height) // 2 + offset_y
+
+        rect = (max(x0, 0), max(y0, 0),
+                min(x0 + text_width, self.width), min(y0 + text_height, self.height))
+        if self.text_rect is None:
+            window = (0, 0, self.width, self.height)
+        else:
+            old = self.text_rect
+            window = (min(old[0], rect[0]), min(old[1], rect[1]),
+                      max(old[2], rect[2]), max(old[3], rect[3]))
+        wx0, wy0, wx1, wy1 = window
+
+        # Blend the text mask over the background inside the window
+        alpha = np.zeros((wy1 - wy0, wx1 - wx0), dtype=np.float32)
+        alpha[rect[1] - wy0:rect[3] - wy0, rect[0] - wx0:rect[2] - wx0] = \
+            mask[rect[1] - y0:rect[3] - y0, rect[0] - x0:rect[2] - x0]
+        background = self.chessback_rgb[wy0:wy1, wx0:wx1].astype(np.float32)
+        blended = background + (np.array(fill, dtype=np.float32) - background) * alpha[..., None]
+
+        self.push_frame(to_rgb565(blended.astype(np.uint8)), wx0, wy0)
+        self.text_rect = rect
 
     def get_box(self, draw, text, font):
         bbox = draw.multiline_textbbox((0, 0), text, font=font)
@@ -102,9 +270,7 @@ class LCD:
 
     def draw_centered_text(self, image, text, BOLD, font_size, fill):
         draw = ImageDraw.Draw(image)
-        if font_size not in self.fonts:
-            self.fonts[font_size] = ImageFont.truetype(BOLD, font_size)
-        font = self.fonts[font_size]
+        font = self.get_font(font_size)
         text_width, text_height = self.get_box(draw, text, font)
 
         # Center position
@@ -114,7 +280,7 @@ class LCD:
         draw.text((x,y),text,font=font,fill=fill, align="center")
 
     def turn_off(self):
-        self.disp.image(self.black)
+        self.show_image(self.black_565)
 
 
 
@@ -122,9 +288,7 @@ class LCD:
 
 
     def game_selection(self):
-        chess_copy = self.chessback.copy()
-        self.draw_centered_text(chess_copy,"Waiting for game \n selection...",BOLD,FONTSIZE - 1,fill="white")
-        self.disp.image(chess_copy)
+        self.show_text("Waiting for game \n selection...", FONTSIZE - 1)
 
 
     def show_victory(self, steps=20, delay=0.02):
@@ -132,8 +296,8 @@ class LCD:
         for i in range(steps + 1):
             angle = (361 / steps) * i
             frame = self.victory.rotate(angle)
-            self.disp.image(frame)
-            time.sleep(delay)
+            self.show_image(frame)
+            self.sleep(delay)
 
 
     #def show_victory(self):
@@ -142,26 +306,22 @@ class LCD:
 
 
     def show_lose(self):
-        self.disp.image(self.lose_left_rot)
-        time.sleep(0.5)
-        self.disp.image(self.lose_right_rot)
-        time.sleep(0.5)
+        self.show_image(self.lose_left_565)
+        self.sleep(0.5)
+        self.show_image(self.lose_right_565)
+        self.sleep(0.5)
 
     def turn_off(self):
-        self.disp.image(self.black)
+        self.show_image(self.black_565)
 
     def show_score(self, score):
-        chess_copy = self.chessback.copy()
-        self.draw_centered_text(chess_copy,f"Score: {score}",BOLD,FONTSIZE+12,fill="white")
-        self.disp.image(chess_copy)
+        self.show_text(f"Score: {score}", FONTSIZE + 12)
 
     def show_prop(self, prop):
-        chess_copy = self.chessback.copy()
-        self.draw_centered_text(chess_copy,f"Probability\nWin: {prop}%",BOLD,FONTSIZE+5,fill="white")
-        self.disp.image(chess_copy)
+        self.show_text(f"Probability\nWin: {prop}%", FONTSIZE + 5)
 
     def show_draw(self,):
-        self.disp.image(self.draw)
+        self.show_image(self.draw_565)
 
     def show_screen(self, screen_type, value=None, steps=20, delay=0.02):
         match screen_type:
@@ -172,14 +332,14 @@ class LCD:
                 for i in range(steps + 1):
                     angle = (361 / steps) * i
                     frame = self.victory.rotate(angle)
-                    self.disp.image(frame)
-                    time.sleep(delay)
+                    self.show_image(frame)
+                    self.sleep(delay)
 
             case "lose":
-                self.disp.image(self.lose_left_rot)
-                time.sleep(0.5)
-                self.disp.image(self.lose_right_rot)
-                time.sleep(0.5)
+                self.show_image(self.lose_left_565)
+                self.sleep(0.5)
+                self.show_image(self.lose_right_565)
+                self.sleep(0.5)
 
             case "score":
                 if value is None:
@@ -201,18 +361,19 @@ class LCD:
                 raise ValueError(f"Unknown screen type: {screen_type}")
 
 
-myLCD = LCD()
-myLCD.turn_off()
-while True:
-
-    myLCD.show_screen("selection")
-    time.sleep(2)
-    myLCD.show_screen("victory")
-    time.sleep(2)
-    myLCD.show_screen("lose")
-    time.sleep(2)
-    myLCD.show_screen("score", value=random.randint(0, 100))
-    time.sleep(2)
-    myLCD.show_screen("prob", value=random.randint(0, 100))
-    time.sleep(2)
-    myLCD.show_screen("draw")
+if __name__ == '__main__':
+    myLCD = LCD()
+    myLCD.turn_off()
+    while True:
+
+        myLCD.show_screen("selection")
+        time.sleep(2)
+        myLCD.show_screen("victory")
+        time.sleep(2)
+        myLCD.show_screen("lose")
+        time.sleep(2)
+        myLCD.show_screen("score", value=random.randint(0, 100))
+        time.sleep(2)
+        myLCD.show_screen("prob", value=random.randint(0, 100))
+        time.sleep(2)
+        myLCD.show_screen("draw")
@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+"""
+Headless Engine Match Runner
+file: /AI_Chess_Senior_Design/Board_apps/match_runner.py
+
+Plays a match between two bot personas without the GUI or the Pis, to check
+how strong a persona really is. Games run in parallel on a process pool (one
+worker per core by default); each worker keeps one Stockfish process per
+persona, configured exactly like /api/set-bot-difficulty does (see
+engine_config.py). Colors alternate every game, and each pair of games starts
+from the same random opening so neither persona gets the better half of the
+openings.
+
+A persona is written NAME@ELO:
+    carlsen@2200     carlsen NNUE network, UCI_Elo 2200
+    stockfish@1500   Stockfish's own evaluation, UCI_Elo 1500
+    1500             same as stockfish@1500
+The skill level follows the GUI's elo_to_skill mapping.
+
+Usage:
+    python match_runner.py carlsen@2200 fischer@2200 --games 200 --tc 10+0.1
+    python match_runner.py 1500 2000 --games 100 --movetime 0.05 --pgn match.pgn
+"""
+
+import argparse
+import math
+import multiprocessing.util
+import os
+import random
+import socket
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date
+
+import chess
+import chess.engine
+import chess.pgn
+
+from engine_config import NNUE_FILES, STOCKFISH_PATH, difficulty_options, elo_to_skill
+
+# Seconds a side may overrun its clock before losing on time (process scheduling noise)
+TIME_MARGIN = 0.1
+
+# Engine settings inside the pool: one search thread per engine so workers do not compete
+ENGINE_THREADS = 1
+ENGINE_HASH_MB = 16
+
+# Per-process state of a pool worker
+_engine_path = STOCKFISH_PATH
+_engines = {}
+
+
+def parse_persona(text):
+    """Parse NAME@ELO (or just ELO) into a persona dict"""
+    name, _, elo = text.rpartition('@')
+    name = name.lower() or 'stockfish'
+    try:
+        elo = int(elo)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"persona '{text}' needs an ELO, e.g. carlsen@2200")
+    if name != 'stockfish' and name not in NNUE_FILES:
+        choices = ', '.join(['stockfish'] + list(NNUE_FILES))
+        raise argparse.ArgumentTypeError(f"unknown persona '{name}' (choose from {choices})")
+    return {
+        'label': f"{name}@{elo}",
+        'name': name,
+        'elo': elo,
+        'skill': elo_to_skill(elo),
+        'use_nnue': name != 'stockfish',
+    }
+
+
+def parse_time_control(text):
+    """Parse BASE+INC in seconds ('10+0.1', '60') into (base, increment)"""
+    base, _, increment = text.partition('+')
+    try:
+        return float(base), float(increment or 0)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"time control '{text}' should look like 10+0.1")
+
+
+def init_worker(engine_path):
+    """Pool initializer: remember which engine binary to start"""
+    global _engine_path
+    _engine_path = engine_path
+    # The engines' I/O threads would keep the worker alive at pool shutdown,
+    # so quit them from multiprocessing's exit hook (runs before threads are joined)
+    multiprocessing.util.Finalize(None, close_engines, exitpriority=10)
+
+
+def close_engines():
+    """Quit every engine this worker started"""
+    for label in list(_engines):
+        drop_engine({'label': label})
+
+
+def get_engine(persona):
+    """This worker's engine for a persona, started and configured on first use"""
+    engine = _engines.get(persona['label'])
+    if engine is None:
+        engine = chess.engine.SimpleEngine.popen_uci(_engine_path)
+        options, _, _ = difficulty_options(persona['elo'], persona['skill'],
+                                           persona['use_nnue'], persona['name'])
+        for name, value in (("Threads", ENGINE_THREADS), ("Hash", ENGINE_HASH_MB)):
+            if name in engine.options:
+                options[name] = value
+        engine.configure(options)
+        _engines[persona['label']] = engine
+    return engine
+
+
+def drop_engine(persona):
+    """Forget a persona's engine and try to stop it"""
+    engine = _engines.pop(persona['label'], None)
+    if engine is not None:
+        try:
+            engine.quit()
+        except Exception:
+            pass
+
+
+def random_opening(plies, seed):
+    """A few random legal moves from the start position, as UCI strings"""
+    rng = random.Random(seed)
+    board = chess.Board()
+    moves = []
+    for _ in range(plies):
+        legal = list(board.legal_moves)
+        if not legal:
+            break
+        move = rng.choice(legal)
+        board.push(move)
+        moves.append(move.uci())
+    return moves
+
+
+def play_game(task):
+    """Play one game in a pool worker; returns a result dict with the PGN"""
+    started = time.perf_counter()
+    players = {chess.WHITE: task['white'], chess.BLACK: task['black']}
+    board = chess.Board()
+    for uci in task['opening']:
+        board.push_uci(uci)
+    book_plies = len(board.move_stack)
+
+    base, increment = task['tc'] or (None, 0.0)
+    clocks = {chess.WHITE: base, chess.BLACK: base}
+    result = None
+    termination = None
+
+    try:
+        while not board.is_game_over(claim_draw=True):
+            if board.ply() >= task['max_plies']:
+                result, termination = '1/2-1/2', 'max plies'
+                break
+            side = board.turn
+            engine = get_engine(players[side])
+            if task['tc']:
+                limit = chess.engine.Limit(white_clock=max(clocks[chess.WHITE], 0.01),
+                                           black_clock=max(clocks[chess.BLACK], 0.01),
+                                           white_inc=increment, black_inc=increment)
+            else:
+                limit = chess.engine.Limit(time=task['movetime'])
+
+            move_start = time.perf_counter()
+            play = engine.play(board, limit, game=task['index'])
+            spent = time.perf_counter() - move_start
+
+            if task['tc']:
+                clocks[side] -= spent
+                if clocks[side] < -TIME_MARGIN:
+                    # Losing on time is a draw if the opponent cannot possibly mate
+                    if board.has_insufficient_material(not side):
+                        result = '1/2-1/2'
+                    else:
+                        result = '0-1' if side == chess.WHITE else '1-0'
+                    termination = 'time forfeit'
+                    break
+                clocks[side] += increment
+
+            if play.move is None or play.move not in board.legal_moves:
+                result = '0-1' if side == chess.WHITE else '1-0'
+                termination = f"illegal move {play.move}"
+                break
+            board.push(play.move)
+    except (chess.engine.EngineError, chess.engine.EngineTerminatedError) as e:
+        # The game is not scored; the engine is restarted for the next one
+        drop_engine(players[board.turn])
+        result, termination = '*', f"engine error: {e}"
+
+    if result is None:
+        outcome = board.outcome(claim_draw=True)
+        result = outcome.result()
+        termination = outcome.termination.name.lower().replace('_', ' ')
+
+    game = chess.pgn.Game.from_board(board)
+    game.headers["Event"] = task['event']
+    game.headers["Site"] = socket.gethostname()
+    game.headers["Date"] = date.today().strftime("%Y.%m.%d")
+    game.headers["Round"] = str(task['index'] + 1)
+    game.headers["White"] = task['white']['label']
+    game.headers["Black"] = task['black']['label']
+    game.headers["Result"] = result
+    game.headers["WhiteElo"] = str(task['white']['elo'])
+    game.headers["BlackElo"] = str(task['black']['elo'])
+    game.headers["TimeControl"] = (f"{base:g}+{increment:g}" if task['tc']
+                                   else f"movetime {task['movetime']:g}s")
+    game.headers["Termination"] = termination
+    game.headers["PlyCount"] = str(board.ply())
+    if book_plies:
+        # Mark where the random opening ends
+        node = game
+        for _ in range(book_plies):
+            node = node.next()
+        node.comment = "book"
+
+    return {
+        'index': task['index'],
+        'white': task['white']['label'],
+        'black': task['black']['label'],
+        'result': result,
+        'termination': termination,
+        'plies': board.ply(),
+        'seconds': time.perf_counter() - started,
+        'pgn': str(game),
+    }
+
+
+def elo_from_score(score):
+    """Elo difference that gives an expected score of `score` (0-1 exclusive)"""
+    return 400 * math.log10(score / (1 - score))
+
+
+def summarize(results, persona):
+    """Match statistics from `persona`'s point of view (games with result '*' are skipped)
+
+    Returns wins/draws/losses, score, the Elo difference estimate with a 95%
+    interval and the likelihood of superiority.
+    """
+    points = []
+    wins = draws = losses = 0
+    for game in results:
+        if game['result'] == '*':
+            continue
+        if game['result'] == '1/2-1/2':
+            draws += 1
+            points.append(0.5)
+            continue
+        white_won = game['result'] == '1-0'
+        if white_won == (game['white'] == persona):
+            wins += 1
+            points.append(1.0)
+        else:
+            losses += 1
+            points.append(0.0)
+
+    games = len(points)
+    summary = {'games': games, 'wins': wins, 'draws': draws, 'losses': losses,
+               'score': None, 'elo': None, 'elo_low': None, 'elo_high': None, 'los': None}
+    if not games:
+        return summary
+
+    score = statistics.mean(points)
+    summary['score'] = score
+    if 0 < score < 1:
+        summary['elo'] = elo_from_score(score)
+        margin = 1.96 * statistics.pstdev(points) / math.sqrt(games)
+        low, high = score - margin, score + margin
+        summary['elo_low'] = elo_from_score(low) if low > 0 else -math.inf
+        summary['elo_high'] = elo_from_score(high) if high < 1 else math.inf
+    else:
+        summary['elo'] = math.inf if score == 1 else -math.inf
+    if wins + losses:
+        summary['los'] = 0.5 * (1 + math.erf((wins - losses) / math.sqrt(2 * (wins + losses))))
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play a headless match between two engine personas")
+    parser.add_argument('persona_a', type=parse_persona, help="first persona, e.g. carlsen@2200")
+    parser.add_argument('persona_b', type=parse_persona, help="second persona, e.g. stockfish@1800")
+    parser.add_argument('--games', type=int, default=100, help="number of games (default 100)")
+    parser.add_argument('--tc', type=parse_time_control, default=None,
+                        help="time control BASE+INC in seconds per side, e.g. 10+0.1")
+    parser.add_argument('--movetime', type=float, default=0.1,
+                        help="seconds per move when --tc is not given (default 0.1)")
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1,
+                        help="games played in parallel (default: number of cores)")
+    parser.add_argument('--engine', default=STOCKFISH_PATH, help=f"Stockfish binary (default {STOCKFISH_PATH})")
+    parser.add_argument('--opening-plies', type=int, default=4,
+                        help="random plies before the engines take over, shared by each pair of games (default 4)")
+    parser.add_argument('--max-plies', type=int, default=400, help="adjudicate a draw after this many plies")
+    parser.add_argument('--seed', type=int, default=None, help="seed for the random openings")
+    parser.add_argument('--pgn', default='match.pgn', help="PGN file the games are appended to")
+    args = parser.parse_args()
+
+    persona_a, persona_b = args.persona_a, args.persona_b
+    if persona_a['label'] == persona_b['label']:
+        persona_b = dict(persona_b, label=persona_b['label'] + '-b')
+    seed = args.seed if args.seed is not None else random.randrange(2 ** 32)
+    event = f"{persona_a['label']} vs {persona_b['label']}"
+
+    tasks = []
+    for index in range(args.games):
+        pair = index // 2
+        white, black = (persona_a, persona_b) if index % 2 == 0 else (persona_b, persona_a)
+        tasks.append({
+            'index': index,
+            'event': event,
+            'white': white,
+            'black': black,
+            'opening': random_opening(args.opening_plies, seed + pair),
+            'tc': args.tc,
+            'movetime': args.movetime,
+            'max_plies': args.max_plies,
+        })
+
+    tc_text = f"{args.tc[0]:g}+{args.tc[1]:g}" if args.tc else f"{args.movetime:g}s/move"
+    print("=" * 60)
+    print(f"Match: {event}")
+    print(f"Games: {args.games}, time control {tc_text}, {args.jobs} parallel, seed {seed}")
+    print(f"PGN: {args.pgn}")
+    print("=" * 60)
+
+    results = []
+    started = time.perf_counter()
+    with open(args.pgn, 'a') as pgn_file, \
+            ProcessPoolExecutor(max_workers=args.jobs, initializer=init_worker,
+                                initargs=(args.engine,)) as pool:
+        futures = [pool.submit(play_game, task) for task in tasks]
+        for future in as_completed(futures):
+            game = future.result()
+            results.append(game)
+            pgn_file.write(game['pgn'] + "\n\n")
+            pgn_file.flush()
+            running = summarize(results, persona_a['label'])
+            print(f"Game {game['index'] + 1:4d}: {game['white']} - {game['black']} {game['result']:7s} "
+                  f"({game['termination']}, {game['plies']} plies, {game['seconds']:.1f}s)  "
+                  f"score {running['wins']}-{running['losses']}-{running['draws']}")
+
+    elapsed = time.perf_counter() - started
+    summary = summarize(results, persona_a['label'])
+    print("\n" + "=" * 60)
+    print(f"{persona_a['label']} vs {persona_b['label']}: "
+          f"+{summary['wins']} ={summary['draws']} -{summary['losses']} ({summary['games']} scored games)")
+    if summary['score'] is not None:
+        print(f"Score: {summary['score'] * 100:.1f}%")
+        if summary['elo_low'] is not None:
+            print(f"Elo difference: {summary['elo']:+.0f} (95%: {summary['elo_low']:+.0f} to {summary['elo_high']:+.0f})")
+        else:
+            print(f"Elo difference: {summary['elo']:+}")
+    if summary['los'] is not None:
+        print(f"Likelihood of superiority: {summary['los'] * 100:.1f}%")
+    print(f"Time: {elapsed:.0f}s ({len(results) / elapsed * 3600:.0f} games/hour)")
+    print("=" * 60)
+
+
+if __name__ == '__main__':
+    main()
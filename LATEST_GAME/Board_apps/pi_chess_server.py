@@ -8,10 +8,16 @@ The GUI coordinates all moves - this Pi just maintains board state and calculate
 
 import chess
 import chess.engine
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, Response
 import json
 import time
 import os
+from engine_info import SEARCH_INFO, enable_wdl, search_info, score_text
+from search_stream import SearchStream
+from analysis_worker import AnalysisWorker
+from engine_config import difficulty_options
+from position_search import board_from_request, search_position, thinking_time
+from wsgi_server import run_server
 
 app = Flask(__name__)
 
@@ -20,12 +26,23 @@ board = chess.Board()
 engine = None
 game_active = False
 current_player = 'white'
+last_search_info = None  # telemetry from the most recent engine search
+search_stream = SearchStream()  # live info of the running search for /api/search-stream
+analysis_worker = AnalysisWorker()  # /api/analyze while this Pi is not playing; play preempts it
+legal_moves_cache = (None, None)  # (fen, legal move map) of the last position asked about
 
 # NNUE file paths (absolute paths)
 NNUE_BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(os.path.dirname(__file__)), 'nnue'))
 CARLSEN_NNUE_PATH = os.path.join(NNUE_BASE_DIR, 'carlsen_halfkav2_hm.nnue')
 FISCHER_NNUE_PATH = os.path.join(NNUE_BASE_DIR, 'fischer.nnue')
 
+# Serving (wsgi_server.py): "dev" is Flask's development server, "production" waitress
+SERVER_MODE = os.environ.get("SERVER_MODE", "dev")
+SERVER_THREADS = 8  # Requests at once; the engine still plays one search at a time
+SERVER_CONNECTION_LIMIT = 100
+SERVER_KEEPALIVE_TIMEOUT = 120  # Seconds an idle GUI server connection is kept open
+SERVER_BACKLOG = 1024
+
 def initialize_engine():
     """Initialize the Stockfish chess engine"""
     global engine
@@ -36,6 +53,7 @@ def initialize_engine():
             "UCI_LimitStrength": True,
             "UCI_Elo": 1350
         })
+        enable_wdl(engine)
         print("Chess engine initialized successfully")
         return True
     except Exception as e:
@@ -53,14 +71,40 @@ def get_board_state():
             board_state[square_name] = piece_symbol
     return board_state
 
-def is_valid_move(from_square, to_square, piece_code):
+def get_legal_moves_map():
+    """Legal moves of the current position as {from_square: [to_square, ...]}
+    
+    Promotions are listed once per destination square. Computed once per
+    position and reused for every response about that position.
+    """
+    global legal_moves_cache
+    fen = board.fen()
+    if legal_moves_cache[0] != fen:
+        legal_moves = {}
+        for move in board.legal_moves:
+            targets = legal_moves.setdefault(chess.square_name(move.from_square), [])
+            to_name = chess.square_name(move.to_square)
+            if to_name not in targets:
+                targets.append(to_name)
+        legal_moves_cache = (fen, legal_moves)
+    return legal_moves_cache[1]
+
+def build_move(from_square, to_square, promotion=None):
+    """Build a move from square names; a pawn reaching the last rank promotes to a queen unless told otherwise"""
+    from_sq = chess.parse_square(from_square)
+    to_sq = chess.parse_square(to_square)
+    promotion_type = chess.Piece.from_symbol(promotion).piece_type if promotion else None
+    if (promotion_type is None and board.piece_type_at(from_sq) == chess.PAWN
+            and chess.square_rank(to_sq) in (0, 7)):
+        promotion_type = chess.QUEEN
+    return chess.Move(from_sq, to_sq, promotion=promotion_type)
+
+def is_valid_move(from_square, to_square, piece_code, promotion=None):
     """Validate if a move is legal"""
     try:
         print(f"Validating move: {from_square} to {to_square}")
         
-        from_sq = chess.parse_square(from_square)
-        to_sq = chess.parse_square(to_square)
-        move = chess.Move(from_sq, to_sq)
+        move = build_move(from_square, to_square, promotion)
         
         print(f"Move in legal moves: {move in board.legal_moves}")
         return move in board.legal_moves
@@ -68,12 +112,10 @@ def is_valid_move(from_square, to_square, piece_code):
         print(f"Move validation error: {e}")
         return False
 
-def make_move(from_square, to_square):
+def make_move(from_square, to_square, promotion=None):
     """Make a move on the board"""
     try:
-        from_sq = chess.parse_square(from_square)
-        to_sq = chess.parse_square(to_square)
-        move = chess.Move(from_sq, to_sq)
+        move = build_move(from_square, to_square, promotion)
         
         if move in board.legal_moves:
             board.push(move)
@@ -90,6 +132,7 @@ def get_engine_move(game_speed=10):
         game_speed: Speed multiplier (1-20). Higher = faster. Default 10.
                    Thinking time = 2.0 / game_speed seconds
     """
+    global last_search_info
     if not engine:
         print("Engine not initialized")
         return None
@@ -116,8 +159,19 @@ def get_engine_move(game_speed=10):
         
         # Use a timeout limit to prevent hanging (max 30 seconds total)
         time_limit = min(thinking_time * 2, 30.0)
-        result = engine.play(board, chess.engine.Limit(time=thinking_time))
-        move = result.move
+        # Search through engine.analysis() so each completed depth can be streamed
+        # to /api/search-stream; the move played is the bestmove of this same search
+        search_start = time.perf_counter()
+        search_stream.start(board.fen(), thinking_time)
+        with analysis_worker.playing():
+            with engine.analysis(board, chess.engine.Limit(time=thinking_time), info=SEARCH_INFO) as analysis:
+                for live in analysis:
+                    if 'pv' in live and 'score' in live:
+                        live_info = search_info(live, board, time.perf_counter() - search_start)
+                        search_stream.publish(live_info)
+                best = analysis.wait()
+        elapsed = time.perf_counter() - search_start
+        move = best.move
         
         print(f"Engine suggested move: {move}")
         
@@ -131,18 +185,29 @@ def get_engine_move(game_speed=10):
         piece = board.piece_at(move.from_square).symbol() if board.piece_at(move.from_square) else None
         san_notation = board.san(move)
         
+        # Search telemetry from the final info of the same analysis (score/WDL from White's view)
+        info = search_info(analysis.info, board, elapsed)
+        info['budget'] = thinking_time
+        last_search_info = info
+        print(f"Search: depth {info['depth']}/{info['seldepth']}, {info['nodes']} nodes, "
+              f"{info['nps']} nps, {elapsed:.3f}s of {thinking_time:.2f}s, score {score_text(info)}")
+        
         # Make the move
         board.push(move)
         global current_player
         current_player = 'black' if current_player == 'white' else 'white'
         print(f"Engine move applied: {move} ({san_notation})")
         
-        return {
+        engine_move = {
             'from': chess.square_name(move.from_square),
             'to': chess.square_name(move.to_square),
             'piece': piece,
-            'san': san_notation
+            'promotion': chess.piece_symbol(move.promotion) if move.promotion else None,
+            'san': san_notation,
+            'info': info
         }
+        search_stream.finish(engine_move, info)
+        return engine_move
     except chess.engine.EngineTerminatedError as e:
         print(f"ERROR: Engine terminated unexpectedly: {e}")
         print("Attempting to reinitialize engine...")
@@ -158,6 +223,9 @@ def get_engine_move(game_speed=10):
         import traceback
         traceback.print_exc()
         return None
+    finally:
+        # Ends any open /api/search-stream clients if the search failed (no-op otherwise)
+        search_stream.finish()
 
 @app.route('/api/status', methods=['GET'])
 def status():
@@ -167,7 +235,110 @@ def status():
         'engine_connected': engine is not None,
         'game_active': game_active,
         'current_player': current_player,
-        'board_fen': board.fen()
+        'board_fen': board.fen(),
+        'last_search_info': last_search_info,
+        'analysis': analysis_worker.stats()
+    })
+
+@app.route('/api/search-stream', methods=['GET'])
+def stream_search_info():
+    """Stream the running (or next) engine search as server-sent events: depth, score, WDL, PV"""
+    return Response(search_stream.events(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache'})
+
+@app.route('/api/analyze', methods=['POST'])
+def analyze_position():
+    """Full-strength analysis of a position for the GUI server (hints, eval bar, annotation)
+    
+    JSON body: fen, time (seconds, default 2), multipv (lines, default 3) and
+    optionally searchmoves (UCI moves the search is limited to).
+    Answers 409 while the engine is playing; a move asked for during an
+    analysis stops it and the partial result comes back with preempted: true.
+    """
+    if not engine:
+        return jsonify({
+            'status': 'error',
+            'message': 'Engine not initialized'
+        }), 500
+    
+    data = request.get_json(silent=True) or {}
+    try:
+        analysis_board = chess.Board(data.get('fen') or chess.STARTING_FEN)
+        seconds = max(0.1, min(30.0, float(data.get('time', 2.0))))
+        multipv = max(1, min(5, int(data.get('multipv', 3))))
+        root_moves = [chess.Move.from_uci(uci) for uci in data.get('searchmoves') or []]
+        if any(move not in analysis_board.legal_moves for move in root_moves):
+            raise ValueError('searchmoves must be legal moves of the position')
+    except (ValueError, TypeError) as e:
+        return jsonify({
+            'status': 'error',
+            'message': f'Bad analysis request: {e}'
+        }), 400
+    if analysis_board.is_game_over():
+        return jsonify({
+            'status': 'error',
+            'message': 'Position is game over'
+        }), 400
+    
+    try:
+        result = analysis_worker.analyse(engine, analysis_board, seconds, multipv, root_moves or None)
+    except chess.engine.EngineError as e:
+        print(f"Analysis error: {e}")
+        return jsonify({
+            'status': 'error',
+            'message': f'Analysis error: {str(e)}'
+        }), 500
+    if result is None:
+        return jsonify({
+            'status': 'busy',
+            'message': 'Engine is playing'
+        }), 409
+    return jsonify(dict(result, status='success'))
+
+@app.route('/api/search', methods=['POST'])
+def search_position_endpoint():
+    """Play a move in a position sent by the GUI server's engine pool (stateless)
+    
+    JSON body: fen (start of the game) and moves (UCI), elo, skill, use_nnue,
+    nnue_model, game_speed. The persona
+    applies to this search only and this Pi's own board is left as it is;
+    the answer has the engine_move /api/engine-move would give.
+    """
+    if not engine:
+        return jsonify({
+            'status': 'error',
+            'message': 'Engine not initialized'
+        }), 500
+    
+    data = request.get_json(silent=True) or {}
+    try:
+        search_board = board_from_request(data)
+        options, _, _ = difficulty_options(int(data.get('elo', 1350)), int(data.get('skill', 10)),
+                                           bool(data.get('use_nnue')), data.get('nnue_model') or 'carlsen')
+    except (ValueError, TypeError) as e:
+        return jsonify({
+            'status': 'error',
+            'message': f'Bad search request: {e}'
+        }), 400
+    if search_board.is_game_over():
+        return jsonify({
+            'status': 'error',
+            'message': 'Position is game over'
+        }), 400
+    
+    try:
+        engine_move = search_position(engine, analysis_worker, search_board, options,
+                                      thinking_time(data.get('game_speed', 10)))
+    except chess.engine.EngineError as e:
+        print(f"Search error: {e}")
+        return jsonify({
+            'status': 'error',
+            'message': f'Search error: {str(e)}'
+        }), 500
+    return jsonify({
+        'status': 'success',
+        'fen': search_board.fen(),
+        'engine_move': engine_move
     })
 
 @app.route('/api/debug', methods=['GET'])
@@ -201,6 +372,7 @@ def handle_move():
         from_square = data.get('from')
         to_square = data.get('to')
         piece = data.get('piece')
+        promotion = data.get('promotion')
         
         print(f"Received move: {from_square} to {to_square}, piece: {piece}")
         print(f"Current board FEN: {board.fen()}")
@@ -213,7 +385,7 @@ def handle_move():
             }), 400
         
         # Validate the move
-        if not is_valid_move(from_square, to_square, piece):
+        if not is_valid_move(from_square, to_square, piece, promotion):
             print(f"Move validation failed: {from_square} to {to_square}")
             print(f"Current legal moves: {[board.san(move) for move in list(board.legal_moves)[:10]]}")
             return jsonify({
@@ -223,7 +395,7 @@ def handle_move():
             }), 400
         
         # Make the move
-        if make_move(from_square, to_square):
+        if make_move(from_square, to_square, promotion):
             # Check if game is over
             game_over = board.is_game_over()
             winner = None
@@ -237,14 +409,26 @@ def handle_move():
                 else:
                     winner = 'draw'
             
-            return jsonify({
+            response = {
                 'status': 'success',
                 'move_accepted': True,
                 'board_state': get_board_state(),
+                'legal_moves': get_legal_moves_map(),
                 'game_over': game_over,
                 'winner': winner,
                 'current_player': 'black' if current_player == 'white' else 'white'
-            })
+            }
+            
+            # reply: true -> the engine answers in the same request (saves a round trip in user vs CPU)
+            if data.get('reply') and not game_over:
+                game_speed = data.get('game_speed', 10)
+                if data.get('stream'):
+                    # Acknowledge the move as soon as it is applied; the reply follows as a second line
+                    return Response(stream_move_and_reply(response, game_speed),
+                                    mimetype='application/x-ndjson')
+                response['reply'], _ = engine_move_response(game_speed)
+            
+            return jsonify(response)
         else:
             return jsonify({
                 'status': 'error',
@@ -261,9 +445,11 @@ def handle_move():
             'message': f'Server error: {str(e)}'
         }), 500
 
-@app.route('/api/engine-move', methods=['POST'])
-def handle_engine_move():
-    """Get the engine's move"""
+def engine_move_response(game_speed=10):
+    """Play the engine's move; returns (response dict, HTTP status) for /api/engine-move
+    
+    /api/move uses it too when the GUI asks for the engine's reply in the same request.
+    """
     try:
         if not engine:
             # Try to reinitialize engine
@@ -271,10 +457,10 @@ def handle_engine_move():
             if initialize_engine():
                 print("Engine reinitialized successfully")
             else:
-                return jsonify({
+                return {
                     'status': 'error',
                     'message': 'Chess engine not initialized and reinitialization failed'
-                }), 500
+                }, 500
         
         # If the game is already over (checkmate / stalemate / draw), do NOT error.
         # Return a clean success response so the GUI can end/restart gracefully.
@@ -287,18 +473,16 @@ def handle_engine_move():
             else:
                 winner = 'draw'
 
-            return jsonify({
+            return {
                 'status': 'success',
                 'engine_move': None,
                 'board_state': get_board_state(),
+                'legal_moves': get_legal_moves_map(),
                 'game_over': True,
                 'winner': winner,
                 'message': 'Game is over'
-            }), 200
+            }, 200
         
-        # Get game_speed from request (default to 10 if not provided)
-        data = request.get_json() or {}
-        game_speed = data.get('game_speed', 10)
         # Ensure game_speed is within valid range (1-20)
         try:
             game_speed = max(1, min(20, int(game_speed)))
@@ -322,13 +506,14 @@ def handle_engine_move():
                 else:
                     winner = 'draw'
             
-            return jsonify({
+            return {
                 'status': 'success',
                 'engine_move': engine_move,
                 'board_state': get_board_state(),
+                'legal_moves': get_legal_moves_map(),
                 'game_over': game_over,
                 'winner': winner
-            })
+            }, 200
         else:
             # If engine move failed, try to check if engine is still alive
             try:
@@ -342,24 +527,37 @@ def handle_engine_move():
                 if initialize_engine():
                     print("Engine reinitialized after health check failure")
                 else:
-                    return jsonify({
+                    return {
                         'status': 'error',
                         'message': 'Engine failed and could not be reinitialized'
-                    }), 500
+                    }, 500
             
-            return jsonify({
+            return {
                 'status': 'error',
                 'message': 'Failed to get engine move (engine may be busy or unresponsive)'
-            }), 500
+            }, 500
             
     except Exception as e:
-        print(f"Exception in handle_engine_move: {e}")
+        print(f"Exception in engine_move_response: {e}")
         import traceback
         traceback.print_exc()
-        return jsonify({
+        return {
             'status': 'error',
             'message': f'Engine error: {str(e)}'
-        }), 500
+        }, 500
+
+@app.route('/api/engine-move', methods=['POST'])
+def handle_engine_move():
+    """Get the engine's move"""
+    data = request.get_json(silent=True) or {}
+    payload, status_code = engine_move_response(data.get('game_speed', 10))
+    return jsonify(payload), status_code
+
+def stream_move_and_reply(move_response, game_speed):
+    """NDJSON body for /api/move with reply + stream: the move acknowledgment, then the engine's reply"""
+    yield json.dumps(move_response) + "\n"
+    reply, _ = engine_move_response(game_speed)
+    yield json.dumps(reply) + "\n"
 
 @app.route('/api/board-state', methods=['GET'])
 def get_board_state_endpoint():
@@ -380,6 +578,7 @@ def get_board_state_endpoint():
         return jsonify({
             'status': 'success',
             'board_state': get_board_state(),
+            'legal_moves': get_legal_moves_map(),
             'current_player': current_player,
             'game_over': game_over,
             'winner': winner,
@@ -402,13 +601,15 @@ def game_control():
         command = data.get('command')
         
         if command == 'reset':
-            global board, game_active, current_player
+            global board, game_active, current_player, last_search_info
             board = chess.Board()
             current_player = 'white'
+            last_search_info = None
             return jsonify({
                 'status': 'success',
                 'message': 'Game reset to starting position',
-                'board_state': get_board_state()
+                'board_state': get_board_state(),
+                'legal_moves': get_legal_moves_map()
             })
         
         elif command == 'pause':
@@ -478,7 +679,8 @@ def set_bot_difficulty():
             else:
                 print(f"Warning: NNUE file not found at {nnue_path}, using default evaluation")
         
-        engine.configure(config)
+        with analysis_worker.playing():
+            engine.configure(config)
         
         # Reset the board to starting position when setting difficulty
         global board
@@ -495,7 +697,8 @@ def set_bot_difficulty():
             'skill': skill,
             'nnue_enabled': use_nnue,
             'nnue_model': nnue_model if use_nnue else None,
-            'board_state': get_board_state()
+            'board_state': get_board_state(),
+            'legal_moves': get_legal_moves_map()
         })
         
     except Exception as e:
@@ -523,8 +726,10 @@ if __name__ == '__main__':
         print("Server ready! Listening on port 5002")
         print("Configured for long-running operation with improved error handling")
         try:
-            # Use threaded mode for better concurrent request handling
-            app.run(host='0.0.0.0', port=5002, debug=False, threaded=True)
+            # Threaded either way: the development server or waitress's thread pool
+            run_server(app, '0.0.0.0', 5002, mode=SERVER_MODE, threads=SERVER_THREADS,
+                       connection_limit=SERVER_CONNECTION_LIMIT, keepalive_timeout=SERVER_KEEPALIVE_TIMEOUT,
+                       backlog=SERVER_BACKLOG)
         except KeyboardInterrupt:
             print("\nShutting down server...")
         except Exception as e:
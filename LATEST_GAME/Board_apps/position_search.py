@@ -0,0 +1,73 @@
+"""
+Stateless Position Search
+file: /AI_Chess_Senior_Design/Board_apps/position_search.py
+
+With the GUI server's engine pool (GUI/engine_pool.py) any Pi can play a
+move for any board. /api/search gets everything with the request: the
+game (start FEN plus its moves in UCI, so repetitions count like on the
+board's own Pi) and the persona (ELO, skill, NNUE). The persona's options are
+applied for that one search and python-chess puts this Pi's own settings
+back on the next command, so the Pi's board and its own game are not
+touched. The search goes through AnalysisWorker.playing() like the Pi's own
+moves: it stops a running analysis and waits its turn for the engine.
+"""
+
+import time
+
+import chess
+import chess.engine
+
+from engine_info import SEARCH_INFO, search_info
+
+
+def thinking_time(game_speed):
+    """Seconds of search for a game speed (1-20): 2.0 / game_speed, between 0.1 and 5"""
+    try:
+        game_speed = max(1, min(20, int(game_speed)))
+    except (ValueError, TypeError):
+        game_speed = 10
+    return min(max(0.1, 2.0 / game_speed), 5.0)
+
+
+def board_from_request(data):
+    """The game of a /api/search request: 'fen' (start position) with 'moves' (UCI) played on it
+
+    Raises ValueError for a bad FEN or a move that is not legal where it is played.
+    """
+    board = chess.Board(data.get('fen') or chess.STARTING_FEN)
+    for uci in data.get('moves') or []:
+        move = chess.Move.from_uci(uci)
+        if move not in board.legal_moves:
+            raise ValueError(f"illegal move {uci} in {board.fen()}")
+        board.push(move)
+    return board
+
+
+def search_position(engine, worker, board, options, seconds):
+    """The engine's move in board with options for this search only
+
+    Returns the engine_move dict of /api/engine-move (from, to, piece,
+    promotion, san, info); board itself is not changed.
+    """
+    options = dict(options)
+    if "EvalFile" not in options and "EvalFile" in engine.options:
+        # A persona without NNUE plays the default network, not the one this Pi's persona loaded
+        options["EvalFile"] = engine.options["EvalFile"].default
+    options = {name: value for name, value in options.items() if name in engine.options}
+    with worker.playing():
+        search_start = time.perf_counter()
+        result = engine.play(board, chess.engine.Limit(time=seconds), info=SEARCH_INFO, options=options)
+        elapsed = time.perf_counter() - search_start
+
+    move = result.move
+    info = search_info(result.info, board, elapsed)
+    info['budget'] = seconds
+    piece = board.piece_at(move.from_square)
+    return {
+        'from': chess.square_name(move.from_square),
+        'to': chess.square_name(move.to_square),
+        'piece': piece.symbol() if piece else None,
+        'promotion': chess.piece_symbol(move.promotion) if move.promotion else None,
+        'san': board.san(move),
+        'info': info
+    }
@@ -0,0 +1,81 @@
+"""
+Live Search Info Stream
+file: /AI_Chess_Senior_Design/Board_apps/search_stream.py
+
+The Pi server runs each engine search through engine.analysis() and publishes
+every completed depth here. Clients of /api/search-stream receive those
+updates as server-sent events (one JSON object per `data:` line):
+
+    {"event": "start", "search_id": 7, "fen": "...", "budget": 0.2}
+    {"event": "info",  "search_id": 7, "depth": 12, "score_cp": 35, "pv": ["e4", "e5"], ...}
+    {"event": "done",  "search_id": 7, "move": {...}, "info": {...}}
+
+A stream follows the search that is running when it connects (or the next one
+to start) and ends after that search's "done" event. Only the latest update
+is kept, so a slow client skips intermediate depths instead of falling behind.
+"""
+
+import json
+import threading
+
+
+class SearchStream:
+    """Latest-update-wins broadcast of one engine search at a time"""
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._search_id = 0
+        self._seq = 0
+        self._latest = None
+        self._searching = False
+
+    def _set(self, event):
+        self._seq += 1
+        self._latest = event
+        self._cond.notify_all()
+
+    def start(self, fen, budget):
+        """Announce a new search"""
+        with self._cond:
+            self._search_id += 1
+            self._searching = True
+            self._set({'event': 'start', 'search_id': self._search_id, 'fen': fen, 'budget': budget})
+
+    def publish(self, info):
+        """Publish intermediate search info (a dict from engine_info.search_info)"""
+        with self._cond:
+            if self._searching:
+                self._set(dict(info, event='info', search_id=self._search_id))
+
+    def finish(self, move=None, info=None):
+        """End the running search; move is None when the search failed. No-op if none is running"""
+        with self._cond:
+            if self._searching:
+                self._searching = False
+                self._set({'event': 'done', 'search_id': self._search_id, 'move': move, 'info': info})
+
+    def events(self, wait=30.0, keepalive=15.0):
+        """Yield server-sent event strings for the running (or next) search
+
+        Args:
+            wait: seconds to wait for a search to start before closing the stream
+            keepalive: seconds between comment lines sent while nothing changes
+        """
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._searching, timeout=wait):
+                return
+            search_id = self._search_id
+        last_seq = None
+        while True:
+            with self._cond:
+                changed = self._cond.wait_for(lambda: self._seq != last_seq, timeout=keepalive)
+                event = self._latest
+                last_seq = self._seq
+            if not changed:
+                yield ": keepalive\n\n"
+                continue
+            if event['search_id'] != search_id:
+                return
+            yield f"data: {json.dumps(event)}\n\n"
+            if event['event'] == 'done':
+                return
@@ -0,0 +1,71 @@
+"""
+Production Serving for the Flask Apps
+file: /AI_Chess_Senior_Design/Board_apps/wsgi_server.py
+
+app.run() is Werkzeug's development server: a new thread per request, no
+limit on connections, and with debug on, the reloader and debugger on top.
+SERVER_MODE = "production" serves the same Flask app with waitress instead:
+a fixed pool of request threads, a cap on open connections, keep-alive
+connections closed after keepalive_timeout idle seconds, and the listen
+backlog. Responses are still streamed as they are produced (NDJSON move
+replies, live search events).
+
+Both the Pi servers and the GUI server (app.py) keep their state in the
+process: the Pi's engine and board, and the GUI's games, sessions and Pi
+connections. So production mode is one process with several threads, never
+several worker processes, which would each start their own engine and their
+own copy of the game. Inside that process the engine keeps a single owner:
+requests reach it through the same locks as under the development server
+(AnalysisWorker.playing() on the Pi).
+
+waitress is optional (pip install waitress); without it production mode
+falls back to the development server with a warning.
+"""
+
+try:
+    from waitress import create_server
+except ImportError:
+    create_server = None
+
+SERVER_MODES = ('dev', 'production')
+
+
+def make_production_server(app, host, port, threads=8, connection_limit=100, keepalive_timeout=120,
+                           backlog=1024):
+    """A waitress server for app, bound but not yet running (call .run(), stop with .close())
+
+    Args:
+        threads: requests handled at the same time; a live search stream holds one while it is open
+        connection_limit: open connections accepted, keep-alive ones included
+        keepalive_timeout: seconds an idle connection is kept open for the next request
+        backlog: connections the OS queues while all are busy
+    """
+    if create_server is None:
+        raise RuntimeError("waitress is not installed (pip install waitress)")
+    return create_server(app, host=host, port=port, threads=threads, connection_limit=connection_limit,
+                         channel_timeout=keepalive_timeout, backlog=backlog)
+
+
+def run_server(app, host, port, mode='dev', debug=False, **settings):
+    """Serve app until interrupted: 'dev' is app.run(), 'production' waitress with settings
+
+    settings are make_production_server()'s threads, connection_limit,
+    keepalive_timeout and backlog; the development server ignores them.
+    """
+    if mode not in SERVER_MODES:
+        raise ValueError(f"Unknown server mode {mode!r} (expected one of {', '.join(SERVER_MODES)})")
+    if mode == 'production' and create_server is None:
+        print("WARNING: waitress is not installed (pip install waitress) - using the development server")
+        mode = 'dev'
+
+    if mode == 'dev':
+        app.run(host=host, port=port, debug=debug, threaded=True)
+        return
+
+    server = make_production_server(app, host, port, **settings)
+    print(f"Production server (waitress) on {host}:{port}: " +
+          ", ".join(f"{name} {value}" for name, value in settings.items()))
+    try:
+        server.run()
+    finally:
+        server.close()
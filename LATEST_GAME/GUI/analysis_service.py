@@ -0,0 +1,397 @@
+"""
+Position Analysis on Idle Pis
+file: /AI_Chess_Senior_Design/GUI/analysis_service.py
+
+In user vs CPU only the black Pi plays; the white Pi would sit idle. The GUI
+server uses any Pi that is not playing as an analysis worker: positions are
+queued here and sent to the idle Pi's /api/analyze (full strength, several
+lines), and the results are kept in an LRU cache keyed by the position's
+Zobrist hash, so a position reached again (or asked for again by another
+browser) is not searched twice.
+
+Two kinds of work, the first always ahead of the second:
+    PRIORITY_CURRENT     the position on the board now (eval bar, hints), newest first
+    PRIORITY_ANNOTATION  every position of a finished game, in move order
+
+Play wins over analysis twice over: a Pi that the game mode needs (or that
+is down) is not sent work, and on the Pi itself a move request stops the
+running analysis (Board_apps/analysis_worker.py). A preempted or refused
+job goes back in the queue; a partial result is kept until a deeper one
+replaces it.
+
+Split search (opt-in, split=True): when more than one Pi is idle, a job's
+root moves are dealt out between them (UCI searchmoves) and searched in
+parallel for the same think time. The lines that arrive by the deadline
+(think time + split_grace) are merged by score for the side to move; a
+partition that misses it leaves the result partial, and the job is queued
+again like a preempted one, at most split_retries times; after that the
+partial result stays. A late partition's Pi is still searching, so it
+counts as busy until its /api/analyze request returns.
+
+With the engine pool (engine_pool.py) one service serves every board: its
+workers are all the Pis of the pool, and a Pi is idle while it has no
+engine search in flight.
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from collections import OrderedDict
+
+import chess
+import chess.polyglot
+import requests
+
+PRIORITY_CURRENT = 0
+PRIORITY_ANNOTATION = 1
+
+# Mate scores rank above any centipawn score (shorter mates first)
+MATE_VALUE = 100000
+
+
+def position_key(board):
+    """Zobrist hash of a position (pieces, side to move, castling, en passant)"""
+    return chess.polyglot.zobrist_hash(board)
+
+
+def partition_root_moves(board, parts):
+    """Split the legal moves into parts of near-equal size
+
+    Moves are dealt out like cards after sorting the likeliest candidates
+    (promotions, captures of valuable pieces, checks) to the front, so
+    every Pi gets a share of the moves that are probably best.
+    """
+    def promise(move):
+        victim = board.piece_type_at(move.to_square) or (chess.PAWN if board.is_en_passant(move) else 0)
+        return (move.promotion or 0, victim, board.gives_check(move))
+
+    moves = sorted(board.legal_moves, key=promise, reverse=True)
+    return [moves[i::parts] for i in range(parts)]
+
+
+def line_value(line, white_to_move):
+    """Rank of an analysis line for the side to move (higher is better); scores are from White's view"""
+    if line.get('mate') is not None:
+        value = (MATE_VALUE - abs(line['mate'])) * (1 if line['mate'] > 0 else -1)
+    elif line.get('score_cp') is not None:
+        value = line['score_cp']
+    else:
+        return float('-inf')
+    return value if white_to_move else -value
+
+
+class AnalysisService:
+    """Queue of positions analysed by whichever Pis are idle, with a result cache"""
+
+    def __init__(self, pi_url, idle_pis, think_time=2.0, multipv=3, cache_size=4096,
+                 connect_timeout=2.0, read_timeout=30.0, split=False, split_grace=1.0,
+                 split_retries=2, workers=('white', 'black')):
+        """
+        Args:
+            pi_url: function color -> base URL of that Pi
+            idle_pis: function returning the colors free for analysis right now
+            workers: every color (Pi) that may be idle; one worker thread each
+            think_time: seconds of analysis per position
+            split: share each job's root moves among all idle Pis
+            split_grace: seconds past think_time a split search waits for its partitions
+            split_retries: times a job is queued again because of a late partition
+        """
+        self.pi_url = pi_url
+        self.idle_pis = idle_pis
+        self.think_time = think_time
+        self.multipv = multipv
+        self.cache_size = cache_size
+        self.timeout = (connect_timeout, think_time + read_timeout)
+        self.split = split
+        self.split_grace = split_grace
+        self.split_retries = split_retries
+        self.workers = tuple(workers)
+        self.hits = 0
+        self.misses = 0
+        self.completed = 0
+        self.preempted = 0
+        self.failed = 0
+        self.split_searches = 0
+        self.late_partitions = 0
+        self.late_given_up = 0
+        self._cache = OrderedDict()     # position key -> analysis result
+        self._queue = []                # heap of (priority, order, key, fen)
+        self._queued = {}               # position key -> priority it is queued with
+        self._running = {}              # color -> (key, fen) being analysed
+        self._late_retries = {}         # position key -> split searches of it with a late partition
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._workers = {}
+        self._closed = False
+
+    # --- cache ---
+
+    def lookup(self, board):
+        """Cached analysis of a position, or None"""
+        with self._cond:
+            result = self._cache.get(position_key(board))
+            if result is None:
+                self.misses += 1
+                return None
+            self._cache.move_to_end(position_key(board))
+            self.hits += 1
+            return result
+
+    def _store(self, key, result):
+        """Keep the deeper of the cached and the new result; a complete one beats a partial one"""
+        cached = self._cache.get(key)
+        if cached is not None and (cached['preempted'], -(cached['depth'] or 0)) \
+                < (result['preempted'], -(result['depth'] or 0)):
+            return
+        self._cache[key] = result
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    # --- queue ---
+
+    def submit(self, board, priority=PRIORITY_CURRENT):
+        """Queue a position unless it is already analysed or queued at the same or a higher priority"""
+        if board.is_game_over():
+            return False
+        key = position_key(board)
+        with self._cond:
+            if self._closed:
+                return False
+            cached = self._cache.get(key)
+            if cached is not None and not cached['preempted']:
+                return False
+            if self._queued.get(key, priority + 1) <= priority:
+                return False
+            if any(running_key == key for running_key, _ in self._running.values()):
+                return False
+            self._queued[key] = priority
+            count = next(self._seq)
+            # The newest current position goes first; annotation keeps move order
+            heapq.heappush(self._queue, (priority, -count if priority == PRIORITY_CURRENT else count,
+                                         key, board.fen()))
+            self._start_workers()
+            self._cond.notify_all()
+            return True
+
+    def annotate(self, board):
+        """Analysis of every position of a game (the start and after each move)
+
+        Positions not analysed yet are queued at annotation priority. Returns a
+        list with one entry per ply: {'ply', 'san', 'fen', 'analysis'}.
+        """
+        replay = chess.Board()
+        plies = [{'ply': 0, 'san': None, 'fen': replay.fen(), 'analysis': self.lookup(replay)}]
+        self.submit(replay, PRIORITY_ANNOTATION)
+        for move in board.move_stack:
+            san = replay.san(move)
+            replay.push(move)
+            plies.append({'ply': replay.ply(), 'san': san, 'fen': replay.fen(),
+                          'analysis': self.lookup(replay)})
+            self.submit(replay, PRIORITY_ANNOTATION)
+        return plies
+
+    def _start_workers(self):
+        """One worker thread per Pi, started with the first job (call with the lock held)"""
+        for color in self.workers:
+            if color not in self._workers:
+                worker = threading.Thread(target=self._work, args=(color,),
+                                          name=f"analysis-{color}", daemon=True)
+                self._workers[color] = worker
+                worker.start()
+
+    def _take(self, color):
+        """Wait for a job while color's Pi is idle
+
+        Returns (priority, key, fen, colors) or None when closed. colors is
+        [color] plus, in split mode, the other idle Pis claimed for the job.
+        """
+        with self._cond:
+            while True:
+                if self._closed:
+                    return None
+                idle = self.idle_pis()
+                # A Pi claimed by another worker's split search is not idle
+                if self._queue and color in idle and color not in self._running:
+                    priority, _, key, fen = heapq.heappop(self._queue)
+                    if self._queued.get(key) != priority:
+                        continue    # superseded by a higher-priority entry
+                    del self._queued[key]
+                    colors = [color]
+                    if self.split:
+                        colors += [other for other in idle if other != color and other not in self._running]
+                    for claimed in colors:
+                        self._running[claimed] = (key, fen)
+                    return priority, key, fen, colors
+                # Idleness changes with the game mode, so look again now and then
+                self._cond.wait(1.0)
+
+    def _analyse_on(self, color, fen, multipv, searchmoves=None):
+        """One /api/analyze request; returns the Pi's result, or None if it was busy or refused the job
+
+        Raises requests.exceptions.RequestException / ValueError if the Pi is unreachable.
+        """
+        payload = {'fen': fen, 'time': self.think_time, 'multipv': multipv}
+        if searchmoves:
+            payload['searchmoves'] = searchmoves
+        response = requests.post(f"{self.pi_url(color)}/api/analyze", json=payload, timeout=self.timeout)
+        data = response.json()
+        if response.status_code == 200 and data.get('status') == 'success':
+            return data
+        return None
+
+    def _single_search(self, color, fen):
+        data = self._analyse_on(color, fen, self.multipv)
+        if data is None:
+            return None
+        return {
+            'lines': data.get('lines') or [],
+            'depth': data.get('depth'),
+            'elapsed': data.get('elapsed'),
+            'preempted': bool(data.get('preempted')),
+            'analysed_by': color
+        }
+
+    def _split_search(self, colors, fen):
+        """Search the root moves of fen split across colors' Pis
+
+        Each partition runs in its own thread; the merge waits until every
+        partition is in or the deadline passes, whichever comes first.
+        Returns (merged result or None, colors whose partition was late). A
+        late partition's Pi stays in _running until its request returns.
+        """
+        board = chess.Board(fen)
+        parts = [part for part in partition_root_moves(board, len(colors)) if part]
+        colors = colors[:len(parts)]
+        results = {}
+        done = set()
+        late = set()
+
+        def search(color, moves):
+            data = None
+            try:
+                data = self._analyse_on(color, fen, min(self.multipv, len(moves)),
+                                        [move.uci() for move in moves])
+            except (requests.exceptions.RequestException, ValueError) as e:
+                print(f"Split analysis on {color} Pi failed: {e}")
+            finally:
+                with self._cond:
+                    done.add(color)
+                    if data is not None:
+                        results[color] = data
+                    if color in late:
+                        # The merge went on without this partition: the Pi is free only now
+                        self._running.pop(color, None)
+                        self._cond.notify_all()
+
+        start = time.perf_counter()
+        deadline = time.monotonic() + self.think_time + self.split_grace
+        threads = [threading.Thread(target=search, args=(color, moves), name=f"analysis-split-{color}",
+                                    daemon=True)
+                   for color, moves in zip(colors, parts)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(max(0.0, deadline - time.monotonic()))
+        with self._cond:
+            arrived = dict(results)     # whatever made the deadline; later answers are dropped
+            late.update(color for color in colors if color not in done)
+        self.split_searches += 1
+        self.late_partitions += len(late)
+        if not arrived:
+            return None, late
+
+        lines = sorted((line for data in arrived.values() for line in data.get('lines') or []),
+                       key=lambda line: line_value(line, board.turn == chess.WHITE), reverse=True)
+        return {
+            'lines': lines[:self.multipv],
+            # A line is only as deep as the shallowest partition it was compared against
+            'depth': min(data.get('depth') or 0 for data in arrived.values()) or None,
+            'elapsed': round(time.perf_counter() - start, 4),
+            # A missing partition could have held the best move: treat like a preempted search
+            'preempted': len(arrived) < len(parts) or any(data.get('preempted') for data in arrived.values()),
+            'analysed_by': '+'.join(color for color in colors if color in arrived),
+            'split': [{'pi': color, 'moves': len(moves), 'arrived': color in arrived,
+                       'depth': arrived[color].get('depth') if color in arrived else None,
+                       'nodes': sum(line.get('nodes') or 0 for line in arrived[color].get('lines') or [])
+                       if color in arrived else None}
+                      for color, moves in zip(colors, parts)]
+        }, late
+
+    def _work(self, color):
+        failures = 0
+        while True:
+            job = self._take(color)
+            if job is None:
+                return
+            priority, key, fen, colors = job
+            result = None
+            late = set()
+            try:
+                if len(colors) > 1:
+                    result, late = self._split_search(colors, fen)
+                else:
+                    result = self._single_search(color, fen)
+            except (requests.exceptions.RequestException, ValueError) as e:
+                print(f"Analysis on {color} Pi failed: {e}")
+                failures += 1
+
+            with self._cond:
+                for claimed in colors:
+                    # A late partition's thread frees its Pi when the request returns
+                    if claimed not in late:
+                        self._running.pop(claimed, None)
+                if result is not None:
+                    failures = 0
+                    result.update(fen=fen, analysed_at=time.time())
+                    self._store(key, result)
+                    if result['preempted']:
+                        self.preempted += 1
+                    else:
+                        self.completed += 1
+                else:
+                    self.failed += 1
+                retry = result is None or result['preempted']
+                if late:
+                    late_count = self._late_retries.get(key, 0) + 1
+                    self._late_retries[key] = late_count
+                    if late_count > self.split_retries:
+                        # The Pis keep missing the deadline: keep what arrived and stop
+                        retry = False
+                        self.late_given_up += 1
+                if not retry:
+                    self._late_retries.pop(key, None)
+                elif self._queued.get(key, priority + 1) > priority:
+                    # Pi busy playing, preempted, late or unreachable: try again later
+                    self._queued[key] = priority
+                    heapq.heappush(self._queue, (priority, next(self._seq), key, fen))
+            if failures:
+                # Unreachable: back off
+                time.sleep(min(30, 2 ** failures))
+            elif result is None:
+                # Busy for a moment (a move is being played): don't spin on the same job
+                time.sleep(0.2)
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def stats(self):
+        with self._cond:
+            return {
+                'idle_pis': list(self.idle_pis()),
+                'running': {color: fen for color, (_, fen) in self._running.items()},
+                'queued': len(self._queued),
+                'cached': len(self._cache),
+                'hits': self.hits,
+                'misses': self.misses,
+                'completed': self.completed,
+                'preempted': self.preempted,
+                'failed': self.failed,
+                'split': self.split,
+                'split_searches': self.split_searches,
+                'late_partitions': self.late_partitions,
+                'late_given_up': self.late_given_up
+            }
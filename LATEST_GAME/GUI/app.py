@@ -8,358 +8,180 @@ Uses Stockfish engine locally
 
 import system modules & Libraries
 """
-from flask import Flask, render_template, jsonify, request
+from flask import Flask, Blueprint, g, render_template, jsonify, request, Response
 import chess
-import chess.engine
+import chess.pgn
+import functools
+import io
 import json
 import os
-import requests
-from requests.adapters import HTTPAdapter
-try:
-    from urllib3.util.retry import Retry
-except ImportError:
-    from requests.packages.urllib3.util.retry import Retry
-import time
+import sys
 from config import (
-    FLASK_HOST, FLASK_PORT, FLASK_DEBUG, 
-    PI_WHITE_IP, PI_BLACK_IP, PI_PORT, PI_TIMEOUT,
-    GAME_MODES, DEFAULT_WHITE_ELO, DEFAULT_BLACK_ELO
+    FLASK_HOST, FLASK_PORT, FLASK_DEBUG,
+    SERVER_MODE, SERVER_THREADS, SERVER_CONNECTION_LIMIT, SERVER_KEEPALIVE_TIMEOUT, SERVER_BACKLOG,
+    BOARDS, BOARDS_FILE, ENGINE_POOL, SPARE_PIS,
+    SESSION_COOKIE, SESSION_IDLE_TIMEOUT, SESSION_MAX, SESSION_TAKEOVER_AFTER, GAME_LOCK_TIMEOUT,
+    GAME_MODES, DEFAULT_WHITE_ELO, DEFAULT_BLACK_ELO,
+    ASSET_BUNDLE, GAME_ARCHIVE_DIR
 )
+from analysis_service import PRIORITY_CURRENT
+from board_coordinator import BoardRegistry
+from game_sessions import GameSessions
+# Shared with the Pi servers
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'Board_apps'))
+from wsgi_server import run_server  # noqa: E402
 
-print(f"DEBUG: PI_WHITE_IP = {PI_WHITE_IP}")
-print(f"DEBUG: PI_BLACK_IP = {PI_BLACK_IP}")
+# Every board's game state and Pi connections (board_coordinator.py)
+boards = BoardRegistry.from_config(
+    BOARDS, BOARDS_FILE,
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), GAME_ARCHIVE_DIR),
+    engine_pool=ENGINE_POOL, spare_pis=SPARE_PIS
+)
+# Which browser plays each board; the others watch (game_sessions.py)
+sessions = GameSessions(idle_timeout=SESSION_IDLE_TIMEOUT, max_sessions=SESSION_MAX,
+                        takeover_after=SESSION_TAKEOVER_AFTER)
+for _board in boards:
+    print(f"DEBUG: {_board.board_id} white Pi = {_board.get_pi_url('white')}, black Pi = {_board.get_pi_url('black')}")
 
 """ Determin the root path """
 app = Flask(__name__)
 
+# Bundled static assets (written by build_assets.py); None serves the individual files
+ASSET_MANIFEST_PATH = os.path.join(app.static_folder, 'dist', 'manifest.json')
+IMMUTABLE_CACHE = 'public, max-age=31536000, immutable'
+
+def load_asset_manifest():
+    """Return the build manifest, or None when bundling is off or the build has not run"""
+    if not ASSET_BUNDLE or not os.path.exists(ASSET_MANIFEST_PATH):
+        return None
+    try:
+        with open(ASSET_MANIFEST_PATH) as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Could not read asset manifest, serving unbundled files: {e}")
+        return None
+
+asset_manifest = load_asset_manifest()
+print(f"Static assets: {'bundled ' + asset_manifest['app.js'] if asset_manifest else 'individual files'}")
+
+@app.context_processor
+def inject_asset_bundle():
+    """Expose the bundle file names to the templates"""
+    return {'asset_bundle': asset_manifest}
+
+@app.after_request
+def add_static_cache_headers(response):
+    """Hashed bundles never change under the same name, so browsers can keep them for a year"""
+    if request.path.startswith('/static/dist/') and not request.path.endswith('manifest.json'):
+        response.headers['Cache-Control'] = IMMUTABLE_CACHE
+    return response
+
 # Global game state
-current_game_mode = None
-white_elo = DEFAULT_WHITE_ELO
-black_elo = DEFAULT_BLACK_ELO
-white_nnue = False
-black_nnue = False
-white_nnue_model = 'carlsen'  # 'carlsen' or 'fischer'
-black_nnue_model = 'carlsen'  # 'carlsen' or 'fischer'
-game_active = False
-current_player = 'white'
-
-# Pi connection status
-pi_white_connected = False
-pi_black_connected = False
-
-# Create persistent HTTP sessions with connection pooling and retry logic
-def create_pi_session():
-    """Create a requests session with connection pooling, keep-alive, and retry logic"""
-    session = requests.Session()
-    
-    # Configure retry strategy with exponential backoff
-    retry_strategy = Retry(
-        total=3,  # Total number of retries
-        backoff_factor=1,  # Wait 1s, 2s, 4s between retries
-        status_forcelist=[500, 502, 503, 504],  # Retry on these HTTP status codes
-        allowed_methods=["GET", "POST"]  # Only retry safe methods
-    )
-    
-    # Configure HTTP adapter with connection pooling
-    adapter = HTTPAdapter(
-        max_retries=retry_strategy,
-        pool_connections=2,  # One pool per Pi (white and black)
-        pool_maxsize=10,  # Max connections per pool
-        pool_block=False  # Don't block if pool is full
-    )
-    
-    session.mount("http://", adapter)
-    session.mount("https://", adapter)
-    
-    # Set default headers for keep-alive
-    session.headers.update({
-        'Connection': 'keep-alive',
-        'Keep-Alive': 'timeout=30, max=100'
-    })
-    
-    return session
-
-# Create sessions for each Pi
-pi_white_session = create_pi_session()
-pi_black_session = create_pi_session()
-
-def get_pi_session(color):
-    """Get the appropriate session for a Pi color"""
-    return pi_white_session if color == 'white' else pi_black_session
-
-def get_pi_url(color):
-    """Get the appropriate Pi URL based on color"""
-    if color == 'white':
-        return f"http://{PI_WHITE_IP}:{PI_PORT}"
-    else:
-        return f"http://{PI_BLACK_IP}:{PI_PORT}"
-
-def check_pi_connection(color, retries=2):
-    """Check if a specific Pi is connected with retry logic"""
-    session = get_pi_session(color)
-    url = get_pi_url(color)
-    
-    for attempt in range(retries + 1):
-        try:
-            response = session.get(f"{url}/api/status", timeout=PI_TIMEOUT)
-            if response.status_code == 200:
-                data = response.json()
-                return data.get('engine_connected', False)
-            elif attempt < retries:
-                time.sleep(0.5 * (attempt + 1))  # Exponential backoff
-                continue
-            return False
-        except requests.exceptions.ConnectionError as e:
-            if attempt < retries:
-                print(f"Connection error checking {color} Pi (attempt {attempt + 1}/{retries + 1}): {e}")
-                time.sleep(0.5 * (attempt + 1))
-                continue
-            print(f"Connection error checking {color} Pi: {e}")
-            return False
-        except requests.exceptions.Timeout as e:
-            if attempt < retries:
-                print(f"Timeout checking {color} Pi (attempt {attempt + 1}/{retries + 1}): {e}")
-                time.sleep(0.5 * (attempt + 1))
-                continue
-            print(f"Timeout error checking {color} Pi: {e}")
-            return False
-        except requests.exceptions.RequestException as e:
-            print(f"Request error checking {color} Pi: {e}")
-            return False
-        except Exception as e:
-            print(f"Unexpected error checking {color} Pi: {e}")
-            return False
-    return False
-
-def initialize_pi_engine(color, elo, skill, use_nnue=False, nnue_model='carlsen', retries=3):
-    """Initialize a Pi's engine with specific settings and retry logic
-    
-    Args:
-        color: 'white' or 'black'
-        elo: ELO rating
-        skill: Skill level (0-20)
-        use_nnue: Whether to use NNUE evaluation file
-        nnue_model: NNUE model name ('carlsen' or 'fischer')
-        retries: Number of retry attempts
-    """
-    session = get_pi_session(color)
-    url = get_pi_url(color)
-    
-    payload = {"elo": elo, "skill": skill}
-    if use_nnue:
-        payload["use_nnue"] = True
-        payload["nnue_model"] = nnue_model
-    
-    for attempt in range(retries + 1):
-        try:
-            if attempt == 0:
-                print(f"Attempting to connect to {color} Pi at {url}...")
-            else:
-                print(f"Retrying connection to {color} Pi (attempt {attempt + 1}/{retries + 1})...")
-            
-            if use_nnue:
-                print(f"  Using NNUE evaluation file ({nnue_model}) for {color} Pi")
-            
-            response = session.post(
-                f"{url}/api/set-bot-difficulty",
-                json=payload,
-                timeout=PI_TIMEOUT * 2  # Longer timeout for initialization
-            )
-            
-            if response.status_code == 200:
-                print(f"{color.capitalize()} Pi engine initialized: ELO {elo}, Skill {skill}")
-                return True
-            else:
-                print(f"Failed to initialize {color} Pi: HTTP {response.status_code}")
-                try:
-                    error_data = response.json()
-                    print(f"Error details: {error_data.get('message', 'No details')}")
-                except:
-                    print(f"Error response: {response.text}")
-                
-                if attempt < retries:
-                    time.sleep(1 * (attempt + 1))
-                    continue
-                return False
-                
-        except requests.exceptions.ConnectionError as e:
-            if attempt < retries:
-                print(f"Connection error initializing {color} Pi (attempt {attempt + 1}/{retries + 1}): {e}")
-                time.sleep(1 * (attempt + 1))
-                continue
-            print(f"Connection error initializing {color} Pi at {url}: {e}")
-            print(f"Make sure the Pi is running pi_chess_server.py and is accessible at {url}")
-            return False
-        except requests.exceptions.Timeout as e:
-            if attempt < retries:
-                print(f"Timeout error initializing {color} Pi (attempt {attempt + 1}/{retries + 1}): {e}")
-                time.sleep(1 * (attempt + 1))
-                continue
-            print(f"Timeout error initializing {color} Pi at {url}: {e}")
-            return False
-        except Exception as e:
-            print(f"Error initializing {color} Pi: {e}")
-            if attempt < retries:
-                time.sleep(1 * (attempt + 1))
-                continue
-            return False
-    
-    return False
-
-def send_move_to_pi(color, from_square, to_square, piece, retries=2):
-    """Send a move to a specific Pi with retry logic"""
-    session = get_pi_session(color)
-    url = get_pi_url(color)
-    move_data = {
-        'from': from_square,
-        'to': to_square,
-        'piece': piece
+
+# The game API, served once per board: /boards/<board_id>/api/... for every board,
+# and the original /api/... routes for the default (first) board
+board_api = Blueprint('board_api', __name__)
+
+@board_api.url_value_preprocessor
+def pull_board_id(endpoint, values):
+    g.board_id = values.pop('board_id', None) if values else None
+
+@board_api.before_request
+def select_board():
+    """Pick the board the request is for; unknown board ids get a 404"""
+    g.coordinator = boards.get(g.board_id)
+    if g.coordinator is None:
+        return jsonify({
+            'status': 'error',
+            'message': f'Unknown board: {g.board_id}'
+        }), 404
+    # Prefix the page uses for its API calls
+    g.api_base = request.script_root + (f"/boards/{g.board_id}" if g.board_id else '')
+    # The browser's session (a new one gets its cookie with the response)
+    g.session_id = request.cookies.get(SESSION_COOKIE)
+    g.new_session = not g.session_id
+    if g.new_session:
+        g.session_id = GameSessions.new_id()
+    sessions.touch(g.session_id)
+
+@board_api.after_request
+def set_session_cookie(response):
+    if g.get('new_session'):
+        response.set_cookie(SESSION_COOKIE, g.session_id, httponly=True, samesite='Lax')
+    return response
+
+def current_board():
+    """The BoardCoordinator of the board this request is for"""
+    return g.coordinator
+
+def session_status(coordinator):
+    """This browser's role on the board and when it could take the board over"""
+    idle = sessions.idle_for(coordinator.board_id)
+    return {
+        'role': sessions.role(coordinator.board_id, g.session_id),
+        'player_idle': idle,
+        'takeover_after': sessions.takeover_after,
+        'can_take_over': idle is None or idle >= sessions.takeover_after
     }
-    
-    for attempt in range(retries + 1):
-        try:
-            response = session.post(
-                f"{url}/api/move",
-                json=move_data,
-                timeout=PI_TIMEOUT
-            )
-            return response.json()
-        except requests.exceptions.ConnectionError as e:
-            if attempt < retries:
-                print(f"Connection error sending move to {color} Pi (attempt {attempt + 1}/{retries + 1}): {e}")
-                time.sleep(0.5 * (attempt + 1))
-                continue
-            print(f"Error sending move to {color} Pi: {e}")
-            return {'status': 'error', 'message': str(e)}
-        except requests.exceptions.Timeout as e:
-            if attempt < retries:
-                print(f"Timeout sending move to {color} Pi (attempt {attempt + 1}/{retries + 1}): {e}")
-                time.sleep(0.5 * (attempt + 1))
-                continue
-            print(f"Timeout error sending move to {color} Pi: {e}")
-            return {'status': 'error', 'message': f'Timeout: {str(e)}'}
-        except Exception as e:
-            print(f"Error sending move to {color} Pi: {e}")
-            if attempt < retries:
-                time.sleep(0.5 * (attempt + 1))
-                continue
-            return {'status': 'error', 'message': str(e)}
-    
-    return {'status': 'error', 'message': 'Failed after retries'}
 
-def get_engine_move_from_pi(color, game_speed=10, retries=2):
-    """Get engine move from a specific Pi with retry logic and extended timeout"""
-    session = get_pi_session(color)
-    url = get_pi_url(color)
-    
-    # Use longer timeout for engine moves (they can take time to calculate)
-    engine_timeout = max(PI_TIMEOUT * 3, 30)  # At least 30 seconds for engine moves
-    
-    for attempt in range(retries + 1):
+def changes_game(route):
+    """For routes that change the board's game: only the board's player, one request at a time"""
+    @functools.wraps(route)
+    def guarded(*args, **kwargs):
+        coordinator = current_board()
+        if not sessions.claim(coordinator.board_id, g.session_id):
+            return jsonify({
+                'status': 'error',
+                'message': 'Another browser is playing on this board; this one can only watch',
+                **session_status(coordinator)
+            }), 409
+        if not coordinator.game_lock.acquire(timeout=GAME_LOCK_TIMEOUT):
+            return jsonify({
+                'status': 'error',
+                'message': 'The board is still busy with another request'
+            }), 409
         try:
-            response = session.post(
-                f"{url}/api/engine-move",
-                json={'game_speed': game_speed},
-                timeout=engine_timeout
-            )
-            return response.json()
-        except requests.exceptions.ConnectionError as e:
-            if attempt < retries:
-                print(f"Connection error getting move from {color} Pi (attempt {attempt + 1}/{retries + 1}): {e}")
-                time.sleep(1 * (attempt + 1))
-                continue
-            print(f"Error getting move from {color} Pi: {e}")
-            return {'status': 'error', 'message': str(e)}
-        except requests.exceptions.Timeout as e:
-            if attempt < retries:
-                print(f"Timeout getting move from {color} Pi (attempt {attempt + 1}/{retries + 1}): {e}")
-                time.sleep(1 * (attempt + 1))
-                continue
-            print(f"Timeout error getting move from {color} Pi: {e}")
-            return {'status': 'error', 'message': f'Timeout: Engine took too long to respond'}
-        except Exception as e:
-            print(f"Error getting move from {color} Pi: {e}")
-            if attempt < retries:
-                time.sleep(1 * (attempt + 1))
-                continue
-            return {'status': 'error', 'message': str(e)}
-    
-    return {'status': 'error', 'message': 'Failed after retries'}
+            return route(*args, **kwargs)
+        finally:
+            coordinator.game_lock.release()
+    return guarded
 
-def get_board_state_from_pi(color, retries=2):
-    """Get board state from a specific Pi with retry logic"""
-    session = get_pi_session(color)
-    url = get_pi_url(color)
-    
-    for attempt in range(retries + 1):
-        try:
-            response = session.get(f"{url}/api/board-state", timeout=PI_TIMEOUT)
-            return response.json()
-        except requests.exceptions.ConnectionError as e:
-            if attempt < retries:
-                print(f"Connection error getting board state from {color} Pi (attempt {attempt + 1}/{retries + 1}): {e}")
-                time.sleep(0.5 * (attempt + 1))
-                continue
-            print(f"Error getting board state from {color} Pi: {e}")
-            return {'status': 'error', 'message': str(e)}
-        except requests.exceptions.Timeout as e:
-            if attempt < retries:
-                print(f"Timeout getting board state from {color} Pi (attempt {attempt + 1}/{retries + 1}): {e}")
-                time.sleep(0.5 * (attempt + 1))
-                continue
-            print(f"Timeout error getting board state from {color} Pi: {e}")
-            return {'status': 'error', 'message': f'Timeout: {str(e)}'}
-        except Exception as e:
-            print(f"Error getting board state from {color} Pi: {e}")
-            if attempt < retries:
-                time.sleep(0.5 * (attempt + 1))
-                continue
-            return {'status': 'error', 'message': str(e)}
-    
-    return {'status': 'error', 'message': 'Failed after retries'}
+@app.route('/api/boards', methods=['GET'])
+def list_boards():
+    """Every board this server drives, with its Pis and game status"""
+    return jsonify({
+        'status': 'success',
+        'default_board': boards.default_id,
+        'boards': [dict(board.summary(), url=f"{request.script_root}/boards/{board.board_id}/")
+                   for board in boards],
+        'engine_pool': boards.engine_pool.stats() if boards.engine_pool else None,
+        'sessions': sessions.stats()
+    })
 
-def reset_pi(color, retries=2):
-    """Reset a specific Pi's board with retry logic"""
-    session = get_pi_session(color)
-    url = get_pi_url(color)
-    
-    for attempt in range(retries + 1):
-        try:
-            response = session.post(
-                f"{url}/api/game-control",
-                json={'command': 'reset'},
-                timeout=PI_TIMEOUT
-            )
-            return response.json()
-        except requests.exceptions.ConnectionError as e:
-            if attempt < retries:
-                print(f"Connection error resetting {color} Pi (attempt {attempt + 1}/{retries + 1}): {e}")
-                time.sleep(0.5 * (attempt + 1))
-                continue
-            print(f"Error resetting {color} Pi: {e}")
-            return {'status': 'error', 'message': str(e)}
-        except requests.exceptions.Timeout as e:
-            if attempt < retries:
-                print(f"Timeout resetting {color} Pi (attempt {attempt + 1}/{retries + 1}): {e}")
-                time.sleep(0.5 * (attempt + 1))
-                continue
-            print(f"Timeout error resetting {color} Pi: {e}")
-            return {'status': 'error', 'message': f'Timeout: {str(e)}'}
-        except Exception as e:
-            print(f"Error resetting {color} Pi: {e}")
-            if attempt < retries:
-                time.sleep(0.5 * (attempt + 1))
-                continue
-            return {'status': 'error', 'message': str(e)}
-    
-    return {'status': 'error', 'message': 'Failed after retries'}
+def summarize_engine_telemetry(entries):
+    """Average the search telemetry of a list of moves"""
+    def mean(values):
+        values = [v for v in values if v is not None]
+        return round(sum(values) / len(values), 4) if values else None
+    
+    return {
+        'moves': len(entries),
+        'depth': mean(e.get('depth') for e in entries),
+        'seldepth': mean(e.get('seldepth') for e in entries),
+        'nodes': mean(e.get('nodes') for e in entries),
+        'nps': mean(e.get('nps') for e in entries),
+        'search_time': mean(e.get('time') for e in entries),
+        'elapsed': mean(e.get('elapsed') for e in entries),
+        'budget_used': mean(e['elapsed'] / e['budget'] for e in entries
+                            if e.get('elapsed') is not None and e.get('budget'))
+    }
 
-@app.route('/')
+@board_api.route('/')
 def index():
     """Return the main page"""
-    return render_template('index.html')
+    return render_template('index.html', api_base=g.api_base, board_name=current_board().name)
 
-@app.route('/api/test')
+@board_api.route('/api/test')
 def test_api():
     """Test the API"""
     return jsonify({
@@ -368,27 +190,36 @@ def test_api():
         'chess': 'â™”â™•â™–â™—â™˜â™™'
     })
 
-@app.route('/api/pi-status', methods=['GET'])
+@board_api.route('/api/pi-status', methods=['GET'])
 def check_pi_status():
     """Check connection status of both Pis"""
-    global pi_white_connected, pi_black_connected
+    coordinator = current_board()
     
-    pi_white_connected = check_pi_connection('white')
-    pi_black_connected = check_pi_connection('black')
+    # A Pi that is down is checked by pi_recovery_loop, not here (that would wait out the retries)
+    coordinator.pi_white_connected = (coordinator.pi_health['white']['state'] != 'down'
+                                      and coordinator.check_pi_connection('white'))
+    coordinator.pi_black_connected = (coordinator.pi_health['black']['state'] != 'down'
+                                      and coordinator.check_pi_connection('black'))
+    needed = ['white', 'black'] if coordinator.current_game_mode == GAME_MODES['cpu_vs_cpu'] else ['black']
+    down = [color for color in needed if coordinator.pi_health[color]['state'] == 'down']
     
     status_msg = []
-    if current_game_mode == GAME_MODES['cpu_vs_cpu']:
-        if pi_white_connected and pi_black_connected:
+    if down:
+        status_msg.append(' and '.join(f"{color.capitalize()} Pi" for color in down) +
+                          " down - local engine playing")
+        status = 'fallback'
+    elif coordinator.current_game_mode == GAME_MODES['cpu_vs_cpu']:
+        if coordinator.pi_white_connected and coordinator.pi_black_connected:
             status_msg.append("Both Pis connected")
             status = 'connected'
         else:
-            if not pi_white_connected:
+            if not coordinator.pi_white_connected:
                 status_msg.append("White Pi disconnected")
-            if not pi_black_connected:
+            if not coordinator.pi_black_connected:
                 status_msg.append("Black Pi disconnected")
             status = 'partial'
     else:  # user_vs_cpu mode
-        if pi_black_connected:
+        if coordinator.pi_black_connected:
             status_msg.append("Black Pi connected")
             status = 'connected'
         else:
@@ -398,15 +229,35 @@ def check_pi_status():
     return jsonify({
         'status': status,
         'message': ', '.join(status_msg),
-        'white_connected': pi_white_connected,
-        'black_connected': pi_black_connected,
-        'game_mode': current_game_mode
+        'white_connected': coordinator.pi_white_connected,
+        'black_connected': coordinator.pi_black_connected,
+        'game_mode': coordinator.current_game_mode,
+        'pi_health': coordinator.pi_health,
+        'fallback': coordinator.local_fallback.stats(),
+        'analysis': coordinator.analysis_service.stats(),
+        'engine_pool': coordinator.engine_pool.stats() if coordinator.engine_pool else None,
+        'session': {**session_status(coordinator), **sessions.stats()}
     })
 
-@app.route('/api/set-game-mode', methods=['POST'])
+@board_api.route('/api/session/take-over', methods=['POST'])
+def take_over_session():
+    """A watching browser becomes the player once the board is free or its player has gone quiet"""
+    coordinator = current_board()
+    if not sessions.take_over(coordinator.board_id, g.session_id):
+        return jsonify({
+            'status': 'error',
+            'message': 'The player is still playing; the board can be taken over after '
+                       f'{sessions.takeover_after} seconds without a move',
+            **session_status(coordinator)
+        }), 409
+    coordinator.log("Board taken over by another browser")
+    return jsonify({'status': 'success', 'message': 'This browser now plays the board', **session_status(coordinator)})
+
+@board_api.route('/api/set-game-mode', methods=['POST'])
+@changes_game
 def set_game_mode():
     """Set game mode and initialize appropriate Pis"""
-    global current_game_mode, white_elo, black_elo, white_nnue, black_nnue, white_nnue_model, black_nnue_model, current_player, game_active
+    coordinator = current_board()
     
     data = request.get_json()
     mode = data.get('mode')
@@ -414,15 +265,16 @@ def set_game_mode():
     if mode not in GAME_MODES.values():
         return jsonify({"status": "error", "message": "Invalid mode"}), 400
     
-    current_game_mode = mode
-    white_elo = data.get("white_elo", DEFAULT_WHITE_ELO)
-    black_elo = data.get("black_elo", DEFAULT_BLACK_ELO)
-    white_nnue = data.get("white_nnue", False)
-    black_nnue = data.get("black_nnue", False)
-    white_nnue_model = data.get("white_nnue_model", "carlsen")
-    black_nnue_model = data.get("black_nnue_model", "carlsen")
-    current_player = 'white'
-    game_active = True
+    coordinator.current_game_mode = mode
+    coordinator.engine_telemetry.clear()
+    coordinator.white_elo = data.get("white_elo", DEFAULT_WHITE_ELO)
+    coordinator.black_elo = data.get("black_elo", DEFAULT_BLACK_ELO)
+    coordinator.white_nnue = data.get("white_nnue", False)
+    coordinator.black_nnue = data.get("black_nnue", False)
+    coordinator.white_nnue_model = data.get("white_nnue_model", "carlsen")
+    coordinator.black_nnue_model = data.get("black_nnue_model", "carlsen")
+    coordinator.current_player = 'white'
+    coordinator.game_active = True
     
     # Calculate skill level from ELO (approximation)
     def elo_to_skill(elo):
@@ -434,13 +286,13 @@ def set_game_mode():
         else:
             return int((elo - 1350) / 75)
     
-    white_skill = elo_to_skill(white_elo)
-    black_skill = elo_to_skill(black_elo)
+    white_skill = elo_to_skill(coordinator.white_elo)
+    black_skill = elo_to_skill(coordinator.black_elo)
     
     print(f"\n{'='*60}")
-    print(f"Setting up game mode: {mode}")
-    print(f"White: ELO {white_elo}, Skill {white_skill}, NNUE: {white_nnue} ({white_nnue_model if white_nnue else 'N/A'})")
-    print(f"Black: ELO {black_elo}, Skill {black_skill}, NNUE: {black_nnue} ({black_nnue_model if black_nnue else 'N/A'})")
+    print(f"Setting up game mode on {coordinator.name}: {mode}")
+    print(f"White: ELO {coordinator.white_elo}, Skill {white_skill}, NNUE: {coordinator.white_nnue} ({coordinator.white_nnue_model if coordinator.white_nnue else 'N/A'})")
+    print(f"Black: ELO {coordinator.black_elo}, Skill {black_skill}, NNUE: {coordinator.black_nnue} ({coordinator.black_nnue_model if coordinator.black_nnue else 'N/A'})")
     print(f"{'='*60}\n")
     
     # Initialize appropriate Pis based on mode
@@ -448,54 +300,57 @@ def set_game_mode():
     
     if mode == GAME_MODES['user_vs_cpu']:
         # Only need black Pi
-        print(f"Initializing Black Pi at {PI_BLACK_IP}...")
-        if not initialize_pi_engine('black', black_elo, black_skill, black_nnue, black_nnue_model):
+        coordinator.log(f"Initializing Black Pi at {coordinator.get_pi_url('black')}...")
+        if not coordinator.initialize_pi_engine('black', coordinator.black_elo, black_skill, coordinator.black_nnue, coordinator.black_nnue_model):
             return jsonify({
                 "status": "error",
                 "message": "Failed to initialize Black Pi. Check connection."
             }), 500
-        print("Black Pi initialized successfully")
+        coordinator.log("Black Pi initialized successfully")
         
     elif mode == GAME_MODES['cpu_vs_cpu']:
         # Need both Pis
-        print(f"Initializing White Pi at {PI_WHITE_IP}...")
-        if not initialize_pi_engine('white', white_elo, white_skill, white_nnue, white_nnue_model):
+        coordinator.log(f"Initializing White Pi at {coordinator.get_pi_url('white')}...")
+        if not coordinator.initialize_pi_engine('white', coordinator.white_elo, white_skill, coordinator.white_nnue, coordinator.white_nnue_model):
             return jsonify({
                 "status": "error",
                 "message": "Failed to initialize White Pi. Check connection."
             }), 500
-        print("White Pi initialized successfully")
+        coordinator.log("White Pi initialized successfully")
         
-        print(f"Initializing Black Pi at {PI_BLACK_IP}...")
-        if not initialize_pi_engine('black', black_elo, black_skill, black_nnue, black_nnue_model):
+        coordinator.log(f"Initializing Black Pi at {coordinator.get_pi_url('black')}...")
+        if not coordinator.initialize_pi_engine('black', coordinator.black_elo, black_skill, coordinator.black_nnue, coordinator.black_nnue_model):
             return jsonify({
                 "status": "error",
                 "message": "Failed to initialize Black Pi. Check connection."
             }), 500
-        print("Black Pi initialized successfully")
+        coordinator.log("Black Pi initialized successfully")
     
     # Get initial board state from black Pi (as reference)
-    board_state_response = get_board_state_from_pi('black')
+    coordinator.start_archived_game()
+    board_state_response = coordinator.get_board_state_from_pi('black')
     board_state = board_state_response.get('board_state', {})
     
     print(f"\nGame mode setup complete!")
-    print(f"Current player: {current_player}\n")
+    print(f"Current player: {coordinator.current_player}\n")
     
     return jsonify({
         "status": "success",
         "mode": mode,
-        "white_elo": white_elo,
-        "black_elo": black_elo,
+        "white_elo": coordinator.white_elo,
+        "black_elo": coordinator.black_elo,
         "board_state": board_state,
-        "current_player": current_player
+        "legal_moves": board_state_response.get('legal_moves'),
+        "current_player": coordinator.current_player
     })
 
-@app.route('/api/move', methods=['POST'])
+@board_api.route('/api/move', methods=['POST'])
+@changes_game
 def handle_move():
     """Handle a move from the user (only in user_vs_cpu mode)"""
-    global current_player
+    coordinator = current_board()
     
-    if current_game_mode != GAME_MODES['user_vs_cpu']:
+    if coordinator.current_game_mode != GAME_MODES['user_vs_cpu']:
         return jsonify({
             'status': 'error',
             'message': 'User moves only allowed in user_vs_cpu mode'
@@ -506,6 +361,7 @@ def handle_move():
         from_square = data.get('from')
         to_square = data.get('to')
         piece = data.get('piece')
+        promotion = data.get('promotion')
         
         if not from_square or not to_square:
             return jsonify({
@@ -513,11 +369,27 @@ def handle_move():
                 'message': 'Missing from or to square'
             }), 400
         
+        # reply: true asks the black Pi for its answer in the same request; with
+        # stream: true the move is acknowledged first and the reply follows (NDJSON)
+        reply = bool(data.get('reply'))
+        game_speed = data.get('game_speed', 10)
+        
         # Send move to black Pi (it maintains the board state)
-        result = send_move_to_pi('black', from_square, to_square, piece)
+        if reply and data.get('stream'):
+            result = coordinator.stream_move_to_pi('black', from_square, to_square, piece, promotion, game_speed)
+            if not isinstance(result, dict):
+                return Response(coordinator.relay_move_and_reply(result, from_square, to_square, promotion,
+                                                                 game_speed),
+                                mimetype='application/x-ndjson')
+        else:
+            result = coordinator.send_move_to_pi('black', from_square, to_square, piece, promotion,
+                                                 reply=reply, game_speed=game_speed)
         
         if result.get('status') == 'success' and result.get('move_accepted'):
-            current_player = result.get('current_player', 'black')
+            coordinator.current_player = result.get('current_player', 'black')
+            coordinator.archive_move(from_square, to_square, promotion, result)
+            if result.get('reply'):
+                coordinator.record_engine_reply(result['reply'], game_speed)
             return jsonify(result)
         else:
             return jsonify(result), 400
@@ -528,16 +400,17 @@ def handle_move():
             'message': f'Server error: {str(e)}'
         }), 500
 
-@app.route('/api/board-state', methods=['GET'])
+@board_api.route('/api/board-state', methods=['GET'])
 def get_board_state_endpoint():
     """Get current board state from appropriate Pi"""
+    coordinator = current_board()
     try:
         # Get board state from black Pi (it's always involved)
-        result = get_board_state_from_pi('black')
+        result = coordinator.get_board_state_from_pi('black')
         
         if result.get('status') == 'success':
-            result['current_player'] = current_player
-            result['game_mode'] = current_game_mode
+            result['current_player'] = coordinator.current_player
+            result['game_mode'] = coordinator.current_game_mode
             return jsonify(result)
         else:
             return jsonify(result), 500
@@ -548,32 +421,28 @@ def get_board_state_endpoint():
             'message': f'Error getting board state: {str(e)}'
         }), 500
 
-@app.route('/api/engine-move', methods=['POST'])
+@board_api.route('/api/engine-move', methods=['POST'])
+@changes_game
 def get_engine_move_endpoint():
     """Get engine move from appropriate Pi"""
-    global current_player
+    coordinator = current_board()
     
     try:
         data = request.get_json() or {}
         game_speed = data.get('game_speed', 10)
         
         # Determine which Pi to get move from
-        if current_game_mode == GAME_MODES['user_vs_cpu']:
-            # Always black Pi
-            pi_color = 'black'
-        elif current_game_mode == GAME_MODES['cpu_vs_cpu']:
-            # Alternate based on current player
-            pi_color = current_player
-        else:
+        pi_color = coordinator.get_thinking_pi_color()
+        if pi_color is None:
             return jsonify({
                 'status': 'error',
                 'message': 'No game mode set'
             }), 400
         
-        print(f"\nRequesting move from {pi_color} Pi (current player: {current_player})")
+        print(f"\n[{coordinator.board_id}] Requesting move from {pi_color} Pi (current player: {coordinator.current_player})")
         
         # Get move from appropriate Pi
-        result = get_engine_move_from_pi(pi_color, game_speed)
+        result = coordinator.get_engine_move_from_pi(pi_color, game_speed)
         
         if result.get('status') == 'success':
             engine_move = result.get('engine_move')
@@ -582,54 +451,177 @@ def get_engine_move_endpoint():
             # do NOT try to sync a move (engine_move may be None). Just return
             # the result so the frontend can handle end-of-game logic.
             if result.get('game_over'):
-                print(f"Pi reports game over. Winner: {result.get('winner')}")
+                coordinator.log(f"Pi reports game over. Winner: {result.get('winner')}")
+                if engine_move:
+                    coordinator.game_archive.record_move(engine_move.get('from'), engine_move.get('to'),
+                                                         engine_move.get('promotion'))
+                coordinator.finish_archived_game(result.get('winner'))
                 return jsonify(result)
             
             # Normal move path
             if engine_move:
+                coordinator.record_engine_telemetry(pi_color, game_speed, engine_move)
+                coordinator.archive_move(engine_move.get('from'), engine_move.get('to'),
+                                         engine_move.get('promotion'), result)
+                
                 # In CPU vs CPU mode, we need to sync the move to the other Pi
-                if current_game_mode == GAME_MODES['cpu_vs_cpu']:
+                if coordinator.current_game_mode == GAME_MODES['cpu_vs_cpu']:
                     other_color = 'black' if pi_color == 'white' else 'white'
-                    print(f"Syncing move to {other_color} Pi...")
-                    
-                    sync_result = send_move_to_pi(
-                        other_color,
-                        engine_move.get('from'),
-                        engine_move.get('to'),
-                        engine_move.get('piece')
-                    )
-                    
-                    if sync_result.get('status') != 'success':
-                        print(f"Warning: Failed to sync to {other_color} Pi: {sync_result.get('message')}")
+                    if coordinator.pi_health[other_color]['state'] != 'up':
+                        # Played locally; the Pi gets the move from the move log when it recovers
+                        coordinator.log(f"{other_color.capitalize()} Pi is down - not syncing")
+                    else:
+                        coordinator.log(f"Syncing move to {other_color} Pi...")
+                        
+                        sync_result = coordinator.send_move_to_pi(
+                            other_color,
+                            engine_move.get('from'),
+                            engine_move.get('to'),
+                            engine_move.get('piece'),
+                            engine_move.get('promotion')
+                        )
+                        
+                        if sync_result.get('status') != 'success':
+                            coordinator.log(f"Warning: Failed to sync to {other_color} Pi: {sync_result.get('message')}")
             else:
-                print("Warning: Pi returned success but engine_move is None and game_over is False")
+                coordinator.log("Warning: Pi returned success but engine_move is None and game_over is False")
             
             # Update current player (only really matters if game is continuing)
-            current_player = result.get('current_player', 'white' if pi_color == 'black' else 'black')
-            print(f"Move complete. New current player: {current_player}\n")
+            coordinator.current_player = result.get('current_player', 'white' if pi_color == 'black' else 'black')
+            coordinator.log(f"Move complete. New current player: {coordinator.current_player}\n")
             
             return jsonify(result)
         else:
             return jsonify(result), 500
             
     except Exception as e:
-        print(f"Engine move error: {e}")
+        coordinator.log(f"Engine move error: {e}")
         return jsonify({
             "status": "error",
             "message": f"Engine error: {str(e)}"
         }), 500
 
-@app.route('/api/game-control', methods=['POST'])
+@board_api.route('/api/search-stream', methods=['GET'])
+def search_stream():
+    """Relay the thinking Pi's live search info (depth, score, WDL, PV) as server-sent events"""
+    coordinator = current_board()
+    color = request.args.get('color') or coordinator.get_thinking_pi_color()
+    if color not in ('white', 'black'):
+        return jsonify({
+            'status': 'error',
+            'message': 'No game mode set'
+        }), 400
+    
+    return Response(coordinator.relay_search_stream_from_pi(color), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache'})
+
+@board_api.route('/api/engine-stats', methods=['GET'])
+def get_engine_stats():
+    """Search telemetry for the current game, per color and per think-time budget"""
+    coordinator = current_board()
+    by_color = {}
+    for color in ('white', 'black'):
+        entries = [e for e in coordinator.engine_telemetry if e['color'] == color]
+        if entries:
+            by_color[color] = summarize_engine_telemetry(entries)
+    
+    by_budget = {}
+    for budget in sorted({e.get('budget') for e in coordinator.engine_telemetry if e.get('budget')}):
+        entries = [e for e in coordinator.engine_telemetry if e.get('budget') == budget]
+        by_budget[f"{budget:.2f}"] = summarize_engine_telemetry(entries)
+    
+    return jsonify({
+        'status': 'success',
+        'by_color': by_color,
+        'by_budget': by_budget,
+        'moves': coordinator.engine_telemetry
+    })
+
+@board_api.route('/api/analysis', methods=['GET'])
+def get_position_analysis():
+    """Analysis of a position by an idle Pi (eval bar, hints); ?fen= defaults to the current position
+    
+    Answers right away: with the cached analysis, or with pending: true after
+    queueing the position (ask again shortly).
+    """
+    coordinator = current_board()
+    fen = request.args.get('fen')
+    try:
+        board = chess.Board(fen) if fen else coordinator.fallback_board()
+    except ValueError:
+        return jsonify({
+            'status': 'error',
+            'message': f'Invalid FEN: {fen}'
+        }), 400
+    
+    analysis = coordinator.analysis_service.lookup(board)
+    if analysis is None or analysis['preempted']:
+        coordinator.analysis_service.submit(board, PRIORITY_CURRENT)
+    return jsonify({
+        'status': 'success',
+        'fen': board.fen(),
+        'analysis': analysis,
+        'pending': analysis is None or analysis['preempted'],
+        'analysis_pis': coordinator.analysis_pis()
+    })
+
+@board_api.route('/api/games/<game_id>/analysis', methods=['GET'])
+def get_game_annotation(game_id):
+    """Per-ply analysis of an archived game; missing positions are queued for the idle Pis"""
+    coordinator = current_board()
+    pgn = coordinator.game_archive.get_pgn(game_id)
+    if pgn is None:
+        return jsonify({
+            'status': 'error',
+            'message': f'Unknown game: {game_id}'
+        }), 404
+    
+    game = chess.pgn.read_game(io.StringIO(pgn))
+    plies = coordinator.analysis_service.annotate(game.end().board())
+    return jsonify({
+        'status': 'success',
+        'game_id': game_id,
+        'plies': plies,
+        'pending': sum(1 for ply in plies if ply['analysis'] is None and not chess.Board(ply['fen']).is_game_over())
+    })
+
+@board_api.route('/api/games', methods=['GET'])
+def list_archived_games():
+    """Most recently archived games (index entries, newest first)"""
+    coordinator = current_board()
+    limit = request.args.get('limit', 50, type=int)
+    return jsonify({
+        'status': 'success',
+        'current_game': coordinator.game_archive.current_game_id(),
+        'total': len(coordinator.game_archive.index),
+        'games': coordinator.game_archive.recent(limit)
+    })
+
+@board_api.route('/api/games/<game_id>', methods=['GET'])
+def get_archived_game(game_id):
+    """PGN of one archived game"""
+    coordinator = current_board()
+    pgn = coordinator.game_archive.get_pgn(game_id)
+    if pgn is None:
+        return jsonify({
+            'status': 'error',
+            'message': f'Unknown game: {game_id}'
+        }), 404
+    return Response(pgn, mimetype='application/x-chess-pgn',
+                    headers={'Content-Disposition': f'inline; filename="{game_id}.pgn"'})
+
+@board_api.route('/api/game-control', methods=['POST'])
+@changes_game
 def handle_game_control():
     """Handle game control commands"""
-    global current_player, game_active, white_elo, black_elo, white_nnue, black_nnue, white_nnue_model, black_nnue_model
+    coordinator = current_board()
     
     try:
         data = request.get_json()
         command = data.get('command')
         
         if command == 'reset':
-            print("\nReset request received - resetting and re-initializing Pis...")
+            print(f"\n[{coordinator.board_id}] Reset request received - resetting and re-initializing Pis...")
             
             # Calculate skill levels from stored ELOs
             def elo_to_skill(elo):
@@ -640,60 +632,63 @@ def handle_game_control():
                 else:
                     return int((elo - 1350) / 75)
             
-            white_skill = elo_to_skill(white_elo)
-            black_skill = elo_to_skill(black_elo)
+            white_skill = elo_to_skill(coordinator.white_elo)
+            black_skill = elo_to_skill(coordinator.black_elo)
             
             # Reset and re-initialize appropriate Pis based on mode
-            if current_game_mode == GAME_MODES['cpu_vs_cpu']:
+            if coordinator.current_game_mode == GAME_MODES['cpu_vs_cpu']:
                 # Reset and re-initialize both Pis
-                print(f"Re-initializing White Pi: ELO {white_elo}, NNUE {white_nnue} ({white_nnue_model if white_nnue else 'N/A'})")
-                if not initialize_pi_engine('white', white_elo, white_skill, white_nnue, white_nnue_model):
+                coordinator.log(f"Re-initializing White Pi: ELO {coordinator.white_elo}, NNUE {coordinator.white_nnue} ({coordinator.white_nnue_model if coordinator.white_nnue else 'N/A'})")
+                if not coordinator.initialize_pi_engine('white', coordinator.white_elo, white_skill, coordinator.white_nnue, coordinator.white_nnue_model):
                     return jsonify({
                         'status': 'error',
                         'message': "Failed to re-initialize White Pi after reset."
                     }), 500
                 
-                print(f"Re-initializing Black Pi: ELO {black_elo}, NNUE {black_nnue} ({black_nnue_model if black_nnue else 'N/A'})")
-                if not initialize_pi_engine('black', black_elo, black_skill, black_nnue, black_nnue_model):
+                coordinator.log(f"Re-initializing Black Pi: ELO {coordinator.black_elo}, NNUE {coordinator.black_nnue} ({coordinator.black_nnue_model if coordinator.black_nnue else 'N/A'})")
+                if not coordinator.initialize_pi_engine('black', coordinator.black_elo, black_skill, coordinator.black_nnue, coordinator.black_nnue_model):
                     return jsonify({
                         'status': 'error',
                         'message': "Failed to re-initialize Black Pi after reset."
                     }), 500
             else:
                 # Reset and re-initialize only black Pi
-                print(f"Re-initializing Black Pi: ELO {black_elo}, NNUE {black_nnue} ({black_nnue_model if black_nnue else 'N/A'})")
-                if not initialize_pi_engine('black', black_elo, black_skill, black_nnue, black_nnue_model):
+                coordinator.log(f"Re-initializing Black Pi: ELO {coordinator.black_elo}, NNUE {coordinator.black_nnue} ({coordinator.black_nnue_model if coordinator.black_nnue else 'N/A'})")
+                if not coordinator.initialize_pi_engine('black', coordinator.black_elo, black_skill, coordinator.black_nnue, coordinator.black_nnue_model):
                     return jsonify({
                         'status': 'error',
                         'message': "Failed to re-initialize Black Pi after reset."
                     }), 500
             
-            current_player = 'white'
-            game_active = True
+            coordinator.current_player = 'white'
+            coordinator.game_active = True
+            coordinator.engine_telemetry.clear()
             
             # Get board state after reset
-            board_state_response = get_board_state_from_pi('black')
+            coordinator.start_archived_game()
+            board_state_response = coordinator.get_board_state_from_pi('black')
             board_state = board_state_response.get('board_state', {})
             
-            print("Reset and re-initialization complete\n")
+            coordinator.log("Reset and re-initialization complete\n")
             
             return jsonify({
                 'status': 'success',
                 'message': 'Game reset to starting position',
                 'board_state': board_state,
-                'current_player': current_player,
-                'game_mode': current_game_mode
+                'legal_moves': board_state_response.get('legal_moves'),
+                'current_player': coordinator.current_player,
+                'game_mode': coordinator.current_game_mode
             })
         
         elif command == 'pause':
-            game_active = False
+            coordinator.game_active = False
             return jsonify({
                 'status': 'success',
                 'message': 'Game paused'
             })
         
         elif command == 'resume':
-            game_active = True
+            coordinator.game_active = True
             return jsonify({
                 'status': 'success',
                 'message': 'Game resumed'
@@ -701,27 +696,30 @@ def handle_game_control():
         
         elif command == 'interrupt':
             # Interrupt command - reset game and clear scores
-            print("\nInterrupt request received - resetting Pis and clearing scores...")
+            print(f"\n[{coordinator.board_id}] Interrupt request received - resetting Pis and clearing scores...")
             
             # Reset appropriate Pis based on mode
-            if current_game_mode == GAME_MODES['cpu_vs_cpu']:
+            if coordinator.current_game_mode == GAME_MODES['cpu_vs_cpu']:
                 # Reset both Pis
-                reset_pi('white')
-                reset_pi('black')
+                coordinator.reset_pi('white')
+                coordinator.reset_pi('black')
             else:
                 # Reset only black Pi
-                reset_pi('black')
+                coordinator.reset_pi('black')
             
             # Reset game state
-            current_player = 'white'
-            game_active = False
+            coordinator.current_player = 'white'
+            coordinator.game_active = False
+            coordinator.finish_archived_game(termination='abandoned')
+            # The game is over: the next browser to start one plays the board
+            sessions.release(coordinator.board_id, g.session_id)
             
-            print("Interrupt complete - game reset, scores cleared\n")
+            coordinator.log("Interrupt complete - game reset, scores cleared\n")
             
             return jsonify({
                 'status': 'success',
                 'message': 'Game interrupted and reset',
-                'current_player': current_player
+                'current_player': coordinator.current_player
             })
         
         else:
@@ -736,18 +734,28 @@ def handle_game_control():
             'message': f'Control error: {str(e)}'
         }), 500
 
+app.register_blueprint(board_api)
+app.register_blueprint(board_api, url_prefix='/boards/<board_id>', name='board')
+
 if __name__ == '__main__':
     print("="*60)
     print("Starting AI Chess GUI Server with Raspberry Pi Integration")
     print("="*60)
     print(f"\nConfiguration:")
-    print(f"  White Pi: {PI_WHITE_IP}:{PI_PORT}")
-    print(f"  Black Pi: {PI_BLACK_IP}:{PI_PORT}")
-    print(f"  GUI Server: {FLASK_HOST}:{FLASK_PORT}")
-    print("\nMake sure both Pis are running pi_chess_server.py")
+    for coordinator in boards:
+        prefix = '' if coordinator.board_id == boards.default_id else f"/boards/{coordinator.board_id}"
+        print(f"  {coordinator.name} ({prefix or '/'}):")
+        print(f"    White Pi: {coordinator.get_pi_url('white')}")
+        print(f"    Black Pi: {coordinator.get_pi_url('black')}")
+    print(f"  GUI Server: {FLASK_HOST}:{FLASK_PORT} ({SERVER_MODE} server)")
+    print("\nMake sure every Pi is running pi_chess_server.py")
     print("="*60 + "\n")
     
     try:
-        app.run(debug=FLASK_DEBUG, host=FLASK_HOST, port=FLASK_PORT)
+        run_server(app, FLASK_HOST, FLASK_PORT, mode=SERVER_MODE, debug=FLASK_DEBUG,
+                   threads=SERVER_THREADS, connection_limit=SERVER_CONNECTION_LIMIT,
+                   keepalive_timeout=SERVER_KEEPALIVE_TIMEOUT, backlog=SERVER_BACKLOG)
     except KeyboardInterrupt:
         print("\n\nShutting down server...")
+    finally:
+        boards.close()
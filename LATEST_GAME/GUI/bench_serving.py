@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Serving Mode Benchmark
+file: /AI_Chess_Senior_Design/GUI/bench_serving.py
+
+Plays the same load against the GUI server (app.py) once per serving mode
+(Board_apps/wsgi_server.py) and compares requests per second and latency
+percentiles:
+    dev          Werkzeug's development server, as app.run() starts it
+                 (with the debugger when FLASK_DEBUG is on)
+    production   waitress with the SERVER_* settings from config.py
+
+The load is load_test.py's: --browsers tabs of the player playing against
+two fake Pis (fake_pi.py) and --spectators browsers polling the board. The
+server, the fake Pis and the simulated browsers all run in this process, so
+the numbers compare the modes with each other rather than measure what the
+laptop can take.
+
+Usage:
+    python bench_serving.py
+    python bench_serving.py --browsers 2 --spectators 50 --duration 20
+    python bench_serving.py --mode cpu_vs_cpu --mover delay --threads 16
+"""
+
+import argparse
+import contextlib
+import logging
+import os
+import random
+import sys
+import threading
+import time
+
+from werkzeug.debug import DebuggedApplication
+from werkzeug.serving import make_server
+
+from fake_pi import MOVERS, FakePi
+from load_test import LoadStats, import_coordinator, percentile, player_cookies, run_browser, run_spectator
+
+
+def serve(mode, app, args):
+    """Start app on a free local port in mode; returns (base URL, stop function)"""
+    if mode == 'dev':
+        # What app.run() does: threaded Werkzeug server, debugger with FLASK_DEBUG
+        server = make_server('127.0.0.1', 0, DebuggedApplication(app) if args.debug else app, threaded=True)
+        thread = threading.Thread(target=server.serve_forever, name='dev-server', daemon=True)
+        thread.start()
+        return f"http://127.0.0.1:{server.server_port}", server.shutdown
+
+    # Board_apps/wsgi_server.py (app.py puts Board_apps on sys.path)
+    from wsgi_server import make_production_server
+    server = make_production_server(app, '127.0.0.1', 0, threads=args.threads,
+                                    connection_limit=args.connection_limit,
+                                    keepalive_timeout=args.keepalive_timeout, backlog=args.backlog)
+    def run():
+        # close() from the benchmark's thread pulls the sockets out from under the loop
+        with contextlib.suppress(OSError):
+            server.run()
+
+    thread = threading.Thread(target=run, name='production-server', daemon=True)
+    thread.start()
+    return f"http://127.0.0.1:{server.effective_port}", server.close
+
+
+def run_load(base_url, args, seed, cookies):
+    """load_test.py's browsers and spectators for args.duration seconds; returns (LoadStats, seconds)"""
+    stats = LoadStats()
+    start = time.perf_counter()
+    stop_at = start + args.duration
+    threads = [threading.Thread(target=run_browser, args=(base_url, args, stats, stop_at, seed + i, cookies),
+                                daemon=True)
+               for i in range(args.browsers)]
+    threads += [threading.Thread(target=run_spectator, args=(base_url, stats, stop_at), daemon=True)
+                for _ in range(args.spectators)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return stats, time.perf_counter() - start
+
+
+def summary(stats, elapsed):
+    """(requests, errors, requests/s, p50, p99, max in ms) over every request but the plies"""
+    values = sorted(seconds for name, latencies in stats.latencies.items() if name != 'ply'
+                    for seconds in latencies)
+    errors = sum(count for name, count in stats.errors.items() if name != 'ply')
+    if not values:
+        return 0, errors, 0.0, None, None, None
+    return (len(values), errors, len(values) / elapsed, percentile(values, 50) * 1000,
+            percentile(values, 99) * 1000, values[-1] * 1000)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the GUI server's dev and production serving modes")
+    parser.add_argument('--modes', nargs='+', choices=['dev', 'production'], default=['dev', 'production'])
+    parser.add_argument('--browsers', type=int, default=2, help="simulated browser tabs playing")
+    parser.add_argument('--spectators', type=int, default=20, help="browsers only watching the game")
+    parser.add_argument('--duration', type=float, default=15.0, help="seconds per mode")
+    parser.add_argument('--mode', choices=['user_vs_cpu', 'cpu_vs_cpu'], default='user_vs_cpu')
+    parser.add_argument('--pipelined', action='store_true',
+                        help="user_vs_cpu: get the engine reply with the move (reply + stream)")
+    parser.add_argument('--game-speed', type=int, default=20)
+    parser.add_argument('--elo', type=int, default=1500)
+    parser.add_argument('--mover', choices=MOVERS, default='random', help="fake Pi move generation")
+    parser.add_argument('--latency', type=float, default=0.0, help="fake Pi latency per request (s)")
+    # Serving settings default to config.py's (read once app.py is imported)
+    parser.add_argument('--debug', action=argparse.BooleanOptionalAction, default=None,
+                        help="dev mode with the Werkzeug debugger, as app.run(debug=True) (FLASK_DEBUG)")
+    parser.add_argument('--threads', type=int, default=None, help="production threads (SERVER_THREADS)")
+    parser.add_argument('--connection-limit', type=int, default=None)
+    parser.add_argument('--keepalive-timeout', type=float, default=None)
+    parser.add_argument('--backlog', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--log', default=os.devnull,
+                        help="file for the GUI server's console output (default: discarded)")
+    args = parser.parse_args()
+    args.plies = 0
+
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+    logging.getLogger('waitress').setLevel(logging.ERROR)
+    fakes = [FakePi(f"fake-pi-{color}", args.mover, args.latency, seed=args.seed) for color in ('black', 'white')]
+    seed = args.seed if args.seed is not None else random.randrange(1 << 30)
+    log = open(args.log, 'w')
+    coordinator = None
+    cookies = None
+    results = []
+    try:
+        for fake in fakes:
+            fake.start()
+        with contextlib.redirect_stdout(log):
+            coordinator = import_coordinator(*fakes)
+        for name, setting in [('debug', 'FLASK_DEBUG'), ('threads', 'SERVER_THREADS'),
+                              ('connection_limit', 'SERVER_CONNECTION_LIMIT'),
+                              ('keepalive_timeout', 'SERVER_KEEPALIVE_TIMEOUT'), ('backlog', 'SERVER_BACKLOG')]:
+            if getattr(args, name) is None:
+                setattr(args, name, getattr(coordinator, setting))
+
+        for mode in args.modes:
+            print(f"{mode}: {args.browsers} browsers, {args.spectators} spectators, {args.mode}, "
+                  f"{args.duration:g}s ...")
+            base_url, stop = serve(mode, coordinator.app, args)
+            try:
+                # The same player's browser in every mode: the board stays its to play
+                cookies = cookies or player_cookies(base_url)
+                with contextlib.redirect_stdout(log):
+                    stats, elapsed = run_load(base_url, args, seed, cookies)
+            finally:
+                stop()
+            print(stats.report(elapsed) + "\n")
+            results.append((mode, summary(stats, elapsed)))
+
+        print(f"{'mode':<12}{'requests':>10}{'errors':>8}{'req/s':>9}{'p50':>9}{'p99':>9}{'max':>9}   (ms)")
+        for mode, (count, errors, rate, p50, p99, worst) in results:
+            cells = ''.join(f"{value:>9.1f}" if value is not None else f"{'-':>9}" for value in (p50, p99, worst))
+            print(f"{mode:<12}{count:>10}{errors:>8}{rate:>9.1f}{cells}")
+    finally:
+        for fake in fakes:
+            fake.stop()
+        if coordinator is not None:
+            coordinator.boards.close()
+        log.close()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,931 @@
+"""
+Per-Board Coordinator State and Pi Communication
+file: /AI_Chess_Senior_Design/GUI/board_coordinator.py
+
+One GUI server can drive several physical boards, each with its own pair of
+Pis. Everything that belongs to one board lives in a BoardCoordinator: the
+game state (mode, ELOs, personas, whose turn), the HTTP sessions (connection
+pools) to its Pis, Pi health and the local engine fallback, its game archive,
+engine telemetry and its analysis service. Boards share nothing, so a slow or
+unreachable Pi on one board never holds up another.
+
+BoardRegistry holds the boards configured in config.py (BOARDS), or in the
+JSON file named by BOARDS_FILE:
+
+    {"board1": {"name": "Board 1", "white_ip": "192.168.10.2", "white_port": 5002,
+                "black_ip": "192.168.10.3", "black_port": 5002}, ...}
+
+app.py serves every board's API under /boards/<board id>/, and the first
+board also under the original un-prefixed routes.
+
+With ENGINE_POOL on, the registry also owns one EnginePool (engine_pool.py)
+over every board's Pis plus SPARE_PIS: engine moves are searched on the
+least-loaded Pi and then applied to the board's own Pi, and a single
+analysis service (with one cache) uses whichever Pis are idle.
+"""
+
+import json
+import os
+import re
+import threading
+import time
+
+import chess
+import requests
+from requests.adapters import HTTPAdapter
+try:
+    from urllib3.util.retry import Retry
+except ImportError:
+    from requests.packages.urllib3.util.retry import Retry
+
+from config import (
+    PI_PORT, PI_TIMEOUT, ENGINE_POOL_BACKOFF, PI_FALLBACK, PI_RECOVERY_INTERVAL, PI_PROBE_TIMEOUT,
+    ANALYSIS_ENABLED, ANALYSIS_TIME, ANALYSIS_MULTIPV, ANALYSIS_CACHE_SIZE,
+    ANALYSIS_SPLIT, ANALYSIS_SPLIT_GRACE, ANALYSIS_SPLIT_RETRIES,
+    GAME_MODES, DEFAULT_WHITE_ELO, DEFAULT_BLACK_ELO, ENGINE_TELEMETRY_LIMIT,
+    GAME_ARCHIVE_MAX_FILE_MB
+)
+from analysis_service import AnalysisService, PRIORITY_CURRENT
+from engine_pool import EnginePool
+from game_archive import GameArchive
+from pi_fallback import LocalEngineFallback, build_move, position_response
+
+BOARD_ID_PATTERN = re.compile(r'[A-Za-z0-9_-]+')
+
+
+def worker_id(board_id, color):
+    """Engine pool id of a board's Pi, e.g. 'board1-black'"""
+    return f"{board_id}-{color}"
+
+
+def create_analysis_service(pi_url, idle_pis, workers=('white', 'black')):
+    """AnalysisService with the settings from config.py"""
+    return AnalysisService(pi_url, idle_pis, think_time=ANALYSIS_TIME,
+                           multipv=ANALYSIS_MULTIPV, cache_size=ANALYSIS_CACHE_SIZE,
+                           connect_timeout=PI_PROBE_TIMEOUT, read_timeout=PI_TIMEOUT,
+                           split=ANALYSIS_SPLIT, split_grace=ANALYSIS_SPLIT_GRACE,
+                           split_retries=ANALYSIS_SPLIT_RETRIES, workers=workers)
+
+
+# Create persistent HTTP sessions with connection pooling and retry logic
+def create_pi_session():
+    """Create a requests session with connection pooling, keep-alive, and retry logic"""
+    session = requests.Session()
+    
+    # Configure retry strategy with exponential backoff
+    retry_strategy = Retry(
+        total=3,  # Total number of retries
+        backoff_factor=1,  # Wait 1s, 2s, 4s between retries
+        status_forcelist=[500, 502, 503, 504],  # Retry on these HTTP status codes
+        allowed_methods=["GET", "POST"]  # Only retry safe methods
+    )
+    
+    # Configure HTTP adapter with connection pooling
+    adapter = HTTPAdapter(
+        max_retries=retry_strategy,
+        pool_connections=2,  # One pool per Pi (white and black)
+        pool_maxsize=10,  # Max connections per pool
+        pool_block=False  # Don't block if pool is full
+    )
+    
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    
+    # Set default headers for keep-alive
+    session.headers.update({
+        'Connection': 'keep-alive',
+        'Keep-Alive': 'timeout=30, max=100'
+    })
+    
+    return session
+
+
+class BoardCoordinator:
+    """Game state and Pi connections of one physical board"""
+
+    def __init__(self, board_id, white_url, black_url, archive_dir, name=None,
+                 engine_pool=None, analysis_service=None):
+        """
+        Args:
+            board_id: id used in the routes (/boards/<board_id>/api/...)
+            white_url, black_url: base URLs of the board's Pis
+            archive_dir: directory of this board's game archive
+            engine_pool: EnginePool shared by all boards, or None to search on the board's own Pis
+            analysis_service: shared AnalysisService; by default the board gets its own
+        """
+        self.board_id = board_id
+        self.name = name or board_id
+        self.pi_urls = {'white': white_url, 'black': black_url}
+        self.engine_pool = engine_pool
+        self.worker_ids = {color: worker_id(board_id, color) for color in ('white', 'black')}
+
+        # Game state
+        self.current_game_mode = None
+        self.white_elo = DEFAULT_WHITE_ELO
+        self.black_elo = DEFAULT_BLACK_ELO
+        self.white_nnue = False
+        self.black_nnue = False
+        self.white_nnue_model = 'carlsen'  # 'carlsen' or 'fischer'
+        self.black_nnue_model = 'carlsen'  # 'carlsen' or 'fischer'
+        self.game_active = False
+        self.current_player = 'white'
+        # Held by requests that change the game (app.changes_game), so they take turns
+        self.game_lock = threading.RLock()
+
+        # Search telemetry the Pis return with each engine move (depth, nodes, nps, time, score, WDL)
+        self.engine_telemetry = []
+
+        # Every game played on this board is archived as PGN
+        self.game_archive = GameArchive(archive_dir, max_file_bytes=GAME_ARCHIVE_MAX_FILE_MB * 1024 * 1024)
+
+        # Pi connection status
+        self.pi_white_connected = False
+        self.pi_black_connected = False
+
+        # Sessions for each Pi (each with its own connection pool)
+        self.pi_white_session = create_pi_session()
+        self.pi_black_session = create_pi_session()
+
+        # Pi health for the local engine fallback (pi_fallback.py). A Pi that stops
+        # answering goes 'down' and its side is played by the local engine from the
+        # board's move log (the game archive). Once it answers again it is
+        # 'recovering' (difficulty re-applied, board reset) and the next request for it
+        # replays the moves it missed before it is 'up' again.
+        self.local_fallback = LocalEngineFallback()
+        self.pi_health = {color: {'state': 'up', 'since': time.time(), 'reason': None} for color in ('white', 'black')}
+        self.pi_health_lock = threading.Lock()
+        self.pi_restore_lock = threading.Lock()
+        self.pi_recovery_thread = None
+
+        self.owns_analysis_service = analysis_service is None
+        self.analysis_service = analysis_service or create_analysis_service(self.get_pi_url, self.analysis_pis)
+
+    def log(self, message):
+        """Console output tagged with the board it is about"""
+        print(f"[{self.board_id}] {message}")
+
+    def get_pi_session(self, color):
+        """Get the appropriate session for a Pi color"""
+        return self.pi_white_session if color == 'white' else self.pi_black_session
+
+    def set_pi_health(self, color, state, reason=None):
+        with self.pi_health_lock:
+            self.pi_health[color] = {'state': state, 'since': time.time(), 'reason': reason}
+
+    def mark_pi_down(self, color, reason):
+        """Hand a Pi's side to the local engine; returns False when the fallback is disabled"""
+        if not PI_FALLBACK:
+            return False
+        if self.pi_health[color]['state'] != 'down':
+            self.set_pi_health(color, 'down', str(reason))
+            self.log(f"{color.capitalize()} Pi unreachable ({reason}) - playing its side on the local engine")
+        with self.pi_health_lock:
+            if self.pi_recovery_thread is None:
+                self.pi_recovery_thread = threading.Thread(target=self.pi_recovery_loop,
+                                                           name=f'pi-recovery-{self.board_id}', daemon=True)
+                self.pi_recovery_thread.start()
+        return True
+
+    def use_fallback(self, color):
+        """True while a Pi's side is played locally; a recovering Pi is caught up here first"""
+        if not PI_FALLBACK or self.pi_health[color]['state'] == 'up':
+            return False
+        with self.pi_restore_lock:
+            if self.pi_health[color]['state'] == 'recovering':
+                # Every move played so far is in the archive by now: replay what the Pi missed
+                if self.replay_move_log(color):
+                    self.set_pi_health(color, 'up')
+                    self.log(f"{color.capitalize()} Pi is back and caught up - local fallback off")
+                else:
+                    self.set_pi_health(color, 'down', 'catching up with the move log failed')
+        return self.pi_health[color]['state'] == 'down'
+
+    def fallback_board(self):
+        """Current position from the board's own move log"""
+        board = self.game_archive.board()
+        return board if board is not None else chess.Board()
+
+    def fallback_move(self, color, from_square, to_square, promotion=None, reply=False, game_speed=10):
+        """The Pi's /api/move answer for a Pi that is down, checked against the move log"""
+        board = self.fallback_board()
+        try:
+            move = build_move(board, from_square, to_square, promotion)
+        except ValueError:
+            move = None
+        if move is None or move not in board.legal_moves:
+            return {'status': 'error', 'message': 'Failed to make move', 'move_accepted': False, 'fallback': True}
+        board.push(move)
+        result = dict(position_response(board), status='success', move_accepted=True)
+        if reply and not board.is_game_over():
+            result['reply'], _ = self.local_fallback.engine_move(color, board, game_speed)
+        return result
+
+    def replay_move_log(self, color):
+        """Play the moves of the move log a Pi's board is missing; returns True once it has them all"""
+        url = self.get_pi_url(color)
+        log = self.fallback_board()
+        try:
+            pi_fen = requests.get(f"{url}/api/board-state", timeout=PI_PROBE_TIMEOUT).json().get('board_fen')
+
+            # The Pi's board must be a position of the log (normally the start, after the reset)
+            replay = chess.Board()
+            missing = None
+            for ply in range(len(log.move_stack) + 1):
+                if replay.fen() == pi_fen:
+                    missing = log.move_stack[ply:]
+                if ply < len(log.move_stack):
+                    replay.push(log.move_stack[ply])
+            if missing is None:
+                self.log(f"{color.capitalize()} Pi board is not a position of the move log")
+                return False
+
+            for move in missing:
+                response = requests.post(f"{url}/api/move", json={
+                    'from': chess.square_name(move.from_square),
+                    'to': chess.square_name(move.to_square),
+                    'promotion': chess.piece_symbol(move.promotion) if move.promotion else None
+                }, timeout=PI_TIMEOUT)
+                if not response.json().get('move_accepted'):
+                    self.log(f"{color.capitalize()} Pi rejected replayed move {move.uci()}")
+                    return False
+            if missing:
+                self.log(f"Replayed {len(missing)} moves to {color} Pi")
+            return True
+        except (requests.exceptions.RequestException, ValueError) as e:
+            self.log(f"Error catching up {color} Pi: {e}")
+            return False
+
+    def pi_recovery_loop(self):
+        """Checks the Pis that are down; one that answers gets its difficulty back and is marked recovering"""
+        while True:
+            time.sleep(PI_RECOVERY_INTERVAL)
+            for color in ('white', 'black'):
+                if self.pi_health[color]['state'] != 'down':
+                    continue
+                url = self.get_pi_url(color)
+                try:
+                    # Plain requests with a short timeout: no adapter retries while the Pi is away
+                    if requests.get(f"{url}/api/status", timeout=PI_PROBE_TIMEOUT).status_code != 200:
+                        continue
+                    settings = self.local_fallback.settings.get(color)
+                    if settings is not None:
+                        elo, skill, use_nnue, nnue_model = settings
+                        payload = {"elo": elo, "skill": skill}
+                        if use_nnue:
+                            payload.update(use_nnue=True, nnue_model=nnue_model)
+                        # Also resets the Pi's board; the moves are replayed by use_fallback()
+                        response = requests.post(f"{url}/api/set-bot-difficulty", json=payload,
+                                                 timeout=PI_TIMEOUT * 2)
+                        if response.status_code != 200:
+                            continue
+                    self.set_pi_health(color, 'recovering')
+                    self.log(f"{color.capitalize()} Pi answers again - handing its side back on the next move")
+                except requests.exceptions.RequestException:
+                    continue
+
+    def get_pi_url(self, color):
+        """Get the appropriate Pi URL based on color"""
+        return self.pi_urls['white' if color == 'white' else 'black']
+
+    def analysis_pis(self):
+        """Pis free for analysis: up and not playing in the current game mode (all of them while paused)
+
+        With the engine pool these are pool worker ids: every Pi with no search in flight.
+        """
+        if not ANALYSIS_ENABLED:
+            return []
+        if self.engine_pool is not None:
+            return self.engine_pool.idle()
+        playing = {
+            GAME_MODES['user_vs_cpu']: ('black',),
+            GAME_MODES['cpu_vs_cpu']: ('white', 'black')
+        }.get(self.current_game_mode, ()) if self.game_active else ()
+        return [color for color in ('white', 'black') if color not in playing and self.pi_health[color]['state'] == 'up']
+
+    def check_pi_connection(self, color, retries=2):
+        """Check if a specific Pi is connected with retry logic"""
+        session = self.get_pi_session(color)
+        url = self.get_pi_url(color)
+
+        for attempt in range(retries + 1):
+            try:
+                response = session.get(f"{url}/api/status", timeout=PI_TIMEOUT)
+                if response.status_code == 200:
+                    data = response.json()
+                    return data.get('engine_connected', False)
+                elif attempt < retries:
+                    time.sleep(0.5 * (attempt + 1))  # Exponential backoff
+                    continue
+                return False
+            except requests.exceptions.ConnectionError as e:
+                if attempt < retries:
+                    self.log(f"Connection error checking {color} Pi (attempt {attempt + 1}/{retries + 1}): {e}")
+                    time.sleep(0.5 * (attempt + 1))
+                    continue
+                self.log(f"Connection error checking {color} Pi: {e}")
+                return False
+            except requests.exceptions.Timeout as e:
+                if attempt < retries:
+                    self.log(f"Timeout checking {color} Pi (attempt {attempt + 1}/{retries + 1}): {e}")
+                    time.sleep(0.5 * (attempt + 1))
+                    continue
+                self.log(f"Timeout error checking {color} Pi: {e}")
+                return False
+            except requests.exceptions.RequestException as e:
+                self.log(f"Request error checking {color} Pi: {e}")
+                return False
+            except Exception as e:
+                self.log(f"Unexpected error checking {color} Pi: {e}")
+                return False
+        return False
+
+    def initialize_pi_engine(self, color, elo, skill, use_nnue=False, nnue_model='carlsen', retries=3):
+        """Initialize a Pi's engine with specific settings and retry logic
+
+        Args:
+            color: 'white' or 'black'
+            elo: ELO rating
+            skill: Skill level (0-20)
+            use_nnue: Whether to use NNUE evaluation file
+            nnue_model: NNUE model name ('carlsen' or 'fischer')
+            retries: Number of retry attempts
+
+        While the Pi is down this only configures the local fallback engine.
+        """
+        session = self.get_pi_session(color)
+        url = self.get_pi_url(color)
+        self.local_fallback.configure(color, elo, skill, use_nnue, nnue_model)
+        if self.use_fallback(color):
+            self.log(f"{color.capitalize()} Pi is down - local engine set to ELO {elo}, Skill {skill}")
+            return True
+
+        payload = {"elo": elo, "skill": skill}
+        if use_nnue:
+            payload["use_nnue"] = True
+            payload["nnue_model"] = nnue_model
+
+        for attempt in range(retries + 1):
+            try:
+                if attempt == 0:
+                    self.log(f"Attempting to connect to {color} Pi at {url}...")
+                else:
+                    self.log(f"Retrying connection to {color} Pi (attempt {attempt + 1}/{retries + 1})...")
+
+                if use_nnue:
+                    self.log(f"  Using NNUE evaluation file ({nnue_model}) for {color} Pi")
+
+                response = session.post(
+                    f"{url}/api/set-bot-difficulty",
+                    json=payload,
+                    timeout=PI_TIMEOUT * 2  # Longer timeout for initialization
+                )
+
+                if response.status_code == 200:
+                    self.log(f"{color.capitalize()} Pi engine initialized: ELO {elo}, Skill {skill}")
+                    return True
+                else:
+                    self.log(f"Failed to initialize {color} Pi: HTTP {response.status_code}")
+                    try:
+                        error_data = response.json()
+                        self.log(f"Error details: {error_data.get('message', 'No details')}")
+                    except:
+                        self.log(f"Error response: {response.text}")
+
+                    if attempt < retries:
+                        time.sleep(1 * (attempt + 1))
+                        continue
+                    return False
+
+            except requests.exceptions.ConnectionError as e:
+                if attempt < retries:
+                    self.log(f"Connection error initializing {color} Pi (attempt {attempt + 1}/{retries + 1}): {e}")
+                    time.sleep(1 * (attempt + 1))
+                    continue
+                self.log(f"Connection error initializing {color} Pi at {url}: {e}")
+                self.log(f"Make sure the Pi is running pi_chess_server.py and is accessible at {url}")
+                return self.mark_pi_down(color, e)
+            except requests.exceptions.Timeout as e:
+                if attempt < retries:
+                    self.log(f"Timeout error initializing {color} Pi (attempt {attempt + 1}/{retries + 1}): {e}")
+                    time.sleep(1 * (attempt + 1))
+                    continue
+                self.log(f"Timeout error initializing {color} Pi at {url}: {e}")
+                return self.mark_pi_down(color, e)
+            except Exception as e:
+                self.log(f"Error initializing {color} Pi: {e}")
+                if attempt < retries:
+                    time.sleep(1 * (attempt + 1))
+                    continue
+                return False
+
+        return False
+
+    def send_move_to_pi(self, color, from_square, to_square, piece, promotion=None, retries=2,
+                        reply=False, game_speed=10):
+        """Send a move to a specific Pi with retry logic
+
+        With reply=True the Pi also plays its engine's answer and returns it under 'reply'.
+        """
+        if reply and self.engine_pool is not None:
+            return self.move_with_pool_reply(color, from_square, to_square, piece, promotion, game_speed)
+        if self.use_fallback(color):
+            return self.fallback_move(color, from_square, to_square, promotion, reply, game_speed)
+        session = self.get_pi_session(color)
+        url = self.get_pi_url(color)
+        move_data = {
+            'from': from_square,
+            'to': to_square,
+            'piece': piece,
+            'promotion': promotion
+        }
+        if reply:
+            move_data.update(reply=True, game_speed=game_speed)
+
+        for attempt in range(retries + 1):
+            try:
+                response = session.post(
+                    f"{url}/api/move",
+                    json=move_data,
+                    # The reply includes an engine search, so allow as long as /api/engine-move does
+                    timeout=max(PI_TIMEOUT * 3, 30) if reply else PI_TIMEOUT
+                )
+                return response.json()
+            except requests.exceptions.ConnectionError as e:
+                if attempt < retries:
+                    self.log(f"Connection error sending move to {color} Pi (attempt {attempt + 1}/{retries + 1}): {e}")
+                    time.sleep(0.5 * (attempt + 1))
+                    continue
+                self.log(f"Error sending move to {color} Pi: {e}")
+                if self.mark_pi_down(color, e):
+                    return self.fallback_move(color, from_square, to_square, promotion, reply, game_speed)
+                return {'status': 'error', 'message': str(e)}
+            except requests.exceptions.Timeout as e:
+                if attempt < retries:
+                    self.log(f"Timeout sending move to {color} Pi (attempt {attempt + 1}/{retries + 1}): {e}")
+                    time.sleep(0.5 * (attempt + 1))
+                    continue
+                self.log(f"Timeout error sending move to {color} Pi: {e}")
+                if self.mark_pi_down(color, e):
+                    return self.fallback_move(color, from_square, to_square, promotion, reply, game_speed)
+                return {'status': 'error', 'message': f'Timeout: {str(e)}'}
+            except Exception as e:
+                self.log(f"Error sending move to {color} Pi: {e}")
+                if attempt < retries:
+                    time.sleep(0.5 * (attempt + 1))
+                    continue
+                return {'status': 'error', 'message': str(e)}
+
+        return {'status': 'error', 'message': 'Failed after retries'}
+
+    def stream_move_to_pi(self, color, from_square, to_square, piece, promotion, game_speed, retries=2):
+        """Send a user move asking for the engine's reply as a stream (reply + stream)
+
+        Returns the open streaming response (NDJSON: move acknowledgment, then the
+        reply), or a dict with the Pi's JSON answer when it did not stream (move
+        rejected, game over) or could not be reached. While the Pi is down the
+        local fallback's answer comes back as a dict, reply included. With the
+        engine pool the reply is searched on the pool and the answer is a dict too.
+        """
+        if self.engine_pool is not None:
+            return self.move_with_pool_reply(color, from_square, to_square, piece, promotion, game_speed)
+        if self.use_fallback(color):
+            return self.fallback_move(color, from_square, to_square, promotion, True, game_speed)
+        session = self.get_pi_session(color)
+        url = self.get_pi_url(color)
+        move_data = {
+            'from': from_square,
+            'to': to_square,
+            'piece': piece,
+            'promotion': promotion,
+            'reply': True,
+            'stream': True,
+            'game_speed': game_speed
+        }
+
+        for attempt in range(retries + 1):
+            try:
+                response = session.post(
+                    f"{url}/api/move",
+                    json=move_data,
+                    timeout=max(PI_TIMEOUT * 3, 30),
+                    stream=True
+                )
+                if 'ndjson' in response.headers.get('Content-Type', ''):
+                    return response
+                with response:
+                    return response.json()
+            except requests.exceptions.ConnectionError as e:
+                # Nothing reached the Pi, so sending again cannot apply the move twice
+                if attempt < retries:
+                    self.log(f"Connection error sending move to {color} Pi (attempt {attempt + 1}/{retries + 1}): {e}")
+                    time.sleep(0.5 * (attempt + 1))
+                    continue
+                self.log(f"Error sending move to {color} Pi: {e}")
+                if self.mark_pi_down(color, e):
+                    return self.fallback_move(color, from_square, to_square, promotion, True, game_speed)
+                return {'status': 'error', 'message': str(e)}
+            except Exception as e:
+                self.log(f"Error sending move to {color} Pi: {e}")
+                return {'status': 'error', 'message': str(e)}
+
+        return {'status': 'error', 'message': 'Failed after retries'}
+
+    def get_engine_move_from_pi(self, color, game_speed=10, retries=2, use_pool=True):
+        """Get engine move from a specific Pi with retry logic and extended timeout
+
+        With the engine pool the move is searched on the least-loaded Pi first;
+        color's own Pi only plays it when no Pi in the pool could.
+        """
+        if use_pool and self.engine_pool is not None:
+            result = self.pool_engine_move(color, game_speed)
+            if result is not None:
+                return result
+        if self.use_fallback(color):
+            return self.local_fallback.engine_move(color, self.fallback_board(), game_speed)[0]
+        session = self.get_pi_session(color)
+        url = self.get_pi_url(color)
+
+        # Use longer timeout for engine moves (they can take time to calculate)
+        engine_timeout = max(PI_TIMEOUT * 3, 30)  # At least 30 seconds for engine moves
+
+        for attempt in range(retries + 1):
+            try:
+                response = session.post(
+                    f"{url}/api/engine-move",
+                    json={'game_speed': game_speed},
+                    timeout=engine_timeout
+                )
+                return response.json()
+            except requests.exceptions.ConnectionError as e:
+                if attempt < retries:
+                    self.log(f"Connection error getting move from {color} Pi (attempt {attempt + 1}/{retries + 1}): {e}")
+                    time.sleep(1 * (attempt + 1))
+                    continue
+                self.log(f"Error getting move from {color} Pi: {e}")
+                if self.mark_pi_down(color, e):
+                    return self.local_fallback.engine_move(color, self.fallback_board(), game_speed)[0]
+                return {'status': 'error', 'message': str(e)}
+            except requests.exceptions.Timeout as e:
+                if attempt < retries:
+                    self.log(f"Timeout getting move from {color} Pi (attempt {attempt + 1}/{retries + 1}): {e}")
+                    time.sleep(1 * (attempt + 1))
+                    continue
+                self.log(f"Timeout error getting move from {color} Pi: {e}")
+                if self.mark_pi_down(color, e):
+                    return self.local_fallback.engine_move(color, self.fallback_board(), game_speed)[0]
+                return {'status': 'error', 'message': f'Timeout: Engine took too long to respond'}
+            except Exception as e:
+                self.log(f"Error getting move from {color} Pi: {e}")
+                if attempt < retries:
+                    time.sleep(1 * (attempt + 1))
+                    continue
+                return {'status': 'error', 'message': str(e)}
+
+        return {'status': 'error', 'message': 'Failed after retries'}
+
+    def persona(self, color):
+        """color's difficulty as /api/set-bot-difficulty takes it (from the last initialize_pi_engine)"""
+        elo, skill, use_nnue, nnue_model = self.local_fallback.settings.get(color, (1350, 10, False, 'carlsen'))
+        return {'elo': elo, 'skill': skill, 'use_nnue': use_nnue, 'nnue_model': nnue_model}
+
+    def pool_engine_move(self, color, game_speed=10, board=None):
+        """color's move searched on the engine pool, then played on color's own Pi
+
+        board is the position to search (by default the move log's). Returns
+        the answer in /api/engine-move's shape, or None when the pool could not
+        search it (the caller then asks color's own Pi).
+        """
+        board = self.fallback_board() if board is None else board
+        if board.is_game_over():
+            return None
+        searched = self.engine_pool.search(board, self.persona(color), game_speed,
+                                           prefer=self.worker_ids[color])
+        if searched is None:
+            return None
+        engine_move = searched['engine_move']
+        engine_move['info'] = dict(engine_move.get('info') or {}, worker=searched['worker'])
+        if searched['worker'] != self.worker_ids[color]:
+            self.log(f"{color.capitalize()}'s move {engine_move['san']} searched on {searched['worker']}")
+
+        # The board's own Pi (LEDs, its copy of the game) gets the move like a synced one
+        result = self.send_move_to_pi(color, engine_move['from'], engine_move['to'],
+                                      engine_move['piece'], engine_move['promotion'])
+        if result.get('status') != 'success' or not result.get('move_accepted'):
+            self.log(f"{color.capitalize()} Pi refused pool move {engine_move['san']}: {result.get('message')}")
+            return {'status': 'error', 'message': f"Pool move not accepted: {result.get('message')}"}
+        board.push(chess.Move.from_uci(engine_move['from'] + engine_move['to'] + (engine_move['promotion'] or '')))
+        return dict(result, engine_move=engine_move,
+                    current_player='white' if board.turn == chess.WHITE else 'black')
+
+    def move_with_pool_reply(self, color, from_square, to_square, piece, promotion, game_speed=10):
+        """A user move on color's Pi with the engine's reply searched on the pool (under 'reply')"""
+        result = self.send_move_to_pi(color, from_square, to_square, piece, promotion)
+        if result.get('status') != 'success' or not result.get('move_accepted') or result.get('game_over'):
+            return result
+        board = self.fallback_board()
+        board.push(build_move(board, from_square, to_square, promotion))
+        reply = self.pool_engine_move(color, game_speed, board)
+        if reply is None:
+            # The user's move is not in the move log yet: search board, not the log's position
+            if self.use_fallback(color):
+                reply = self.local_fallback.engine_move(color, board, game_speed)[0]
+            else:
+                reply = self.get_engine_move_from_pi(color, game_speed, use_pool=False)
+        result['reply'] = reply
+        return result
+
+    def get_board_state_from_pi(self, color, retries=2):
+        """Get board state from a specific Pi with retry logic"""
+        if self.use_fallback(color):
+            return dict(position_response(self.fallback_board()), status='success')
+        session = self.get_pi_session(color)
+        url = self.get_pi_url(color)
+
+        for attempt in range(retries + 1):
+            try:
+                response = session.get(f"{url}/api/board-state", timeout=PI_TIMEOUT)
+                return response.json()
+            except requests.exceptions.ConnectionError as e:
+                if attempt < retries:
+                    self.log(f"Connection error getting board state from {color} Pi (attempt {attempt + 1}/{retries + 1}): {e}")
+                    time.sleep(0.5 * (attempt + 1))
+                    continue
+                self.log(f"Error getting board state from {color} Pi: {e}")
+                if self.mark_pi_down(color, e):
+                    return dict(position_response(self.fallback_board()), status='success')
+                return {'status': 'error', 'message': str(e)}
+            except requests.exceptions.Timeout as e:
+                if attempt < retries:
+                    self.log(f"Timeout getting board state from {color} Pi (attempt {attempt + 1}/{retries + 1}): {e}")
+                    time.sleep(0.5 * (attempt + 1))
+                    continue
+                self.log(f"Timeout error getting board state from {color} Pi: {e}")
+                if self.mark_pi_down(color, e):
+                    return dict(position_response(self.fallback_board()), status='success')
+                return {'status': 'error', 'message': f'Timeout: {str(e)}'}
+            except Exception as e:
+                self.log(f"Error getting board state from {color} Pi: {e}")
+                if attempt < retries:
+                    time.sleep(0.5 * (attempt + 1))
+                    continue
+                return {'status': 'error', 'message': str(e)}
+
+        return {'status': 'error', 'message': 'Failed after retries'}
+
+    def reset_pi(self, color, retries=2):
+        """Reset a specific Pi's board with retry logic"""
+        if self.use_fallback(color):
+            # Nothing to reset locally; the Pi's board is reset when it recovers
+            return {'status': 'success', 'message': 'Game reset', 'fallback': True}
+        session = self.get_pi_session(color)
+        url = self.get_pi_url(color)
+
+        for attempt in range(retries + 1):
+            try:
+                response = session.post(
+                    f"{url}/api/game-control",
+                    json={'command': 'reset'},
+                    timeout=PI_TIMEOUT
+                )
+                return response.json()
+            except requests.exceptions.ConnectionError as e:
+                if attempt < retries:
+                    self.log(f"Connection error resetting {color} Pi (attempt {attempt + 1}/{retries + 1}): {e}")
+                    time.sleep(0.5 * (attempt + 1))
+                    continue
+                self.log(f"Error resetting {color} Pi: {e}")
+                return {'status': 'error', 'message': str(e)}
+            except requests.exceptions.Timeout as e:
+                if attempt < retries:
+                    self.log(f"Timeout resetting {color} Pi (attempt {attempt + 1}/{retries + 1}): {e}")
+                    time.sleep(0.5 * (attempt + 1))
+                    continue
+                self.log(f"Timeout error resetting {color} Pi: {e}")
+                return {'status': 'error', 'message': f'Timeout: {str(e)}'}
+            except Exception as e:
+                self.log(f"Error resetting {color} Pi: {e}")
+                if attempt < retries:
+                    time.sleep(0.5 * (attempt + 1))
+                    continue
+                return {'status': 'error', 'message': str(e)}
+
+        return {'status': 'error', 'message': 'Failed after retries'}
+
+    def get_thinking_pi_color(self):
+        """Color of the Pi that plays the next engine move (None if no game mode is set)"""
+        if self.current_game_mode == GAME_MODES['user_vs_cpu']:
+            # Always black Pi
+            return 'black'
+        if self.current_game_mode == GAME_MODES['cpu_vs_cpu']:
+            # Alternate based on current player
+            return self.current_player
+        return None
+
+    def relay_search_stream_from_pi(self, color):
+        """Pass a Pi's /api/search-stream events through unchanged (generator for a streaming Response)"""
+        if self.use_fallback(color):
+            yield f"data: {json.dumps({'event': 'error', 'message': f'{color} Pi is down (local engine playing)'})}\n\n"
+            return
+        session = self.get_pi_session(color)
+        url = self.get_pi_url(color)
+        try:
+            with session.get(f"{url}/api/search-stream", stream=True, timeout=PI_TIMEOUT) as response:
+                for chunk in response.iter_content(chunk_size=None):
+                    yield chunk
+        except requests.exceptions.RequestException as e:
+            self.log(f"Search stream from {color} Pi ended: {e}")
+            yield f"data: {json.dumps({'event': 'error', 'message': str(e)})}\n\n"
+
+    def record_engine_telemetry(self, color, game_speed, engine_move):
+        """Keep the search info a Pi sent back with its move for /api/engine-stats"""
+        info = (engine_move or {}).get('info')
+        if not info:
+            return
+        self.engine_telemetry.append(dict(info, color=color, game_speed=game_speed, san=engine_move.get('san')))
+        del self.engine_telemetry[:-ENGINE_TELEMETRY_LIMIT]
+
+    def record_engine_reply(self, result, game_speed):
+        """Bookkeeping for the black Pi's reply that came with a user move (same as /api/engine-move)"""
+        engine_move = result.get('engine_move')
+        if result.get('status') != 'success' or not engine_move:
+            return
+        self.record_engine_telemetry('black', game_speed, engine_move)
+        self.archive_move(engine_move.get('from'), engine_move.get('to'), engine_move.get('promotion'), result)
+        self.current_player = 'white'
+        result['current_player'] = self.current_player
+
+    def relay_move_and_reply(self, response, from_square, to_square, promotion, game_speed):
+        """Pass the black Pi's move acknowledgment and engine reply through to the browser as they arrive
+
+        Call it from the route, under the game lock: the acknowledgment is read and
+        recorded before the route returns. The generator it returns streams the
+        reply afterwards, so it takes the game lock again to record it.
+        """
+        lines = response.iter_lines()
+        try:
+            ack = json.loads(next(lines))
+        except (StopIteration, ValueError, requests.exceptions.RequestException) as e:
+            response.close()
+            self.log(f"Move stream from black Pi ended early: {e}")
+            return iter([json.dumps({'status': 'error', 'message': f'Move acknowledgment lost: {e}'}) + "\n"])
+        self.current_player = ack.get('current_player', 'black')
+        self.archive_move(from_square, to_square, promotion, ack)
+
+        def relay():
+            with response:
+                yield json.dumps(ack) + "\n"
+                try:
+                    reply = json.loads(next(lines))
+                except (StopIteration, ValueError, requests.exceptions.RequestException) as e:
+                    self.log(f"Move stream from black Pi ended early: {e}")
+                    yield json.dumps({'status': 'error', 'message': f'Engine reply lost: {e}'}) + "\n"
+                    return
+                with self.game_lock:
+                    self.record_engine_reply(reply, game_speed)
+                yield json.dumps(reply) + "\n"
+        return relay()
+
+    def player_label(self, color):
+        """PGN player name for a side: 'User', or the bot persona such as 'carlsen@2200'"""
+        if color == 'white' and self.current_game_mode == GAME_MODES['user_vs_cpu']:
+            return 'User'
+        elo, nnue, nnue_model = (self.white_elo, self.white_nnue, self.white_nnue_model) if color == 'white' \
+            else (self.black_elo, self.black_nnue, self.black_nnue_model)
+        return f"{nnue_model if nnue else 'stockfish'}@{elo}"
+
+    def start_archived_game(self):
+        """Start recording a new game in the archive with the current players"""
+        headers = {
+            'Event': f"AI Chess ({self.current_game_mode})",
+            'Site': 'AI Chess Senior Design',
+            'White': self.player_label('white'),
+            'Black': self.player_label('black'),
+            'BlackElo': self.black_elo
+        }
+        if self.current_game_mode == GAME_MODES['cpu_vs_cpu']:
+            headers['WhiteElo'] = self.white_elo
+        game_id = self.game_archive.start_game(headers)
+        self.log(f"Recording game {game_id}")
+
+    def archive_move(self, from_square, to_square, promotion, result):
+        """Record a move the Pi accepted; archives the game if the Pi reports it is over"""
+        self.game_archive.record_move(from_square, to_square, promotion)
+        if result.get('game_over'):
+            self.finish_archived_game(result.get('winner'))
+        elif ANALYSIS_ENABLED and self.current_game_mode == GAME_MODES['user_vs_cpu']:
+            # Eval bar / hints for the user's turn, from the idle white Pi
+            board = self.fallback_board()
+            if board.turn == chess.WHITE:
+                self.analysis_service.submit(board, PRIORITY_CURRENT)
+
+    def finish_archived_game(self, winner=None, termination=None):
+        """Archive the game in progress ('white', 'black' or 'draw' winner from the Pi)
+
+        termination is the PGN Termination header, e.g. 'abandoned' for a game
+        stopped before it was over.
+        """
+        results = {'white': '1-0', 'black': '0-1', 'draw': '1/2-1/2'}
+        entry = self.game_archive.finish_game(results.get(winner, '*'), termination)
+        if entry is not None and ANALYSIS_ENABLED:
+            # Annotate the finished game while the Pis have nothing better to do
+            self.analysis_service.annotate(self.fallback_board())
+        return entry
+
+    def summary(self):
+        """Short status of the board for /api/boards"""
+        return {
+            'id': self.board_id,
+            'name': self.name,
+            'pi_urls': self.pi_urls,
+            'game_mode': self.current_game_mode,
+            'game_active': self.game_active,
+            'current_player': self.current_player,
+            'current_game': self.game_archive.current_game_id(),
+            'pi_health': self.pi_health
+        }
+
+    def close(self):
+        """Stop the board's background work and close its connections"""
+        if self.owns_analysis_service:
+            self.analysis_service.close()
+        self.local_fallback.close()
+        self.pi_white_session.close()
+        self.pi_black_session.close()
+
+
+class BoardRegistry:
+    """The boards this server drives, by id; the first one configured is the default board"""
+
+    def __init__(self, boards, archive_root, engine_pool=False, spare_pis=None):
+        """
+        Args:
+            boards: {board id: {'name', 'white_ip', 'white_port', 'black_ip', 'black_port'}}
+            archive_root: game archive directory; the default board archives here
+                and every other board in a subdirectory named after its id
+            engine_pool: search engine moves on an EnginePool over all the Pis
+            spare_pis: {worker id: "ip:port"} of extra Pis for the pool (no board of their own)
+        """
+        if not boards:
+            raise ValueError("No boards configured")
+        urls = {}
+        for board_id, settings in boards.items():
+            if not BOARD_ID_PATTERN.fullmatch(board_id):
+                raise ValueError(f"Board id {board_id!r} may only use letters, digits, '-' and '_'")
+            for color in ('white', 'black'):
+                urls[worker_id(board_id, color)] = \
+                    f"http://{settings[color + '_ip']}:{settings.get(color + '_port', PI_PORT)}"
+
+        self.engine_pool = None
+        self.analysis_service = None
+        if engine_pool:
+            workers = dict(urls)
+            workers.update({name: f"http://{address}" for name, address in (spare_pis or {}).items()})
+            self.engine_pool = EnginePool(workers, timeout=PI_TIMEOUT, connect_timeout=PI_PROBE_TIMEOUT,
+                                          backoff=ENGINE_POOL_BACKOFF)
+            # One analysis service for all boards: any idle Pi works on any board's positions
+            self.analysis_service = create_analysis_service(self.engine_pool.url, self.engine_pool.idle,
+                                                            workers=self.engine_pool.worker_ids())
+
+        self.boards = {}
+        for board_id, settings in boards.items():
+            archive_dir = settings.get('archive_dir') or (
+                os.path.join(archive_root, board_id) if self.boards else archive_root)
+            self.boards[board_id] = BoardCoordinator(
+                board_id,
+                urls[worker_id(board_id, 'white')],
+                urls[worker_id(board_id, 'black')],
+                archive_dir,
+                name=settings.get('name'),
+                engine_pool=self.engine_pool,
+                analysis_service=self.analysis_service
+            )
+        self.default_id = next(iter(self.boards))
+
+    @classmethod
+    def from_config(cls, boards, boards_file, archive_root, engine_pool=False, spare_pis=None):
+        """Boards from the JSON file boards_file when given, else from the boards dict"""
+        if boards_file:
+            with open(boards_file) as f:
+                boards = json.load(f)
+        return cls(boards, archive_root, engine_pool, spare_pis)
+
+    def get(self, board_id=None):
+        """The board with board_id (the default board for None), or None if there is no such board"""
+        return self.boards.get(self.default_id if board_id is None else board_id)
+
+    def default(self):
+        return self.boards[self.default_id]
+
+    def __iter__(self):
+        return iter(self.boards.values())
+
+    def __len__(self):
+        return len(self.boards)
+
+    def close(self):
+        for board in self.boards.values():
+            board.close()
+        if self.analysis_service is not None:
+            self.analysis_service.close()
+        if self.engine_pool is not None:
+            self.engine_pool.close()
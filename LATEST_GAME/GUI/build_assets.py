@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Static Asset Build for the Chess GUI
+file: /AI_Chess_Senior_Design/GUI/build_assets.py
+
+Bundles the GUI's JS and CSS into one file each, strips comments and
+indentation, packs the 12 piece images into a single sprite sheet and writes
+everything to static/dist/ under content-hashed names:
+
+    static/dist/app.<hash>.js
+    static/dist/app.<hash>.css
+    static/dist/pieces.<hash>.png
+    static/dist/manifest.json     {"app.js": "app.<hash>.js", ...}
+
+app.py reads the manifest: when it exists the page loads the bundles (served
+with immutable cache headers), otherwise it falls back to the individual files.
+Re-run after changing anything under static/JS, static/CSS or the piece images.
+
+Usage:
+    python build_assets.py
+"""
+
+import hashlib
+import json
+import os
+import re
+from io import BytesIO
+
+from PIL import Image
+
+GUI_DIR = os.path.dirname(os.path.abspath(__file__))
+STATIC_DIR = os.path.join(GUI_DIR, 'static')
+DIST_DIR = os.path.join(STATIC_DIR, 'dist')
+MANIFEST_PATH = os.path.join(DIST_DIR, 'manifest.json')
+
+# Same order as the <script>/<link> tags in templates/index.html
+JS_FILES = [
+    'JS/utils.js',
+    'JS/board.js',
+    'JS/game.js',
+    'JS/navigation.js',
+    'JS/controls.js',
+    'JS/bot-selector.js',
+    'JS/player-info-addon.js',
+    'JS/spectator.js',
+    'JS/main.js',
+]
+CSS_FILES = [
+    'CSS/main.css',
+    'CSS/board.css',
+    'CSS/controls.css',
+    'CSS/moves.css',
+]
+
+# Sprite sheet layout: white pieces on the top row, black on the bottom
+PIECE_ORDER = ['K', 'Q', 'R', 'B', 'N', 'P']
+PIECE_NAMES = {'K': 'King', 'Q': 'Queen', 'R': 'Rook', 'B': 'Bishop', 'N': 'Knight', 'P': 'Pawn'}
+PIECE_COLORS = [('w', 'White'), ('b', 'Black')]
+
+# A '/' after one of these (or at the start of a line) begins a regex literal, not a division
+REGEX_PRECEDERS = set('(,=:[!&|?{};+-*%<>~^')
+
+
+def minify_js(source):
+    """Remove comments, indentation and blank lines from JavaScript
+
+    Strings, template literals and regex literals are copied untouched; line
+    breaks are kept so automatic semicolon insertion behaves as before.
+    """
+    out = []
+    i = 0
+    n = len(source)
+    last_significant = ''
+    while i < n:
+        ch = source[i]
+        nxt = source[i + 1] if i + 1 < n else ''
+        if ch == '/' and nxt == '/':
+            while i < n and source[i] != '\n':
+                i += 1
+            continue
+        if ch == '/' and nxt == '*':
+            end = source.find('*/', i + 2)
+            i = n if end == -1 else end + 2
+            continue
+        if ch in '\'"`':
+            start = i
+            i += 1
+            depth = 0
+            while i < n:
+                c = source[i]
+                if c == '\\':
+                    i += 2
+                    continue
+                if ch == '`' and c == '$' and i + 1 < n and source[i + 1] == '{':
+                    depth += 1
+                elif ch == '`' and c == '}' and depth:
+                    depth -= 1
+                elif c == ch and not depth:
+                    break
+                i += 1
+            out.append(source[start:i + 1])
+            i += 1
+            last_significant = ch
+            continue
+        if ch == '/' and (last_significant in REGEX_PRECEDERS or last_significant == ''):
+            start = i
+            i += 1
+            in_class = False
+            while i < n and source[i] != '\n':
+                c = source[i]
+                if c == '\\':
+                    i += 2
+                    continue
+                if c == '[':
+                    in_class = True
+                elif c == ']':
+                    in_class = False
+                elif c == '/' and not in_class:
+                    break
+                i += 1
+            i += 1
+            while i < n and source[i].isalpha():
+                i += 1
+            out.append(source[start:i])
+            last_significant = '/'
+            continue
+        if ch == '\n':
+            # Drop trailing whitespace and blank lines; indentation is skipped below
+            while out and out[-1] in (' ', '\t'):
+                out.pop()
+            if out and out[-1] != '\n':
+                out.append('\n')
+            # a line break may end a statement, so a '/' on the next line starts a regex
+            last_significant = ''
+            i += 1
+            while i < n and source[i] in ' \t':
+                i += 1
+            continue
+        out.append(ch)
+        if not ch.isspace():
+            last_significant = ch
+        i += 1
+
+    return ''.join(out).strip() + '\n'
+
+
+def minify_css(source):
+    """Remove comments and collapse whitespace in CSS"""
+    source = re.sub(r'/\*.*?\*/', '', source, flags=re.S)
+    source = re.sub(r'\s+', ' ', source)
+    source = re.sub(r'\s*([{};:,>])\s*', r'\1', source)
+    return source.replace(';}', '}').strip() + '\n'
+
+
+def build_sprite_sheet():
+    """Pack the 12 piece PNGs into one sheet; returns (PNG bytes, {piece code: (col, row)})"""
+    images = {}
+    for color, color_name in PIECE_COLORS:
+        for piece in PIECE_ORDER:
+            path = os.path.join(STATIC_DIR, 'images', 'pieces', f"{color_name}-{PIECE_NAMES[piece]}.png")
+            images[color + piece] = Image.open(path).convert('RGBA')
+
+    cell = max(max(image.size) for image in images.values())
+    sheet = Image.new('RGBA', (cell * len(PIECE_ORDER), cell * len(PIECE_COLORS)), (0, 0, 0, 0))
+    positions = {}
+    for row, (color, _) in enumerate(PIECE_COLORS):
+        for col, piece in enumerate(PIECE_ORDER):
+            image = images[color + piece]
+            # Center each piece in its square cell (same as background-size: contain)
+            offset = ((cell - image.width) // 2, (cell - image.height) // 2)
+            sheet.paste(image, (col * cell + offset[0], row * cell + offset[1]))
+            positions[color + piece] = (col, row)
+
+    buffer = BytesIO()
+    sheet.save(buffer, format='PNG', optimize=True)
+    return buffer.getvalue(), positions
+
+
+def sprite_css(sprite_name, positions):
+    """CSS that draws every .piece-xx from the sprite sheet instead of its own PNG"""
+    cols = len(PIECE_ORDER)
+    rows = len(PIECE_COLORS)
+    rules = [f".piece{{background-image:url('{sprite_name}');background-size:{cols * 100}% {rows * 100}%}}"]
+    for code, (col, row) in positions.items():
+        x = col * 100 / (cols - 1)
+        y = row * 100 / (rows - 1)
+        rules.append(f".piece-{code}{{background-position:{x:g}% {y:g}%}}")
+    return '\n'.join(rules) + '\n'
+
+
+def hashed_name(stem, ext, data):
+    """File name with the first 12 hex digits of the content's SHA-256"""
+    return f"{stem}.{hashlib.sha256(data).hexdigest()[:12]}.{ext}"
+
+
+def read_static(relative_path):
+    with open(os.path.join(STATIC_DIR, relative_path), encoding='utf-8') as f:
+        return f.read()
+
+
+def write_dist(name, data):
+    with open(os.path.join(DIST_DIR, name), 'wb') as f:
+        f.write(data)
+
+
+def build():
+    """Build all bundles and the manifest; returns the manifest dict"""
+    os.makedirs(DIST_DIR, exist_ok=True)
+
+    sprite_data, positions = build_sprite_sheet()
+    sprite_name = hashed_name('pieces', 'png', sprite_data)
+
+    js = ''.join(minify_js(read_static(path)) for path in JS_FILES).encode('utf-8')
+
+    # The per-piece PNG rules are replaced by sprite sheet positions
+    css_source = ''.join(read_static(path) + '\n' for path in CSS_FILES)
+    css_source = re.sub(r"\.piece-[wb][KQRBNP]\s*\{\s*background-image:[^}]*\}", '', css_source)
+    css = (minify_css(css_source) + sprite_css(sprite_name, positions)).encode('utf-8')
+
+    manifest = {
+        'app.js': hashed_name('app', 'js', js),
+        'app.css': hashed_name('app', 'css', css),
+        'pieces.png': sprite_name,
+    }
+
+    # Drop bundles from earlier builds, then write the new ones
+    for name in os.listdir(DIST_DIR):
+        if name not in manifest.values() and name != 'manifest.json':
+            os.remove(os.path.join(DIST_DIR, name))
+    write_dist(manifest['app.js'], js)
+    write_dist(manifest['app.css'], css)
+    write_dist(manifest['pieces.png'], sprite_data)
+    with open(MANIFEST_PATH, 'w') as f:
+        json.dump(manifest, f, indent=2)
+
+    source_bytes = sum(len(read_static(path).encode('utf-8')) for path in JS_FILES + CSS_FILES)
+    print(f"JS + CSS: {len(JS_FILES) + len(CSS_FILES)} files, {source_bytes} bytes -> 2 files, {len(js) + len(css)} bytes")
+    print(f"Pieces: 12 images -> {manifest['pieces.png']} ({len(sprite_data)} bytes)")
+    print(f"Wrote {MANIFEST_PATH}")
+    return manifest
+
+
+if __name__ == '__main__':
+    build()
@@ -6,21 +6,76 @@ file: /AI_Chess_Senior_Design/GUI/config.py
 Standalone version - no Raspberry Pi connection needed
 
 """
+import os
+
 # Flask app settings
 FLASK_HOST = "0.0.0.0"
 FLASK_PORT = 5001
 FLASK_DEBUG = True
 
+# Serving (Board_apps/wsgi_server.py): "dev" is app.run() with FLASK_DEBUG, "production"
+# waitress with the settings below. Always one process, since the games live in its memory
+SERVER_MODE = os.environ.get("SERVER_MODE", "dev")
+SERVER_THREADS = 32  # Requests at once; every open live search stream (EventSource) holds one
+SERVER_CONNECTION_LIMIT = 200  # Open browser connections, keep-alive ones included
+SERVER_KEEPALIVE_TIMEOUT = 120  # Seconds an idle browser connection is kept open
+SERVER_BACKLOG = 1024
+
 # Raspberry Pi Configuration
 # Set these to your actual Pi IP addresses
-PI_WHITE_IP = "192.168.10.2"  # IP of Pi playing white (CPU vs CPU mode)
-PI_BLACK_IP = "192.168.10.3"  # IP of Pi playing black (both modes)
+# (environment variables of the same name override them, e.g. to use fake_pi.py on localhost)
+PI_WHITE_IP = os.environ.get("PI_WHITE_IP", "192.168.10.2")  # IP of Pi playing white (CPU vs CPU mode)
+PI_BLACK_IP = os.environ.get("PI_BLACK_IP", "192.168.10.3")  # IP of Pi playing black (both modes)
 PI_PORT = 5002  # Port where pi_chess_server.py runs
+PI_WHITE_PORT = int(os.environ.get("PI_WHITE_PORT", PI_PORT))
+PI_BLACK_PORT = int(os.environ.get("PI_BLACK_PORT", PI_PORT))
+
+# Boards driven by this server, each with its own Pi pair (board_coordinator.py).
+# The first board is also served at the un-prefixed routes (/ and /api/...), the
+# others only at /boards/<id>/. For an event with several boards, list them in a
+# JSON file of the same shape and point BOARDS_FILE at it.
+BOARDS = {
+    "board1": {"name": "Board 1",
+               "white_ip": PI_WHITE_IP, "white_port": PI_WHITE_PORT,
+               "black_ip": PI_BLACK_IP, "black_port": PI_BLACK_PORT},
+}
+BOARDS_FILE = os.environ.get("BOARDS_FILE")
+
+# Engine worker pool (engine_pool.py, opt-in): every board's Pis, plus any spare
+# Pis, search engine moves and analysis for all boards, each request going to
+# the least-loaded healthy Pi. The Pis must have /api/search (stateless search)
+ENGINE_POOL = os.environ.get("ENGINE_POOL", "0") == "1"
+SPARE_PIS = {}  # Pis without a board, e.g. {"spare1": "192.168.10.20:5002"}
+ENGINE_POOL_BACKOFF = 5  # Seconds a Pi that failed is left out (doubles per failure, up to 60)
+
+# Browser sessions (game_sessions.py): the first browser to change a board's game
+# plays it, the others watch; requests that change a game take turns on its lock
+SESSION_COOKIE = "chess_session"
+SESSION_IDLE_TIMEOUT = 600  # Seconds without a request before a session (and the board it plays) is let go
+SESSION_MAX = 1000  # Sessions kept; the least recently seen are evicted first
+SESSION_TAKEOVER_AFTER = 300  # Seconds the player leaves the game unchanged before another browser may take the board over
+GAME_LOCK_TIMEOUT = 60  # Seconds a request waits for another request on the same game before giving up (409)
 
 # Timeouts for Pi communication
 PI_TIMEOUT = 30  # Seconds to wait for Pi response (increased for reliability)
 ENGINE_TIMEOUT = 45  # Seconds to wait for engine response (increased for long calculations)
 
+# Local engine fallback (pi_fallback.py): while a Pi is unreachable its side is played
+# by Stockfish on this machine, and the Pi is handed the game back once it answers again
+PI_FALLBACK = True
+PI_RECOVERY_INTERVAL = 5  # Seconds between checks on a Pi that is down
+PI_PROBE_TIMEOUT = 2  # Seconds to wait for a down Pi's /api/status
+
+# Analysis on idle Pis (analysis_service.py): a Pi the game mode does not need
+# (the white Pi in user vs CPU) analyses positions for the eval bar, hints and annotation
+ANALYSIS_ENABLED = True
+ANALYSIS_TIME = 2.0  # Seconds of full-strength analysis per position
+ANALYSIS_MULTIPV = 3  # Lines reported per position
+ANALYSIS_CACHE_SIZE = 4096  # Positions kept (by Zobrist hash)
+ANALYSIS_SPLIT = False  # Opt-in: split each position's root moves across all idle Pis (searchmoves)
+ANALYSIS_SPLIT_GRACE = 1.0  # Seconds past ANALYSIS_TIME a split search waits for the other Pi
+ANALYSIS_SPLIT_RETRIES = 2  # Times a position is searched again after a late partition before its partial result stays
+
 # Usr Vs CPU || CPU vs CPU
 # Game mode settings
 GAME_MODES = {
@@ -36,6 +91,14 @@ DEFAULT_BLACK_ELO = 1350
 ENGINE_SKILL_LEVEL = 10  # Range: 0 (weakest) to 20 (strongest)
 ENGINE_ELO_RATING = 1350  # Target playing strength
 ENGINE_THINK_TIME = 2.0  # Seconds for engine to think
+ENGINE_TELEMETRY_LIMIT = 1000  # Per-move search records kept for /api/engine-stats
+
+# Game archive (append-only PGN files + index, relative to the GUI folder)
+GAME_ARCHIVE_DIR = "game_archive"
+GAME_ARCHIVE_MAX_FILE_MB = 8  # Start a new PGN file once the current one reaches this size
+
+# Static assets
+ASSET_BUNDLE = True  # Serve the hashed bundles from build_assets.py when static/dist/manifest.json exists
 
 # Game settings
 ENGINE_TIMEOUT = 15  # Seconds to wait for engine response
@@ -0,0 +1,173 @@
+"""
+Engine Worker Pool over the Pis
+file: /AI_Chess_Senior_Design/GUI/engine_pool.py
+
+With ENGINE_POOL on, the GUI server treats every Pi it knows (both Pis of
+every board, plus SPARE_PIS without a board) as an engine worker for every
+board. An engine move goes to the least-loaded healthy Pi:
+
+    cost = (requests in flight + 1) / recent nps
+
+where the nps is a moving average of what the Pi's searches reported, so a
+Pi that is busy, or just slow, is asked less often. The game (start FEN
+and moves, so repetitions count) and the persona travel with the request
+(/api/search on the Pi), so afterwards only the move is applied to the
+board's own Pi. A spare Pi takes load off busy
+boards, and one slow Pi no longer holds up its board.
+
+A Pi whose request fails is benched (ENGINE_POOL_BACKOFF seconds, doubling
+up to 60) and the search is retried on the next-best Pi. Idle Pis (nothing
+in flight) are also the analysis workers (analysis_service.py).
+"""
+
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Weight of the newest search in a Pi's nps average
+NPS_SMOOTHING = 0.3
+MAX_BACKOFF = 60
+
+
+class PiWorker:
+    """One Pi in the pool and what the pool knows about its load and health"""
+
+    def __init__(self, worker_id, url):
+        self.worker_id = worker_id
+        self.url = url
+        self.in_flight = 0
+        self.nps = None             # moving average of reported nps, None until the first search
+        self.searches = 0
+        self.failures = 0           # consecutive failed requests
+        self.benched_until = 0.0
+        self.last_error = None
+
+    def healthy(self, now):
+        return now >= self.benched_until
+
+    def stats(self, now):
+        return {
+            'url': self.url,
+            'healthy': self.healthy(now),
+            'in_flight': self.in_flight,
+            'nps': round(self.nps) if self.nps else None,
+            'searches': self.searches,
+            'failures': self.failures,
+            'last_error': self.last_error
+        }
+
+
+class EnginePool:
+    """Schedules engine searches onto the least-loaded healthy Pi"""
+
+    def __init__(self, workers, timeout=30.0, connect_timeout=2.0, backoff=5.0):
+        """
+        Args:
+            workers: {worker id: base URL of the Pi}
+            timeout: seconds to wait for a search on top of its think time
+            backoff: seconds a Pi is benched after its first failure (doubles per failure)
+        """
+        self.workers = {worker_id: PiWorker(worker_id, url) for worker_id, url in workers.items()}
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.backoff = backoff
+        self.failovers = 0
+        self._lock = threading.Lock()
+        # No adapter retries: a failed Pi is benched and the next one tried instead
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=max(1, len(self.workers)), pool_maxsize=10)
+        self.session.mount("http://", adapter)
+
+    def url(self, worker_id):
+        return self.workers[worker_id].url
+
+    def worker_ids(self):
+        return list(self.workers)
+
+    def idle(self):
+        """Healthy Pis with nothing in flight (free for analysis)"""
+        now = time.monotonic()
+        with self._lock:
+            return [worker.worker_id for worker in self.workers.values()
+                    if worker.in_flight == 0 and worker.healthy(now)]
+
+    def _acquire(self, prefer=None, exclude=()):
+        """Pick the cheapest healthy Pi and count the request on it; None if there is none"""
+        now = time.monotonic()
+        with self._lock:
+            candidates = [worker for worker in self.workers.values()
+                          if worker.worker_id not in exclude and worker.healthy(now)]
+            if not candidates:
+                return None
+            # Pis that have not searched yet are assumed as fast as the typical Pi
+            known = sorted(worker.nps for worker in self.workers.values() if worker.nps)
+            typical = known[len(known) // 2] if known else 1.0
+            # Ties (e.g. all idle with no nps yet) go to the board's own Pi
+            worker = min(candidates, key=lambda w: ((w.in_flight + 1) / (w.nps or typical),
+                                                     w.worker_id != prefer))
+            worker.in_flight += 1
+            return worker
+
+    def _release(self, worker, nps=None, error=None):
+        with self._lock:
+            worker.in_flight -= 1
+            if error is not None:
+                worker.failures += 1
+                worker.last_error = str(error)
+                worker.benched_until = time.monotonic() + min(MAX_BACKOFF,
+                                                              self.backoff * 2 ** (worker.failures - 1))
+                return
+            worker.failures = 0
+            worker.searches += 1
+            if nps:
+                worker.nps = nps if worker.nps is None else \
+                    NPS_SMOOTHING * nps + (1 - NPS_SMOOTHING) * worker.nps
+
+    def search(self, board, persona, game_speed=10, prefer=None):
+        """The engine move in board's position, played with persona on the least-loaded Pi
+
+        persona: {'elo', 'skill', 'use_nnue', 'nnue_model'} as /api/set-bot-difficulty takes it.
+        Returns the Pi's /api/search answer plus 'worker', or None when no Pi
+        could search it (every Pi benched, or the position was refused).
+        """
+        game = {'fen': board.root().fen(), 'moves': [move.uci() for move in board.move_stack]}
+        tried = []
+        while True:
+            worker = self._acquire(prefer, tried)
+            if worker is None:
+                return None
+            tried.append(worker.worker_id)
+            try:
+                response = self.session.post(f"{worker.url}/api/search",
+                                             json=dict(persona, game_speed=game_speed, **game),
+                                             timeout=(self.connect_timeout, self.timeout))
+                data = response.json()
+            except (requests.exceptions.RequestException, ValueError) as e:
+                print(f"Engine pool: {worker.worker_id} failed ({e}) - trying another Pi")
+                self._release(worker, error=e)
+                self.failovers += 1
+                continue
+            if response.status_code == 400:
+                # The position itself was refused (e.g. game over): no other Pi would take it
+                self._release(worker)
+                return None
+            if response.status_code != 200 or data.get('status') != 'success':
+                print(f"Engine pool: {worker.worker_id} answered HTTP {response.status_code} - trying another Pi")
+                self._release(worker, error=data.get('message') or f"HTTP {response.status_code}")
+                self.failovers += 1
+                continue
+            self._release(worker, nps=((data.get('engine_move') or {}).get('info') or {}).get('nps'))
+            return dict(data, worker=worker.worker_id)
+
+    def stats(self):
+        now = time.monotonic()
+        with self._lock:
+            return {
+                'workers': {worker_id: worker.stats(now) for worker_id, worker in self.workers.items()},
+                'failovers': self.failovers
+            }
+
+    def close(self):
+        self.session.close()
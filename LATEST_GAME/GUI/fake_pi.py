@@ -0,0 +1,453 @@
+#!/usr/bin/env python3
+"""
+Fake Raspberry Pi Chess Server
+file: /AI_Chess_Senior_Design/GUI/fake_pi.py
+
+Stand-in for Board_apps/pi_chess_server_black.py / _white.py so the GUI
+server (app.py) can be run and load tested without the Pis. It answers the
+same endpoints with the same JSON shapes:
+
+    GET  /api/status, /api/board-state, /api/search-stream
+    POST /api/move, /api/engine-move, /api/game-control, /api/set-bot-difficulty,
+         /api/analyze, /api/search
+
+/api/move understands `reply` and `stream` (the engine's answer in the same
+request) like the Pi servers do. /api/analyze waits the requested time (or is
+cut short by a move request, like the Pi's preemption) and returns made-up
+lines for the position's first legal moves. /api/search plays a move in the
+game it is sent (start FEN and moves, engine pool) without touching the fake's own board, and
+reports `nps` (an attribute, so a test can make one fake look slower).
+
+How engine moves are chosen (--mover):
+    random      a random legal move, right away
+    delay       a random legal move after the time the real Pi would search
+                (2.0 / game_speed seconds, at least 0.1)
+    stockfish   Stockfish (if installed) with that same time limit
+
+Every request can be slowed down by --latency seconds plus a random 0..--jitter,
+and a --fail-rate fraction of requests is answered with HTTP 503, so retries
+and timeouts in app.py can be exercised. Several fake Pis can run in one
+process (see load_test.py); each has its own Flask app and board.
+
+Usage:
+    python fake_pi.py --port 6002 --mover delay --latency 0.005 --jitter 0.01
+    PI_BLACK_IP=127.0.0.1 PI_BLACK_PORT=6002 python app.py
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import threading
+import time
+
+import chess
+import chess.engine
+from flask import Flask, Response, jsonify, request
+from werkzeug.serving import make_server
+
+MOVERS = ('random', 'delay', 'stockfish')
+STOCKFISH_CANDIDATES = ('/usr/games/stockfish', '/usr/local/bin/stockfish')
+
+
+def find_stockfish():
+    """Path of a Stockfish binary on this machine, or None"""
+    path = os.environ.get('STOCKFISH_PATH') or shutil.which('stockfish')
+    if path:
+        return path
+    for candidate in STOCKFISH_CANDIDATES:
+        if os.path.exists(candidate):
+            return candidate
+    return None
+
+
+def thinking_time(game_speed):
+    """Search time the Pi servers use for a game speed (1-20)"""
+    try:
+        game_speed = max(1, min(20, int(game_speed)))
+    except (ValueError, TypeError):
+        game_speed = 10
+    return min(max(0.1, 2.0 / game_speed), 5.0)
+
+
+class FakePi:
+    """One fake Pi: a chess board behind the Pi server's HTTP API"""
+
+    def __init__(self, name='fake-pi', mover='random', latency=0.0, jitter=0.0,
+                 fail_rate=0.0, seed=None):
+        if mover not in MOVERS:
+            raise ValueError(f"Unknown mover {mover!r}, expected one of {MOVERS}")
+        self.name = name
+        self.mover = mover
+        self.latency = latency
+        self.jitter = jitter
+        self.fail_rate = fail_rate
+        self.rng = random.Random(seed)
+        self.board = chess.Board()
+        self.current_player = 'white'
+        self.game_active = True
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.failures = 0
+        self.analyses = 0
+        self.searches = 0
+        self.nps = 1000000                  # reported by /api/search for the engine pool
+        self._analysing = 0
+        self._preempt = threading.Event()   # set by play requests to cut an analysis short
+        self.engine = None
+        self._server = None
+        self._thread = None
+        if mover == 'stockfish':
+            path = find_stockfish()
+            if path is None:
+                raise RuntimeError("Stockfish not found (set STOCKFISH_PATH or use --mover delay)")
+            self.engine = chess.engine.SimpleEngine.popen_uci(path)
+        self.app = Flask(name)
+        self._register_routes()
+
+    # --- board helpers (same output as the Pi servers) ---
+
+    def board_state(self):
+        return {chess.square_name(square): piece.symbol()
+                for square, piece in self.board.piece_map().items()}
+
+    def legal_moves_map(self):
+        legal_moves = {}
+        for move in self.board.legal_moves:
+            targets = legal_moves.setdefault(chess.square_name(move.from_square), [])
+            to_name = chess.square_name(move.to_square)
+            if to_name not in targets:
+                targets.append(to_name)
+        return legal_moves
+
+    def winner(self):
+        if not self.board.is_game_over():
+            return None
+        return {'1-0': 'white', '0-1': 'black'}.get(self.board.result(), 'draw')
+
+    def build_move(self, from_square, to_square, promotion=None):
+        """Parse a move from square names; a pawn reaching the last rank promotes to a queen by default"""
+        from_sq = chess.parse_square(from_square)
+        to_sq = chess.parse_square(to_square)
+        promotion_type = chess.Piece.from_symbol(promotion).piece_type if promotion else None
+        piece = self.board.piece_at(from_sq)
+        if promotion_type is None and piece and piece.piece_type == chess.PAWN \
+                and chess.square_rank(to_sq) in (0, 7):
+            promotion_type = chess.QUEEN
+        return chess.Move(from_sq, to_sq, promotion=promotion_type)
+
+    def choose_move(self, game_speed, board=None):
+        """Engine move for board, by default the fake's own (called with the lock held, like the Pi's single engine)"""
+        board = self.board if board is None else board
+        think = thinking_time(game_speed)
+        if self.mover == 'stockfish':
+            return self.engine.play(board, chess.engine.Limit(time=think)).move, think
+        if self.mover == 'delay':
+            time.sleep(think)
+        return self.rng.choice(list(board.legal_moves)), think
+
+    def switch_player(self):
+        self.current_player = 'black' if self.current_player == 'white' else 'white'
+
+    def engine_move_payload(self, game_speed):
+        """Play an engine move; the /api/engine-move response body (call with the lock held)"""
+        if self._analysing:
+            self._preempt.set()
+        if self.board.is_game_over():
+            return {
+                'status': 'success',
+                'engine_move': None,
+                'board_state': self.board_state(),
+                'legal_moves': self.legal_moves_map(),
+                'game_over': True,
+                'winner': self.winner(),
+                'message': 'Game is over'
+            }
+        start = time.perf_counter()
+        move, think = self.choose_move(game_speed)
+        elapsed = time.perf_counter() - start
+        piece = self.board.piece_at(move.from_square)
+        engine_move = {
+            'from': chess.square_name(move.from_square),
+            'to': chess.square_name(move.to_square),
+            'piece': piece.symbol() if piece else None,
+            'promotion': chess.piece_symbol(move.promotion) if move.promotion else None,
+            'san': self.board.san(move),
+            'info': {'depth': None, 'seldepth': None, 'nodes': None, 'nps': None,
+                     'time': None, 'elapsed': round(elapsed, 4), 'budget': think,
+                     'score_cp': None, 'mate': None, 'wdl': None, 'pv': None}
+        }
+        self.board.push(move)
+        self.switch_player()
+        return {
+            'status': 'success',
+            'engine_move': engine_move,
+            'board_state': self.board_state(),
+            'legal_moves': self.legal_moves_map(),
+            'game_over': self.board.is_game_over(),
+            'winner': self.winner()
+        }
+
+    def stream_move_and_reply(self, move_response, game_speed):
+        """NDJSON body for /api/move with reply + stream, like the Pi servers"""
+        yield json.dumps(move_response) + "\n"
+        with self.lock:
+            reply = self.engine_move_payload(game_speed)
+        yield json.dumps(reply) + "\n"
+
+    # --- injected network trouble ---
+
+    def _inject(self):
+        """Delay every request and fail some of them (Flask before_request hook)"""
+        self.requests += 1
+        delay = self.latency + (self.rng.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay > 0:
+            time.sleep(delay)
+        if self.fail_rate and self.rng.random() < self.fail_rate:
+            self.failures += 1
+            return jsonify({'status': 'error', 'message': 'Injected failure'}), 503
+        return None
+
+    def _register_routes(self):
+        app = self.app
+        app.before_request(self._inject)
+
+        @app.route('/api/status', methods=['GET'])
+        def status():
+            return jsonify({
+                'status': 'running',
+                'engine_connected': True,
+                'game_active': self.game_active,
+                'current_player': self.current_player,
+                'board_fen': self.board.fen(),
+                'last_search_info': None,
+                'fake': {'name': self.name, 'mover': self.mover, 'requests': self.requests,
+                         'failures': self.failures, 'analyses': self.analyses,
+                         'searches': self.searches}
+            })
+
+        @app.route('/api/analyze', methods=['POST'])
+        def analyze():
+            data = request.get_json(silent=True) or {}
+            try:
+                board = chess.Board(data.get('fen') or chess.STARTING_FEN)
+                seconds = max(0.1, min(30.0, float(data.get('time', 2.0))))
+                multipv = max(1, min(5, int(data.get('multipv', 3))))
+                root_moves = [chess.Move.from_uci(uci) for uci in data.get('searchmoves') or []]
+                if any(move not in board.legal_moves for move in root_moves):
+                    raise ValueError('searchmoves must be legal moves of the position')
+            except (ValueError, TypeError) as e:
+                return jsonify({'status': 'error', 'message': f'Bad analysis request: {e}'}), 400
+            if self.lock.locked():
+                return jsonify({'status': 'busy', 'message': 'Engine is playing'}), 409
+            self.analyses += 1
+            self._analysing += 1
+            start = time.perf_counter()
+            try:
+                preempted = self._preempt.wait(seconds)
+            finally:
+                self._analysing -= 1
+                self._preempt.clear()
+            elapsed = time.perf_counter() - start
+            depth = max(1, int(elapsed * 10))
+            lines = [{'depth': depth, 'seldepth': depth + 2, 'nodes': depth * 20000, 'nps': 1000000,
+                      'time': round(elapsed, 3), 'elapsed': round(elapsed, 4),
+                      'score_cp': self.rng.randint(-60, 60) - 10 * i, 'mate': None, 'wdl': None,
+                      'pv': [board.san(move)], 'move': move.uci()}
+                     for i, move in enumerate((root_moves or list(board.legal_moves))[:multipv])]
+            lines.sort(key=lambda line: -line['score_cp'] if board.turn == chess.WHITE else line['score_cp'])
+            return jsonify({'status': 'success', 'fen': board.fen(), 'lines': lines, 'depth': depth,
+                            'searchmoves': [move.uci() for move in root_moves] or None,
+                            'budget': seconds, 'elapsed': round(elapsed, 4), 'preempted': preempted})
+
+        @app.route('/api/search', methods=['POST'])
+        def search():
+            data = request.get_json(silent=True) or {}
+            try:
+                # The game's start position and its moves, like Board_apps/position_search.py
+                board = chess.Board(data.get('fen') or chess.STARTING_FEN)
+                for uci in data.get('moves') or []:
+                    move = chess.Move.from_uci(uci)
+                    if move not in board.legal_moves:
+                        raise ValueError(f"illegal move {uci}")
+                    board.push(move)
+            except ValueError as e:
+                return jsonify({'status': 'error', 'message': f'Bad search request: {e}'}), 400
+            if board.is_game_over():
+                return jsonify({'status': 'error', 'message': 'Position is game over'}), 400
+            with self.lock:
+                if self._analysing:
+                    self._preempt.set()
+                self.searches += 1
+                start = time.perf_counter()
+                move, think = self.choose_move(data.get('game_speed', 10), board)
+                elapsed = time.perf_counter() - start
+            piece = board.piece_at(move.from_square)
+            nodes = int(self.nps * elapsed)
+            return jsonify({'status': 'success', 'fen': board.fen(), 'engine_move': {
+                'from': chess.square_name(move.from_square),
+                'to': chess.square_name(move.to_square),
+                'piece': piece.symbol() if piece else None,
+                'promotion': chess.piece_symbol(move.promotion) if move.promotion else None,
+                'san': board.san(move),
+                'info': {'depth': None, 'seldepth': None, 'nodes': nodes, 'nps': self.nps,
+                         'time': round(elapsed, 3), 'elapsed': round(elapsed, 4), 'budget': think,
+                         'score_cp': None, 'mate': None, 'wdl': None, 'pv': None}
+            }})
+
+        @app.route('/api/search-stream', methods=['GET'])
+        def search_stream():
+            # No live search to report; the stream just ends
+            return Response(iter(()), mimetype='text/event-stream',
+                            headers={'Cache-Control': 'no-cache'})
+
+        @app.route('/api/move', methods=['POST'])
+        def handle_move():
+            data = request.get_json(silent=True)
+            if not data:
+                return jsonify({'status': 'error', 'message': 'No JSON data provided'}), 400
+            from_square = data.get('from')
+            to_square = data.get('to')
+            if not from_square or not to_square:
+                return jsonify({'status': 'error', 'message': 'Missing from or to square'}), 400
+            with self.lock:
+                try:
+                    move = self.build_move(from_square, to_square, data.get('promotion'))
+                except ValueError:
+                    move = None
+                if move is None or move not in self.board.legal_moves:
+                    return jsonify({'status': 'error', 'message': 'Invalid move',
+                                    'move_accepted': False}), 400
+                self.board.push(move)
+                self.switch_player()
+                response = {
+                    'status': 'success',
+                    'move_accepted': True,
+                    'board_state': self.board_state(),
+                    'legal_moves': self.legal_moves_map(),
+                    'game_over': self.board.is_game_over(),
+                    'winner': self.winner(),
+                    'current_player': self.current_player
+                }
+                if data.get('reply') and not response['game_over']:
+                    game_speed = data.get('game_speed', 10)
+                    if data.get('stream'):
+                        return Response(self.stream_move_and_reply(response, game_speed),
+                                        mimetype='application/x-ndjson')
+                    response['reply'] = self.engine_move_payload(game_speed)
+                return jsonify(response)
+
+        @app.route('/api/engine-move', methods=['POST'])
+        def handle_engine_move():
+            data = request.get_json(silent=True) or {}
+            with self.lock:
+                return jsonify(self.engine_move_payload(data.get('game_speed', 10)))
+
+        @app.route('/api/board-state', methods=['GET'])
+        def board_state():
+            with self.lock:
+                return jsonify({
+                    'status': 'success',
+                    'board_state': self.board_state(),
+                    'legal_moves': self.legal_moves_map(),
+                    'current_player': self.current_player,
+                    'game_over': self.board.is_game_over(),
+                    'winner': self.winner(),
+                    'board_fen': self.board.fen()
+                })
+
+        @app.route('/api/game-control', methods=['POST'])
+        def game_control():
+            command = (request.get_json(silent=True) or {}).get('command')
+            with self.lock:
+                if command == 'reset':
+                    self.board = chess.Board()
+                    self.current_player = 'white'
+                    return jsonify({
+                        'status': 'success',
+                        'message': 'Game reset to starting position',
+                        'board_state': self.board_state(),
+                        'legal_moves': self.legal_moves_map()
+                    })
+                if command in ('pause', 'resume'):
+                    self.game_active = command == 'resume'
+                    return jsonify({'status': 'success', 'message': f'Game {command}d'})
+            return jsonify({'status': 'error', 'message': f'Unknown command: {command}'}), 400
+
+        @app.route('/api/set-bot-difficulty', methods=['POST'])
+        def set_bot_difficulty():
+            data = request.get_json(silent=True) or {}
+            elo = max(1350, min(2850, data.get('elo', 1350)))
+            skill = max(0, min(20, data.get('skill', 10)))
+            use_nnue = data.get('use_nnue', False)
+            nnue_model = data.get('nnue_model', 'carlsen')
+            with self.lock:
+                if self.engine is not None:
+                    self.engine.configure({"Skill Level": skill, "UCI_LimitStrength": True, "UCI_Elo": elo})
+                self.board = chess.Board()
+                self.current_player = 'white'
+                return jsonify({
+                    'status': 'success',
+                    'message': f'Bot difficulty set: ELO {elo}, Skill Level {skill}',
+                    'elo': elo,
+                    'skill': skill,
+                    'nnue_enabled': use_nnue,
+                    'nnue_model': nnue_model if use_nnue else None,
+                    'board_state': self.board_state(),
+                    'legal_moves': self.legal_moves_map()
+                })
+
+    # --- serving ---
+
+    def start(self, host='127.0.0.1', port=0):
+        """Serve in a background thread (port 0 picks a free port); returns the base URL"""
+        self._server = make_server(host, port, self.app, threaded=True)
+        self._thread = threading.Thread(target=self._server.serve_forever,
+                                        name=f"{self.name}-server", daemon=True)
+        self._thread.start()
+        return self.url
+
+    @property
+    def host(self):
+        return self._server.server_address[0] if self._server else None
+
+    @property
+    def port(self):
+        return self._server.server_port if self._server else None
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}" if self._server else None
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        if self.engine is not None:
+            self.engine.quit()
+            self.engine = None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake Pi chess server for testing the GUI server")
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=5002)
+    parser.add_argument('--mover', choices=MOVERS, default='delay')
+    parser.add_argument('--latency', type=float, default=0.0, help="seconds added to every request")
+    parser.add_argument('--jitter', type=float, default=0.0, help="random extra seconds, 0..jitter")
+    parser.add_argument('--fail-rate', type=float, default=0.0, help="fraction of requests answered 503")
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+
+    fake = FakePi(f"fake-pi-{args.port}", args.mover, args.latency, args.jitter, args.fail_rate, args.seed)
+    print(f"Fake Pi ({args.mover} mover) on {args.host}:{args.port}")
+    try:
+        fake.app.run(host=args.host, port=args.port, debug=False, threaded=True)
+    finally:
+        fake.stop()
+
+
+if __name__ == '__main__':
+    main()
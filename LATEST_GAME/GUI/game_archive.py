@@ -0,0 +1,252 @@
+"""
+Append-Only PGN Game Archive
+file: /AI_Chess_Senior_Design/GUI/game_archive.py
+
+The coordinator records every game it runs here. Moves of the game in
+progress are streamed to a small journal file (buffered, flushed per move);
+when the game ends the whole game is appended as PGN to the current archive
+file and fsynced, then a line is appended to the index:
+
+    game_archive/
+        games-0001.pgn      PGN files, a new one starts once one reaches the size limit
+        games-0002.pgn
+        index.jsonl         {"id", "file", "offset", "length", "white", "black", "result", "date", ...}
+        current.jsonl       journal of the game in progress
+
+Files are only ever appended to. The index is loaded into memory at startup,
+so fetching a game is one seek and one read no matter how large the archive
+grows. If the server stops mid-game, the journal is archived with result "*"
+on the next start.
+"""
+
+import json
+import os
+import threading
+from datetime import datetime
+
+import chess
+import chess.pgn
+
+INDEX_NAME = 'index.jsonl'
+JOURNAL_NAME = 'current.jsonl'
+PGN_PREFIX = 'games-'
+
+
+class GameArchive:
+    """Rotating append-only PGN files plus a byte-offset index keyed by game id"""
+
+    def __init__(self, directory, max_file_bytes=8 * 1024 * 1024):
+        self.directory = directory
+        self.max_file_bytes = max_file_bytes
+        self.index = {}         # game id -> index entry, in archive order
+        self._lock = threading.Lock()
+        self._game = None       # game in progress: {'id', 'headers', 'board', 'started'}
+        self._last_board = None  # final position of the last game, until the next one starts
+        self._journal = None
+        os.makedirs(directory, exist_ok=True)
+        self._load_index()
+        self._recover_journal()
+
+    def _path(self, name):
+        return os.path.join(self.directory, name)
+
+    def _load_index(self):
+        path = self._path(INDEX_NAME)
+        if not os.path.exists(path):
+            return
+        with open(path) as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # A line torn by a crash mid-append; its game was never acknowledged
+                    continue
+                self.index[entry['id']] = entry
+
+    def _recover_journal(self):
+        """Archive a game the server did not get to finish (result '*')"""
+        path = self._path(JOURNAL_NAME)
+        if not os.path.exists(path):
+            return
+        game = None
+        with open(path) as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break
+                if 'headers' in record:
+                    game = {'id': record['id'], 'headers': record['headers'],
+                            'board': chess.Board(), 'started': record['started']}
+                elif game is not None:
+                    try:
+                        game['board'].push_uci(record['move'])
+                    except ValueError:
+                        break
+        if game is not None and game['id'] not in self.index and game['board'].move_stack:
+            print(f"Archiving unfinished game {game['id']} ({len(game['board'].move_stack)} plies)")
+            self._append_game(game, '*', 'unterminated')
+        os.remove(path)
+
+    def _current_pgn_file(self, incoming_bytes):
+        """Name of the PGN file to append to, starting a new one when the current is full"""
+        numbers = [int(name[len(PGN_PREFIX):-4]) for name in os.listdir(self.directory)
+                   if name.startswith(PGN_PREFIX) and name.endswith('.pgn')
+                   and name[len(PGN_PREFIX):-4].isdigit()]
+        number = max(numbers, default=1)
+        name = f"{PGN_PREFIX}{number:04d}.pgn"
+        path = self._path(name)
+        if os.path.exists(path) and os.path.getsize(path) > 0 \
+                and os.path.getsize(path) + incoming_bytes > self.max_file_bytes:
+            name = f"{PGN_PREFIX}{number + 1:04d}.pgn"
+        return name
+
+    def _append_game(self, game, result, termination):
+        """Write a game to the archive and the index, both fsynced; returns its index entry"""
+        board = game['board']
+        pgn_game = chess.pgn.Game.from_board(board)
+        for key, value in game['headers'].items():
+            pgn_game.headers[key] = str(value)
+        pgn_game.headers["Result"] = result
+        pgn_game.headers["Termination"] = termination
+        pgn_game.headers["PlyCount"] = str(board.ply())
+        data = (str(pgn_game) + "\n\n").encode('utf-8')
+
+        name = self._current_pgn_file(len(data))
+        with open(self._path(name), 'ab') as f:
+            offset = f.tell()
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+
+        entry = {
+            'id': game['id'],
+            'file': name,
+            'offset': offset,
+            'length': len(data),
+            'white': game['headers'].get('White'),
+            'black': game['headers'].get('Black'),
+            'result': result,
+            'termination': termination,
+            'plies': board.ply(),
+            'date': game['started'],
+        }
+        with open(self._path(INDEX_NAME), 'a') as f:
+            f.write(json.dumps(entry) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self.index[game['id']] = entry
+        return entry
+
+    def _close_journal(self):
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+        path = self._path(JOURNAL_NAME)
+        if os.path.exists(path):
+            os.remove(path)
+
+    def start_game(self, headers):
+        """Begin recording a new game; a game still in progress is archived as abandoned
+
+        Args:
+            headers: PGN headers such as White, Black, WhiteElo, BlackElo, Event
+        Returns the new game id.
+        """
+        with self._lock:
+            self._finish_locked('*', 'abandoned')
+            now = datetime.now()
+            game_id = f"{now:%Y%m%d-%H%M%S}-{os.urandom(3).hex()}"
+            headers = dict(headers)
+            headers.setdefault("Event", "AI Chess")
+            headers["Date"] = f"{now:%Y.%m.%d}"
+            headers["GameId"] = game_id
+            self._game = {'id': game_id, 'headers': headers, 'board': chess.Board(),
+                          'started': now.isoformat(timespec='seconds')}
+            self._last_board = None
+            self._journal = open(self._path(JOURNAL_NAME), 'w')
+            self._journal.write(json.dumps({'id': game_id, 'headers': headers,
+                                            'started': self._game['started']}) + "\n")
+            self._journal.flush()
+            return game_id
+
+    def record_move(self, from_square, to_square, promotion=None):
+        """Add a move to the game in progress; returns False if there is none or the move is illegal
+
+        A pawn move to the last rank without a promotion piece is taken as a
+        queen promotion, like the Pi servers do.
+        """
+        with self._lock:
+            if self._game is None:
+                return False
+            board = self._game['board']
+            try:
+                move = chess.Move.from_uci(f"{from_square}{to_square}{promotion or ''}".lower())
+            except ValueError:
+                return False
+            if move not in board.legal_moves and move.promotion is None:
+                move = chess.Move(move.from_square, move.to_square, promotion=chess.QUEEN)
+            if move not in board.legal_moves:
+                print(f"Archive: ignoring illegal move {from_square}{to_square} in game {self._game['id']}")
+                return False
+            board.push(move)
+            # Flushed to the OS per move (survives a server crash); fsync waits for the game end
+            self._journal.write(json.dumps({'move': move.uci()}) + "\n")
+            self._journal.flush()
+            return True
+
+    def finish_game(self, result=None, termination=None):
+        """Archive the game in progress; returns its index entry, or None if nothing was played
+
+        Args:
+            result: '1-0', '0-1', '1/2-1/2' or '*'; taken from the board when it is game over
+            termination: reason for the PGN Termination header
+        """
+        with self._lock:
+            return self._finish_locked(result, termination)
+
+    def _finish_locked(self, result, termination):
+        game = self._game
+        if game is None:
+            return None
+        self._game = None
+        self._last_board = game['board']
+        entry = None
+        if game['board'].move_stack:
+            outcome = game['board'].outcome(claim_draw=True)
+            if outcome is not None:
+                result = outcome.result()
+                termination = termination or outcome.termination.name.lower().replace('_', ' ')
+            entry = self._append_game(game, result or '*', termination or 'normal')
+            print(f"Archived game {entry['id']}: {entry['white']} - {entry['black']} {entry['result']}")
+        self._close_journal()
+        return entry
+
+    def board(self):
+        """Copy of the current position as recorded here, or None before the first game
+
+        Between games this is the final position of the last one.
+        """
+        with self._lock:
+            board = self._game['board'] if self._game else self._last_board
+            return board.copy() if board is not None else None
+
+    def current_game_id(self):
+        with self._lock:
+            return self._game['id'] if self._game else None
+
+    def get_pgn(self, game_id):
+        """PGN text of an archived game, or None if the id is unknown"""
+        with self._lock:
+            entry = self.index.get(game_id)
+        if entry is None:
+            return None
+        with open(self._path(entry['file']), 'rb') as f:
+            f.seek(entry['offset'])
+            return f.read(entry['length']).decode('utf-8')
+
+    def recent(self, limit=50):
+        """Index entries of the most recently archived games, newest first"""
+        with self._lock:
+            entries = list(self.index.values())
+        return entries[::-1][:limit]
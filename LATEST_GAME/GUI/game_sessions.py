@@ -0,0 +1,118 @@
+"""
+Browser Sessions and Board Control
+file: /AI_Chess_Senior_Design/GUI/game_sessions.py
+
+Every browser gets a session id in a cookie (SESSION_COOKIE in config.py).
+The first session to change a board's game (new game, move, engine move,
+game control) becomes that board's player; every other session watches: it
+can read the board, the live search and the analysis, and is answered 409
+when it tries to change the game. Tabs of one browser share the cookie, so
+they are the same player; their requests take turns on the board's game
+lock (BoardCoordinator.game_lock) instead of racing over current_player.
+
+A session not seen for SESSION_IDLE_TIMEOUT seconds is evicted, which frees
+the boards it played, so an abandoned browser does not hold a board forever.
+At most SESSION_MAX sessions are kept; past that the least recently seen
+ones go first.
+
+Polling keeps a session seen, so a forgotten tab would hold its board for as
+long as it stays open. The player lets the board go by interrupting its game
+(release()), and a watching browser may take the board over once its player
+has not changed the game for SESSION_TAKEOVER_AFTER seconds (take_over()).
+"""
+
+import secrets
+import threading
+import time
+from collections import OrderedDict
+
+
+class GameSessions:
+    """Sessions by cookie id, least recently seen first, and the player of each board"""
+
+    def __init__(self, idle_timeout=600, max_sessions=1000, takeover_after=300):
+        self.idle_timeout = idle_timeout
+        self.max_sessions = max_sessions
+        self.takeover_after = takeover_after
+        self._sessions = OrderedDict()  # session id -> time last seen (monotonic)
+        self._players = {}              # board id -> session id of its player
+        self._played = {}               # board id -> time its player last changed the game (monotonic)
+        self._lock = threading.Lock()
+        self.evicted = 0
+
+    @staticmethod
+    def new_id():
+        return secrets.token_urlsafe(16)
+
+    def touch(self, session_id):
+        """Mark session_id as seen now (a new id is registered) and evict idle sessions"""
+        now = time.monotonic()
+        with self._lock:
+            self._sessions[session_id] = now
+            self._sessions.move_to_end(session_id)
+            self._evict(now)
+
+    def _evict(self, now):
+        # Least recently seen first, so the first session still in use ends the sweep
+        while self._sessions:
+            session_id, seen = next(iter(self._sessions.items()))
+            if now - seen < self.idle_timeout and len(self._sessions) <= self.max_sessions:
+                break
+            del self._sessions[session_id]
+            self.evicted += 1
+            for board_id in [board_id for board_id, player in self._players.items() if player == session_id]:
+                del self._players[board_id]
+                self._played.pop(board_id, None)
+
+    def claim(self, board_id, session_id):
+        """True if session_id is board_id's player; a board without one gets session_id as its player"""
+        with self._lock:
+            if self._players.setdefault(board_id, session_id) != session_id:
+                return False
+            self._played[board_id] = time.monotonic()
+            return True
+
+    def release(self, board_id, session_id):
+        """Let board_id go if session_id plays it; True if it did"""
+        with self._lock:
+            if self._players.get(board_id) != session_id:
+                return False
+            del self._players[board_id]
+            self._played.pop(board_id, None)
+            return True
+
+    def take_over(self, board_id, session_id):
+        """Make session_id board_id's player if the board is free or its player has gone quiet
+
+        True if session_id plays the board afterwards.
+        """
+        now = time.monotonic()
+        with self._lock:
+            player = self._players.get(board_id)
+            if player not in (None, session_id) and now - self._played[board_id] < self.takeover_after:
+                return False
+            self._players[board_id] = session_id
+            self._played[board_id] = now
+            return True
+
+    def idle_for(self, board_id):
+        """Seconds since board_id's player last changed the game, None while nobody plays it"""
+        with self._lock:
+            played = self._played.get(board_id)
+        return None if played is None else time.monotonic() - played
+
+    def role(self, board_id, session_id):
+        """'player', 'spectator', or None while nobody plays the board"""
+        with self._lock:
+            player = self._players.get(board_id)
+        if player is None:
+            return None
+        return 'player' if player == session_id else 'spectator'
+
+    def stats(self):
+        with self._lock:
+            return {
+                'sessions': len(self._sessions),
+                'boards_played': sorted(self._players),
+                'evicted': self.evicted
+            }
@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""
+GUI Server Load Test
+file: /AI_Chess_Senior_Design/GUI/load_test.py
+
+Runs simulated browsers against the GUI server (app.py) and reports latency
+percentiles per request type and per ply. By default everything runs in
+this process: two fake Pis (fake_pi.py) and app.py itself, each on a free
+local port, with the game archive written to a temporary folder.
+
+Each browser has its own HTTP connection pool but all of them carry the same
+session cookie, like tabs of the one browser that plays the board (the GUI
+server lets only that session change the game), and plays the way the
+frontend does:
+    user_vs_cpu   POST /api/move with a random legal move, then POST /api/engine-move
+                  for the black reply; a ply is the two requests together
+                  (--pipelined: one POST /api/move with reply + stream, the
+                  acknowledgment and the reply read as they arrive)
+    cpu_vs_cpu    POST /api/engine-move over and over; a ply is one request
+When the game is over the browser sends /api/game-control reset and keeps
+playing. The GUI server keeps one game, so browsers share it: a move that
+another browser's move made illegal is answered 400 and counted as a
+conflict (followed by GET /api/board-state), not as an error.
+--spectators adds browsers with sessions of their own that only watch: they
+poll GET /api/board-state (reported as 'watch') while the game is played.
+
+Usage:
+    python load_test.py --browsers 8 --duration 30
+    python load_test.py --browsers 2 --spectators 50
+    python load_test.py --mode cpu_vs_cpu --mover delay --game-speed 20
+    python load_test.py --pipelined --mover delay --latency 0.02
+    python load_test.py --latency 0.01 --jitter 0.02 --fail-rate 0.02
+    python load_test.py --coordinator http://localhost:5001   # an already running GUI server
+"""
+
+import argparse
+import contextlib
+import json
+import logging
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+import requests
+from werkzeug.serving import make_server
+
+from fake_pi import MOVERS, FakePi
+
+REQUEST_TIMEOUT = 60
+SPECTATOR_POLL = 0.2  # Seconds between a spectator's board-state requests
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    rank = max(1, int(round(pct / 100.0 * len(sorted_values) + 0.5)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+class LoadStats:
+    """Latencies and counters shared by all browser threads"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = {}     # name -> [seconds]
+        self.errors = {}        # name -> count
+        self.conflicts = 0
+        self.games = 0
+
+    def record(self, name, seconds, ok=True):
+        with self.lock:
+            self.latencies.setdefault(name, []).append(seconds)
+            if not ok:
+                self.errors[name] = self.errors.get(name, 0) + 1
+
+    def count_conflict(self):
+        with self.lock:
+            self.conflicts += 1
+
+    def count_game(self):
+        with self.lock:
+            self.games += 1
+
+    def report(self, elapsed):
+        """Table of latency percentiles (ms) and throughput"""
+        order = ['ply', 'move', 'move-ack', 'move+reply', 'engine-move', 'board-state', 'set-game-mode', 'reset',
+                 'watch']
+        names = [n for n in order if n in self.latencies] + \
+                sorted(n for n in self.latencies if n not in order)
+        lines = [f"{'request':<15}{'count':>7}{'errors':>8}{'p50':>9}{'p90':>9}{'p95':>9}{'p99':>9}{'max':>9}   (ms)"]
+        for name in names:
+            values = sorted(self.latencies[name])
+            cells = ''.join(f"{percentile(values, p) * 1000:>9.1f}" for p in (50, 90, 95, 99))
+            lines.append(f"{name:<15}{len(values):>7}{self.errors.get(name, 0):>8}{cells}{values[-1] * 1000:>9.1f}")
+        plies = len(self.latencies.get('ply', []))
+        lines.append(f"{plies} plies in {elapsed:.1f}s ({plies / elapsed:.1f} plies/s), "
+                     f"{self.games} games finished, {self.conflicts} conflicts")
+        return '\n'.join(lines)
+
+
+def timed(stats, name, method, url, **kwargs):
+    """Send one request and record its latency; returns (response or None, seconds)"""
+    start = time.perf_counter()
+    try:
+        response = method(url, timeout=REQUEST_TIMEOUT, **kwargs)
+    except requests.exceptions.RequestException:
+        response = None
+    seconds = time.perf_counter() - start
+    # 400 on a move is another browser's doing (shared game); anything else is an error
+    ok = response is not None and (response.status_code < 400 or
+                                   (name == 'move' and response.status_code == 400))
+    stats.record(name, seconds, ok)
+    return response, seconds
+
+
+def json_of(response):
+    try:
+        return response.json() if response is not None else {}
+    except ValueError:
+        return {}
+
+
+def pipelined_move(session, base_url, stats, from_square, to_square, game_speed):
+    """POST /api/move with reply + stream; returns (HTTP status or None, acknowledgment, reply or None, seconds)"""
+    start = time.perf_counter()
+    try:
+        response = session.post(f"{base_url}/api/move", stream=True, timeout=REQUEST_TIMEOUT,
+                                json={'from': from_square, 'to': to_square, 'reply': True,
+                                      'stream': True, 'game_speed': game_speed})
+        with response:
+            if 'ndjson' not in response.headers.get('Content-Type', ''):
+                # Rejected move, or a move that ended the game: one JSON answer
+                seconds = time.perf_counter() - start
+                stats.record('move', seconds, response.status_code in (200, 400))
+                return response.status_code, json_of(response), None, seconds
+            lines = response.iter_lines()
+            ack = json.loads(next(lines))
+            stats.record('move-ack', time.perf_counter() - start)
+            reply = json.loads(next(lines))
+    except (requests.exceptions.RequestException, StopIteration, ValueError):
+        seconds = time.perf_counter() - start
+        stats.record('move+reply', seconds, False)
+        return None, {}, None, seconds
+    seconds = time.perf_counter() - start
+    stats.record('move+reply', seconds, reply.get('status') == 'success')
+    return 200, ack, reply, seconds
+
+
+def player_cookies(base_url):
+    """Session cookie of the playing browser, for all its simulated tabs"""
+    return requests.get(f"{base_url}/api/pi-status", timeout=REQUEST_TIMEOUT).cookies
+
+
+def run_browser(base_url, args, stats, stop_at, seed, cookies):
+    """One simulated browser tab playing games until time or the ply budget is up"""
+    rng = random.Random(seed)
+    session = requests.Session()
+    session.cookies.update(cookies)
+    plies = 0
+
+    response, _ = timed(stats, 'set-game-mode', session.post, f"{base_url}/api/set-game-mode",
+                        json={'mode': args.mode, 'white_elo': args.elo, 'black_elo': args.elo})
+    state = json_of(response)
+
+    while time.perf_counter() < stop_at and (not args.plies or plies < args.plies):
+        if state.get('game_over'):
+            stats.count_game()
+            response, _ = timed(stats, 'reset', session.post, f"{base_url}/api/game-control",
+                                json={'command': 'reset'})
+            state = json_of(response)
+            continue
+
+        ply_time = 0.0
+        ok = True
+        if args.mode == 'user_vs_cpu':
+            legal_moves = state.get('legal_moves') or {}
+            moves = [(f, t) for f, targets in legal_moves.items() for t in targets]
+            if not moves:
+                response, _ = timed(stats, 'board-state', session.get, f"{base_url}/api/board-state")
+                state = json_of(response)
+                if not state.get('legal_moves') and not state.get('game_over'):
+                    time.sleep(0.1)
+                continue
+            from_square, to_square = rng.choice(moves)
+            if args.pipelined:
+                status, state, reply, seconds = pipelined_move(session, base_url, stats, from_square,
+                                                               to_square, args.game_speed)
+            else:
+                response, seconds = timed(stats, 'move', session.post, f"{base_url}/api/move",
+                                          json={'from': from_square, 'to': to_square})
+                status, state, reply = (response.status_code if response is not None else None,
+                                        json_of(response), None)
+            ply_time += seconds
+            if status != 200:
+                if status == 400:
+                    stats.count_conflict()
+                response, _ = timed(stats, 'board-state', session.get, f"{base_url}/api/board-state")
+                state = json_of(response)
+                continue
+            if reply is not None:
+                state = reply
+                stats.record('ply', ply_time, reply.get('status') == 'success')
+                plies += 1
+                continue
+            if state.get('game_over'):
+                stats.record('ply', ply_time)
+                plies += 1
+                continue
+
+        response, seconds = timed(stats, 'engine-move', session.post, f"{base_url}/api/engine-move",
+                                  json={'game_speed': args.game_speed})
+        ply_time += seconds
+        if response is None or response.status_code != 200:
+            ok = False
+            response, _ = timed(stats, 'board-state', session.get, f"{base_url}/api/board-state")
+        state = json_of(response)
+        stats.record('ply', ply_time, ok)
+        plies += 1
+
+    session.close()
+
+
+def run_spectator(base_url, stats, stop_at):
+    """One simulated browser watching the game (its own session) until time is up"""
+    session = requests.Session()
+    while time.perf_counter() < stop_at:
+        timed(stats, 'watch', session.get, f"{base_url}/api/board-state")
+        time.sleep(SPECTATOR_POLL)
+    session.close()
+
+
+def import_coordinator(black_pi, white_pi):
+    """Import app.py pointed at the fake Pis, with its archive in a temporary folder; returns the module"""
+    os.environ['PI_BLACK_IP'], os.environ['PI_BLACK_PORT'] = black_pi.host, str(black_pi.port)
+    os.environ['PI_WHITE_IP'], os.environ['PI_WHITE_PORT'] = white_pi.host, str(white_pi.port)
+    import app as coordinator
+    from game_archive import GameArchive
+    coordinator.boards.default().game_archive = GameArchive(tempfile.mkdtemp(prefix='load_test_archive_'))
+    return coordinator
+
+
+def start_coordinator(black_pi, white_pi):
+    """Import app.py pointed at the fake Pis and serve it on a free port; returns (server, base URL)"""
+    coordinator = import_coordinator(black_pi, white_pi)
+    server = make_server('127.0.0.1', 0, coordinator.app, threaded=True)
+    threading.Thread(target=server.serve_forever, name='coordinator', daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the GUI server with simulated browsers")
+    parser.add_argument('--browsers', type=int, default=4, help="concurrent simulated browser tabs playing")
+    parser.add_argument('--spectators', type=int, default=0, help="browsers only watching the game")
+    parser.add_argument('--duration', type=float, default=20.0, help="seconds to run")
+    parser.add_argument('--plies', type=int, default=0, help="stop each browser after this many plies (0 = no limit)")
+    parser.add_argument('--mode', choices=['user_vs_cpu', 'cpu_vs_cpu'], default='user_vs_cpu')
+    parser.add_argument('--pipelined', action='store_true',
+                        help="user_vs_cpu: get the engine reply with the move (reply + stream)")
+    parser.add_argument('--game-speed', type=int, default=20, help="sent with /api/engine-move (1-20)")
+    parser.add_argument('--elo', type=int, default=1500)
+    parser.add_argument('--coordinator', default=None,
+                        help="URL of a running GUI server; by default one is started with fake Pis")
+    parser.add_argument('--mover', choices=MOVERS, default='random', help="fake Pi move generation")
+    parser.add_argument('--latency', type=float, default=0.0, help="fake Pi latency per request (s)")
+    parser.add_argument('--jitter', type=float, default=0.0, help="fake Pi random extra latency (s)")
+    parser.add_argument('--fail-rate', type=float, default=0.0, help="fraction of fake Pi requests answered 503")
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--log', default=os.devnull,
+                        help="file for the GUI server's console output (default: discarded)")
+    args = parser.parse_args()
+
+    fakes = []
+    server = None
+    log = open(args.log, 'w')
+    try:
+        if args.coordinator:
+            base_url = args.coordinator.rstrip('/')
+        else:
+            logging.getLogger('werkzeug').setLevel(logging.ERROR)
+            for color in ('black', 'white'):
+                fake = FakePi(f"fake-pi-{color}", args.mover, args.latency, args.jitter,
+                              args.fail_rate, args.seed)
+                fake.start()
+                fakes.append(fake)
+                print(f"Fake {color} Pi ({args.mover}) at {fake.url}")
+            with contextlib.redirect_stdout(log):
+                server, base_url = start_coordinator(*fakes)
+            print(f"GUI server at {base_url}")
+
+        print(f"{args.browsers} browsers, {args.spectators} spectators, {args.mode}, {args.duration:g}s ...")
+        stats = LoadStats()
+        start = time.perf_counter()
+        stop_at = start + args.duration
+        seed = args.seed if args.seed is not None else random.randrange(1 << 30)
+        cookies = player_cookies(base_url)
+        threads = [threading.Thread(target=run_browser, args=(base_url, args, stats, stop_at, seed + i, cookies),
+                                    name=f"browser-{i}", daemon=True)
+                   for i in range(args.browsers)]
+        threads += [threading.Thread(target=run_spectator, args=(base_url, stats, stop_at),
+                                     name=f"spectator-{i}", daemon=True)
+                    for i in range(args.spectators)]
+        # The GUI server prints a lot per request; keep it out of the report
+        with contextlib.redirect_stdout(log):
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        elapsed = time.perf_counter() - start
+
+        print(stats.report(elapsed))
+        for fake in fakes:
+            print(f"{fake.name}: {fake.requests} requests, {fake.failures} injected failures")
+    finally:
+        if server is not None:
+            server.shutdown()
+        for fake in fakes:
+            fake.stop()
+        log.close()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,198 @@
+"""
+Local Engine Fallback for an Unreachable Pi
+file: /AI_Chess_Senior_Design/GUI/pi_fallback.py
+
+When a board Pi stops answering, app.py marks it "down" and serves that
+Pi's side from a Stockfish process on the coordinator machine instead.
+The engine is configured the way the Pi's /api/set-bot-difficulty would
+configure it (Board_apps/engine_config.py: ELO, skill level, NNUE file),
+and every position is rebuilt from the coordinator's own move log (the
+game archive), so the Pi's board is not needed. Responses have the same
+JSON shape as the Pi's, plus 'fallback': true.
+
+The engine process is started on the first fallback move and kept until
+the server stops; nothing is started while both Pis are up.
+"""
+
+import os
+import shutil
+import sys
+import threading
+import time
+
+import chess
+import chess.engine
+
+# engine_config/engine_info are shared with the Pi servers
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'Board_apps'))
+from engine_config import STOCKFISH_PATH, difficulty_options  # noqa: E402
+from engine_info import SEARCH_INFO, enable_wdl, search_info  # noqa: E402
+
+STOCKFISH_CANDIDATES = [
+    STOCKFISH_PATH,  # Linux (same place as on the Pis)
+    "/usr/local/bin/stockfish",  # macOS (Homebrew)
+    "/opt/homebrew/bin/stockfish",  # macOS (Apple Silicon Homebrew)
+]
+
+
+def find_stockfish():
+    """Path of a Stockfish binary on this machine, or None"""
+    path = os.environ.get('STOCKFISH_PATH') or shutil.which('stockfish')
+    if path:
+        return path
+    for candidate in STOCKFISH_CANDIDATES:
+        if os.path.exists(candidate):
+            return candidate
+    return None
+
+
+def board_state(board):
+    """{square: piece symbol}, as the Pi's get_board_state()"""
+    return {chess.square_name(square): piece.symbol() for square, piece in board.piece_map().items()}
+
+
+def legal_moves_map(board):
+    """{from_square: [to_square, ...]}, as the Pi's get_legal_moves_map()"""
+    legal_moves = {}
+    for move in board.legal_moves:
+        targets = legal_moves.setdefault(chess.square_name(move.from_square), [])
+        to_name = chess.square_name(move.to_square)
+        if to_name not in targets:
+            targets.append(to_name)
+    return legal_moves
+
+
+def winner(board):
+    """'white', 'black' or 'draw' once the game is over, else None"""
+    if not board.is_game_over():
+        return None
+    return {'1-0': 'white', '0-1': 'black'}.get(board.result(), 'draw')
+
+
+def build_move(board, from_square, to_square, promotion=None):
+    """Move from square names; a pawn reaching the last rank promotes to a queen unless told otherwise"""
+    from_sq = chess.parse_square(from_square)
+    to_sq = chess.parse_square(to_square)
+    promotion_type = chess.Piece.from_symbol(promotion).piece_type if promotion else None
+    if (promotion_type is None and board.piece_type_at(from_sq) == chess.PAWN
+            and chess.square_rank(to_sq) in (0, 7)):
+        promotion_type = chess.QUEEN
+    return chess.Move(from_sq, to_sq, promotion=promotion_type)
+
+
+def position_response(board):
+    """The position part every Pi response carries"""
+    return {
+        'board_state': board_state(board),
+        'legal_moves': legal_moves_map(board),
+        'board_fen': board.fen(),
+        'game_over': board.is_game_over(),
+        'winner': winner(board),
+        'current_player': 'white' if board.turn == chess.WHITE else 'black',
+        'fallback': True
+    }
+
+
+class LocalEngineFallback:
+    """One local Stockfish that plays for whichever Pi is down"""
+
+    def __init__(self, stockfish_path=None):
+        self.stockfish_path = stockfish_path
+        self.engine = None
+        self.settings = {}          # color -> (elo, skill, use_nnue, nnue_model) from set-game-mode
+        self.moves_played = 0
+        self._configured_for = None  # color whose options the engine has now
+        self._lock = threading.Lock()
+
+    def configure(self, color, elo, skill, use_nnue=False, nnue_model='carlsen'):
+        """Remember a Pi's difficulty so a fallback engine can play it identically"""
+        with self._lock:
+            self.settings[color] = (elo, skill, use_nnue, nnue_model)
+            if self._configured_for == color:
+                self._configured_for = None
+
+    def _start(self):
+        path = self.stockfish_path or find_stockfish()
+        if path is None:
+            raise RuntimeError("Stockfish not found on this machine (set STOCKFISH_PATH)")
+        self.engine = chess.engine.SimpleEngine.popen_uci(path)
+        enable_wdl(self.engine)
+        self.stockfish_path = path
+        print(f"Fallback engine started: {self.engine.id.get('name', path)}")
+
+    def _use(self, color):
+        """Start the engine if needed and give it color's difficulty settings"""
+        if self.engine is None:
+            self._start()
+        if self._configured_for != color:
+            elo, skill, use_nnue, nnue_model = self.settings.get(color, (1350, 10, False, 'carlsen'))
+            options, _, _ = difficulty_options(elo, skill, use_nnue, nnue_model)
+            if "EvalFile" not in options and "EvalFile" in self.engine.options:
+                # The other color may have loaded a persona's network
+                options["EvalFile"] = self.engine.options["EvalFile"].default
+            self.engine.configure({name: value for name, value in options.items()
+                                   if name in self.engine.options})
+            self._configured_for = color
+
+    def engine_move(self, color, board, game_speed=10):
+        """Play color's move in board (a copy is searched); returns (response dict, HTTP status)
+
+        The response has the shape of the Pi's /api/engine-move answer.
+        """
+        board = board.copy()
+        if board.is_game_over():
+            return dict(position_response(board), status='success', engine_move=None,
+                        message='Game is over'), 200
+        try:
+            game_speed = max(1, min(20, int(game_speed)))
+        except (ValueError, TypeError):
+            game_speed = 10
+        thinking_time = min(max(0.1, 2.0 / game_speed), 5.0)
+
+        with self._lock:
+            try:
+                self._use(color)
+                search_start = time.perf_counter()
+                result = self.engine.play(board, chess.engine.Limit(time=thinking_time), info=SEARCH_INFO)
+                elapsed = time.perf_counter() - search_start
+            except (RuntimeError, OSError, chess.engine.EngineError, chess.engine.EngineTerminatedError) as e:
+                print(f"Fallback engine error: {e}")
+                self.close_engine()
+                return {'status': 'error', 'message': f'Fallback engine error: {e}'}, 500
+            self.moves_played += 1
+
+        move = result.move
+        info = search_info(result.info, board, elapsed)
+        info['budget'] = thinking_time
+        piece = board.piece_at(move.from_square)
+        engine_move = {
+            'from': chess.square_name(move.from_square),
+            'to': chess.square_name(move.to_square),
+            'piece': piece.symbol() if piece else None,
+            'promotion': chess.piece_symbol(move.promotion) if move.promotion else None,
+            'san': board.san(move),
+            'info': info
+        }
+        board.push(move)
+        print(f"Fallback engine played {engine_move['san']} for {color}")
+        return dict(position_response(board), status='success', engine_move=engine_move), 200
+
+    def close_engine(self):
+        """Quit the engine process (it is started again on the next fallback move)"""
+        engine, self.engine, self._configured_for = self.engine, None, None
+        if engine is not None:
+            try:
+                engine.quit()
+            except (chess.engine.EngineError, chess.engine.EngineTerminatedError, OSError):
+                pass
+
+    def close(self):
+        with self._lock:
+            self.close_engine()
+
+    def stats(self):
+        return {
+            'engine_running': self.engine is not None,
+            'stockfish_path': self.stockfish_path,
+            'moves_played': self.moves_played
+        }
@@ -24,6 +24,9 @@ file: /AI_Chess_Senior_Design/GUI/static/CSS/board.js
 function createChessBoard() {
     const board = document.getElementById('chessboard');
     board.innerHTML = '';
+    squareElements = [];
+    boardModel = new Array(64).fill(null);
+    pendingBoardModel = null;
 
     // Make constant variables for the files and ranks
     //
@@ -51,6 +54,9 @@ function createChessBoard() {
                 handleSquareClick(this);
             });
 
+            // Cache the element so board updates never have to query the DOM
+            //
+            squareElements.push(square);
             boardRow.appendChild(square);
         }
         board.appendChild(boardRow);
@@ -68,8 +74,8 @@ function createChessBoard() {
 //  nothing
 //
 // description:
-//  Places all chess pieces in their initial positions on the board.
-//  Uses shorthand piece codes (e.g., 'wK', 'bQ') and calls addPieceToSquare().
+//  Places all chess pieces in their initial positions on the board (and clears
+//  every other square). Uses shorthand piece codes (e.g., 'wK', 'bQ').
 //
 //------------------------------------------------------------------------------
 
@@ -88,11 +94,108 @@ function setupPieces() {
 
     // Place pieces on the board In the coorisponding positions
     //
+    const model = new Array(64).fill(null);
     for (const [position, pieceCode] of Object.entries(pieces)) {
-        const square = document.querySelector(`.square[data-position="${position}"]`);
-        if (square) {
-            addPieceToSquare(square, pieceCode);
+        model[squareIndex(position)] = pieceCode;
+    }
+    renderBoard(model);
+}
+
+//------------------------------------------------------------------------------
+//
+// function: squareIndex
+//
+// arguments:
+//  position: chess coord string (e4)
+//
+// returns:
+//  integer - index of the square in boardModel / squareElements (a8 = 0, h1 = 63)
+//
+// description:
+//  Maps a coordinate to the same row-major order createChessBoard builds the squares in.
+//
+//------------------------------------------------------------------------------
+
+function squareIndex(position) {
+    return (8 - parseInt(position[1], 10)) * 8 + (position.charCodeAt(0) - 97);
+}
+
+//------------------------------------------------------------------------------
+//
+// function: getBoardModel
+//
+// arguments:
+//  none
+//
+// returns:
+//  array - 64 piece codes (or null), the board as it will look after the next render
+//
+// description:
+//  Returns the pending board if a render is scheduled, otherwise the board on screen.
+//  Callers must copy it (slice) before changing it.
+//
+//------------------------------------------------------------------------------
+
+function getBoardModel() {
+    return pendingBoardModel || boardModel;
+}
+
+//------------------------------------------------------------------------------
+//
+// function: renderBoard
+//
+// arguments:
+//  model: array of 64 piece codes (or null) to show, indexed like boardModel
+//
+// returns:
+//  nothing
+//
+// description:
+//  Schedules the board to be redrawn as `model` on the next animation frame.
+//  Several calls before the frame only draw the last one.
+//
+//------------------------------------------------------------------------------
+
+function renderBoard(model) {
+    pendingBoardModel = model;
+    if (boardRenderFrame === null) {
+        boardRenderFrame = requestAnimationFrame(flushBoardRender);
+    }
+}
+
+//------------------------------------------------------------------------------
+//
+// function: flushBoardRender
+//
+// arguments:
+//  none
+//
+// returns:
+//  nothing
+//
+// description:
+//  Diffs the pending board against the one on screen and touches only the
+//  squares that changed: a normal move updates two squares, a capture two,
+//  castling four, instead of clearing and refilling all 64.
+//
+//------------------------------------------------------------------------------
+
+function flushBoardRender() {
+    boardRenderFrame = null;
+    const target = pendingBoardModel;
+    pendingBoardModel = null;
+    if (!target) return;
+
+    for (let index = 0; index < 64; index++) {
+        const pieceCode = target[index] || null;
+        if (pieceCode === boardModel[index]) continue;
+
+        if (pieceCode) {
+            addPieceToSquare(squareElements[index], pieceCode);
+        } else {
+            removePieceFromSquare(squareElements[index]);
         }
+        boardModel[index] = pieceCode;
     }
 }
 
@@ -155,6 +258,12 @@ function removePieceFromSquare(square) {
 
 // Handle square clicks
 function handleSquareClick(square) {
+    // Watching browsers only see the game
+    if (spectatorMode) {
+        document.getElementById('click-status').textContent = 'Watching - another browser is playing this board';
+        return;
+    }
+    
     // Check if game has started
     if (!isGameStarted()) {
         document.getElementById('click-status').textContent = 'Please select a bot and start the game first!';
@@ -214,17 +323,69 @@ function handleSquareClick(square) {
 
 // Select a piece Gets the actual Coords
 function selectPiece(square, position) {
+    // With the legal move map we can refuse pieces that cannot move without asking the Pi
+    if (legalMoves && !legalMoves[position]) {
+        document.getElementById('click-status').textContent = 
+            `No legal moves for ${getPieceNameFromCode(square.dataset.piece)} on ${position}`;
+        return;
+    }
+    
     selectedPiece = {
         element: square,
         position: position,
         pieceCode: square.dataset.piece
     };
     square.classList.add('selected');
+    highlightLegalMoves(position);
     
     document.getElementById('click-status').textContent = 
         `Selected: ${position} (${getPieceNameFromCode(square.dataset.piece)})`;
 }
 
+//------------------------------------------------------------------------------
+//
+// function: highlightLegalMoves
+//
+// arguments:
+//  position: chess coord string of the selected piece (e2)
+//
+// returns:
+//  nothing
+//
+// description:
+//  Marks every square the selected piece can legally move to (from the legal
+//  move map sent with the last board update). Does nothing if the map is unknown.
+//
+//------------------------------------------------------------------------------
+
+function highlightLegalMoves(position) {
+    clearLegalMoveHighlights();
+    if (!legalMoves || !legalMoves[position]) return;
+    
+    for (const target of legalMoves[position]) {
+        squareElements[squareIndex(target)].classList.add('valid-move');
+    }
+}
+
+//------------------------------------------------------------------------------
+//
+// function: clearLegalMoveHighlights
+//
+// arguments:
+//  none
+//
+// returns:
+//  nothing
+//
+// description:
+//  Removes the legal move highlight from every square.
+//
+//------------------------------------------------------------------------------
+
+function clearLegalMoveHighlights() {
+    squareElements.forEach(square => square.classList.remove('valid-move'));
+}
+
 //------------------------------------------------------------------------------
 //
 // function: movePiece
@@ -246,61 +407,40 @@ function movePiece(targetSquare, targetPosition) {
     const pieceCode = selectedPiece.element.dataset.piece;
     const fromPosition = selectedPiece.position;
     
+    // Reject illegal moves locally when we know the legal moves
+    if (legalMoves && !(legalMoves[fromPosition] || []).includes(targetPosition)) {
+        resetSelection();
+        
+        // Clicking another piece that can move selects it instead
+        if (targetSquare.dataset.piece && legalMoves[targetPosition]) {
+            selectPiece(targetSquare, targetPosition);
+        } else {
+            document.getElementById('click-status').textContent = 
+                `Illegal move: ${fromPosition} to ${targetPosition}`;
+        }
+        return;
+    }
+    
+    // Pawns reaching the last rank promote to a queen
+    const promotion = (pieceCode[1] === 'P' && (targetPosition[1] === '8' || targetPosition[1] === '1')) ? 'q' : null;
+    
+    // No more moves until the Pi answers with the next position
+    legalMoves = null;
+    // ...and stop waiting for the old position's analysis
+    positionAnalysisRequest++;
+    
     // Show loading state
     document.getElementById('click-status').textContent = 'Processing move...';
     
-    // Send move to backend API
-    sendMoveToBackend(pieceCode, fromPosition, targetPosition)
-        .then(response => {
-            if (response.status === 'success') {
-                // Move was accepted by the engine
-                if (response.move_accepted) {
-                    // Update the board using the Pi's board state
-                    updateBoardFromPiState(response.board_state);
-                    
-                    // Record and save
-                    recordMove(pieceCode, fromPosition, targetPosition);
-                    saveBoardState();
-
-                    document.getElementById('click-status').textContent = 
-                        `Moved ${getPieceNameFromCode(pieceCode)} from ${fromPosition} to ${targetPosition}`;
-
-                    // Update current player if provided
-                    if (response.current_player) {
-                        currentPlayer = response.current_player;
-                    }
-                    
-                    // Check if game is over
-                    if (response.game_over) {
-                        handleGameEnd(response.winner);
-                    } 
-                    // ✅ Only call engine if move_accepted is TRUE and game not over
-                    // In user_vs_cpu mode, always call engine after user move (user is white, engine is black)
-                    // In cpu_vs_cpu mode, both sides are CPU, so always call engine
-                    else if (response.move_accepted && currentGameMode === "user_vs_cpu") {
-                        // User vs CPU: User just moved, now it's engine's turn (black)
-                        setTimeout(() => {
-                            getEngineMove();
-                        }, 1000);
-                    }
-                } else {
-                    // Move was rejected - don't update the board
-                    document.getElementById('click-status').textContent = 
-                        `Invalid move: ${fromPosition} to ${targetPosition}. Try refreshing the board.`;
-                    
-                    // Offer to sync the board state
-                    setTimeout(() => {
-                        if (confirm("Board state may be out of sync. Reset the game?")) {
-                            resetGame();
-                        }
-                    }, 1000);
-                }
-            } else {
-                // Error occurred
-                document.getElementById('click-status').textContent = 
-                    `Error: ${response.message}`;
-            }
-        })
+    // Send move to backend API; in user vs CPU the engine's reply comes back on the same request
+    const pipelined = currentGameMode === "user_vs_cpu";
+    const moveRequest = pipelined
+        ? sendMoveWithReply(pieceCode, fromPosition, targetPosition, promotion,
+                            response => handleMoveResponse(response, pieceCode, fromPosition, targetPosition, true))
+        : sendMoveToBackend(pieceCode, fromPosition, targetPosition, promotion)
+            .then(response => handleMoveResponse(response, pieceCode, fromPosition, targetPosition, false));
+    
+    moveRequest
         // Move Error
         .catch(error => {
             console.error('Move error:', error);
@@ -311,6 +451,82 @@ function movePiece(targetSquare, targetPosition) {
     // Clear selection
     selectedPiece.element.classList.remove('selected');
     selectedPiece = null;
+    clearLegalMoveHighlights();
+}
+
+//------------------------------------------------------------------------------
+//
+// function: handleMoveResponse
+//
+// arguments:
+//  response: the backend's answer to the user's move
+//  pieceCode: string representing a Piece
+//  fromPosition: starting coord
+//  targetPosition: ending coord
+//  pipelined: true when the engine's reply comes with the same request
+//
+// returns:
+//  nothing
+//
+// description:
+//  Shows the user's move once the Pi accepted it, then asks for the engine's
+//  move (unless it is already on its way)
+//
+//------------------------------------------------------------------------------
+
+function handleMoveResponse(response, pieceCode, fromPosition, targetPosition, pipelined) {
+    if (response.status === 'success') {
+        // Move was accepted by the engine
+        if (response.move_accepted) {
+            // Update the board using the Pi's board state
+            updateBoardFromPiState(response.board_state, response.legal_moves);
+            
+            // Record and save
+            recordMove(pieceCode, fromPosition, targetPosition);
+            saveBoardState();
+
+            document.getElementById('click-status').textContent = 
+                `Moved ${getPieceNameFromCode(pieceCode)} from ${fromPosition} to ${targetPosition}`;
+
+            // Update current player if provided
+            if (response.current_player) {
+                currentPlayer = response.current_player;
+            }
+            
+            // Check if game is over
+            if (response.game_over) {
+                handleGameEnd(response.winner);
+            } 
+            // ✅ Only call engine if move_accepted is TRUE and game not over
+            // In user_vs_cpu mode, always call engine after user move (user is white, engine is black)
+            // In cpu_vs_cpu mode, both sides are CPU, so always call engine
+            else if (pipelined) {
+                // The engine's reply is already on its way in the same request
+                document.getElementById('click-status').textContent = 'Engine is thinking...';
+            }
+            else if (response.move_accepted && currentGameMode === "user_vs_cpu") {
+                // User vs CPU: User just moved, now it's engine's turn (black)
+                setTimeout(() => {
+                    getEngineMove();
+                }, 1000);
+            }
+        } else {
+            // Move was rejected - don't update the board
+            document.getElementById('click-status').textContent = 
+                `Invalid move: ${fromPosition} to ${targetPosition}. Try refreshing the board.`;
+            
+            // Offer to sync the board state
+            setTimeout(() => {
+                if (confirm("Board state may be out of sync. Reset the game?")) {
+                    resetGame();
+                }
+            }, 1000);
+        }
+    } else if (!watchIfSpectator(response)) {
+        // Error occurred
+        document.getElementById('click-status').textContent = 
+            `Error: ${response.message}`;
+    }
 }
 
 //------------------------------------------------------------------------------
@@ -321,6 +537,7 @@ function movePiece(targetSquare, targetPosition) {
 //  pieceCode: string representing a Piece
 //  fromPosition: starting coord
 //  toPosition: ending coord
+//  promotion: piece letter a pawn promotes to ('q'), or null
 //
 // returns:
 //  JSON representation from the backend
@@ -330,16 +547,17 @@ function movePiece(targetSquare, targetPosition) {
 //
 //------------------------------------------------------------------------------
 
-async function sendMoveToBackend(pieceCode, fromPosition, toPosition) {
+async function sendMoveToBackend(pieceCode, fromPosition, toPosition, promotion = null) {
     const moveData = {
         from: fromPosition,
         to: toPosition,
         piece: pieceCode,
+        promotion: promotion,
         move_number: moveNumber
     };
     
     try {
-        const response = await fetch('/api/move', {
+        const response = await fetch(API_BASE + '/api/move', {
             method: 'POST',
             headers: {
                 'Content-Type': 'application/json',
@@ -354,6 +572,100 @@ async function sendMoveToBackend(pieceCode, fromPosition, toPosition) {
     }
 }
 
+//------------------------------------------------------------------------------
+//
+// function: sendMoveWithReply
+//
+// arguments:
+//  pieceCode: string representing a Piece
+//  fromPosition: starting coord
+//  toPosition: ending coord
+//  promotion: piece letter a pawn promotes to ('q'), or null
+//  onAck: called with the backend's answer to the user's move
+//
+// returns:
+//  { gameEnded: true } when the engine's reply ended the game, otherwise nothing
+//
+// description:
+//  Sends the user's move with reply + stream so the engine's answer comes back
+//  on the same request: one JSON line acknowledging the move (shown right
+//  away), then one with the engine's move. A rejected move, or one that ends
+//  the game, is answered with plain JSON and no reply; while the black Pi is
+//  down the plain JSON carries the local engine's reply.
+//
+//------------------------------------------------------------------------------
+
+async function sendMoveWithReply(pieceCode, fromPosition, toPosition, promotion, onAck) {
+    const currentSpeed = gameSpeed || 10;
+    const startTime = performance.now();
+    const response = await fetch(API_BASE + '/api/move', {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+        },
+        body: JSON.stringify({
+            from: fromPosition,
+            to: toPosition,
+            piece: pieceCode,
+            promotion: promotion,
+            move_number: moveNumber,
+            reply: true,
+            stream: true,
+            game_speed: currentSpeed
+        })
+    });
+
+    if (!(response.headers.get('Content-Type') || '').includes('ndjson')) {
+        const result = await response.json();
+        onAck(result);
+        // The GUI server's local fallback engine answers in one piece, reply included
+        if (result.reply) {
+            return await handleEngineResult(result.reply, currentSpeed, performance.now() - startTime);
+        }
+        return;
+    }
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    let acknowledged = false;
+    let searchStream = null;
+    try {
+        while (true) {
+            const { value, done } = await reader.read();
+            if (done) break;
+            buffer += decoder.decode(value, { stream: true });
+
+            let newline;
+            while ((newline = buffer.indexOf('\n')) >= 0) {
+                const line = buffer.slice(0, newline).trim();
+                buffer = buffer.slice(newline + 1);
+                if (!line) continue;
+                const message = JSON.parse(line);
+
+                if (!acknowledged) {
+                    // First line: the user's move was applied
+                    acknowledged = true;
+                    onAck(message);
+                    // Watch the search live when the engine has long enough to think for it to matter
+                    if (2.0 / currentSpeed >= LIVE_SEARCH_MIN_SECONDS) {
+                        searchStream = watchEngineSearch();
+                    }
+                } else {
+                    // Second line: the engine's reply
+                    if (searchStream) {
+                        searchStream.close();
+                        searchStream = null;
+                    }
+                    return await handleEngineResult(message, currentSpeed, performance.now() - startTime);
+                }
+            }
+        }
+    } finally {
+        if (searchStream) searchStream.close();
+    }
+}
+
 //------------------------------------------------------------------------------
 //
 // function: getEngineMove
@@ -377,139 +689,313 @@ async function getEngineMove() {
         const currentSpeed = gameSpeed || 10;
         const startTime = performance.now(); // Track timing
         
-        const response = await fetch('/api/engine-move', {
-            method: 'POST',
-            headers: {
-                'Content-Type': 'application/json',
-            },
-            body: JSON.stringify({
-                game_speed: currentSpeed
-            })
-        });
+        // Watch the search live when the engine has long enough to think for it to matter
+        const searchStream = (2.0 / currentSpeed >= LIVE_SEARCH_MIN_SECONDS) ? watchEngineSearch() : null;
+        
+        let response;
+        try {
+            response = await fetch(API_BASE + '/api/engine-move', {
+                method: 'POST',
+                headers: {
+                    'Content-Type': 'application/json',
+                },
+                body: JSON.stringify({
+                    game_speed: currentSpeed
+                })
+            });
+        } finally {
+            if (searchStream) searchStream.close();
+        }
         
         const endTime = performance.now();
         const moveTime = endTime - startTime;
         
         const result = await response.json();
+        return await handleEngineResult(result, currentSpeed, moveTime);
+    // Move Error
+    } catch (error) {
+        console.error('Engine move error:', error);
+        document.getElementById('click-status').textContent = 
+            'Failed to get engine move. Please try again.';
+    }
+}
+
+//------------------------------------------------------------------------------
+//
+// function: handleEngineResult
+//
+// arguments:
+//  result: engine move response (from /api/engine-move, or the reply that
+//          came with a user move)
+//  currentSpeed: game speed the move was requested with
+//  moveTime: milliseconds the request took
+//
+// returns:
+//  { gameEnded: true } when the game ended, otherwise nothing
+//
+// description:
+//  Applies the engine's move to the board, or ends the game. Throws on an
+//  engine error so the caller can report it.
+//
+//------------------------------------------------------------------------------
+
+async function handleEngineResult(result, currentSpeed, moveTime) {
+    // If the backend reports game over (stalemate/checkmate/draw), handle it cleanly.
+    // This avoids throwing errors / freezing when there are no legal moves.
+    if (result && result.game_over) {
+        const winner = result.winner || 'draw';
+        console.log('Game over reported by engine-move endpoint. Winner:', winner);
+
+        // Stop the CPU loop immediately to prevent it from continuing
+        if (cpuMoveTimeout) {
+            clearTimeout(cpuMoveTimeout);
+            cpuMoveTimeout = null;
+        }
 
-        // If the backend reports game over (stalemate/checkmate/draw), handle it cleanly.
-        // This avoids throwing errors / freezing when there are no legal moves.
-        if (result && result.game_over) {
-            const winner = result.winner || 'draw';
-            console.log('Game over reported by engine-move endpoint. Winner:', winner);
+        // Update the board to show the final position (checkmate/stalemate) before reset
+        if (result.board_state) {
+            updateBoardFromPiState(result.board_state, result.legal_moves);
+            saveBoardState();
+        }
 
-            // Stop the CPU loop immediately to prevent it from continuing
+        // In user_vs_cpu mode, end the game immediately here.
+        if (currentGameMode === "user_vs_cpu") {
+            handleGameEnd(winner);
+            return { gameEnded: true }; // Return flag to indicate game ended
+        } else {
+            // In CPU vs CPU mode, handle game end and trigger auto-restart
+            handleGameEnd(winner, false); // false = don't pause, we're auto-restarting
+            
+            document.getElementById('click-status').textContent = 
+                `Game Over! Winner: ${winner || 'Draw'}. Score - W:${gameScore.white} B:${gameScore.black} D:${gameScore.draws}`;
+            
+            // Wait so the user can see the checkmate/stalemate position before reset
+            await new Promise(resolve => setTimeout(resolve, 3000));
+            
+            // Reset the game for next round (this will auto-restart if autorestart is enabled)
+            await resetGame();
+            return { gameEnded: true }; // Return flag to indicate game ended
+        }
+    }
+    
+    // Another browser plays this board: stop the loop and watch
+    if (watchIfSpectator(result)) {
+        return;
+    }
+    
+    // Check if we got an error - if engines aren't initialized, stop the loop
+    if (result.status === 'error') {
+        console.error('Engine move error:', result.message);
+        // If engines aren't initialized, don't keep retrying
+        if (result.message && result.message.includes('not initialized')) {
+            console.log('Engines not initialized yet - stopping CPU loop');
             if (cpuMoveTimeout) {
                 clearTimeout(cpuMoveTimeout);
                 cpuMoveTimeout = null;
             }
-
-            // Update the board to show the final position (checkmate/stalemate) before reset
-            if (result.board_state) {
-                updateBoardFromPiState(result.board_state);
-                saveBoardState();
-            }
-
-            // In user_vs_cpu mode, end the game immediately here.
-            if (currentGameMode === "user_vs_cpu") {
-                handleGameEnd(winner);
-                return { gameEnded: true }; // Return flag to indicate game ended
-            } else {
-                // In CPU vs CPU mode, handle game end and trigger auto-restart
-                handleGameEnd(winner, false); // false = don't pause, we're auto-restarting
-                
-                document.getElementById('click-status').textContent = 
-                    `Game Over! Winner: ${winner || 'Draw'}. Score - W:${gameScore.white} B:${gameScore.black} D:${gameScore.draws}`;
-                
-                // Wait so the user can see the checkmate/stalemate position before reset
-                await new Promise(resolve => setTimeout(resolve, 3000));
-                
-                // Reset the game for next round (this will auto-restart if autorestart is enabled)
-                await resetGame();
-                return { gameEnded: true }; // Return flag to indicate game ended
-            }
+            document.getElementById('click-status').textContent = 
+                'Error: Engines not ready. Please wait for game to initialize.';
+            return;
+        }
+        // For other errors, throw to be caught by the catch block
+        throw new Error(result.message);
+    }
+    
+    // Log timing information
+    const thinkingTime = (2000 / currentSpeed).toFixed(0);
+    console.log(`Move completed in ${moveTime.toFixed(0)}ms (speed: ${currentSpeed} G/sec, engine thinking: ~${thinkingTime}ms)`);
+    
+    if (result.status === 'success' && result.engine_move) {
+        // Update the board using the Pi's board state
+        if (result.board_state) {
+            updateBoardFromPiState(result.board_state, result.legal_moves);
+        } else {
+            // Fallback to individual move if no board state
+            applyEngineMove(result.engine_move);
         }
         
-        // Check if we got an error - if engines aren't initialized, stop the loop
-        if (result.status === 'error') {
-            console.error('Engine move error:', result.message);
-            // If engines aren't initialized, don't keep retrying
-            if (result.message && result.message.includes('not initialized')) {
-                console.log('Engines not initialized yet - stopping CPU loop');
+        // Record the move
+        recordMove(result.engine_move.piece, result.engine_move.from, result.engine_move.to);
+        
+        // Save board state
+        saveBoardState();
+        
+        document.getElementById('click-status').textContent = 
+            `Engine moved: ${result.engine_move.from} to ${result.engine_move.to}`;
+        showEngineInfo(result.engine_move.info);
+        
+        // Update current player from backend response
+        if (result.current_player) {
+            currentPlayer = result.current_player;
+        }
+        
+        // Check if game is over
+        if (result.game_over) {
+            // In CPU vs CPU mode, let cpuMoveLoop() handle game end and restart
+            // Only handle game end here for user_vs_cpu mode
+            if (currentGameMode === "user_vs_cpu") {
+                handleGameEnd(result.winner);
+                // Stop the CPU loop if it's running
                 if (cpuMoveTimeout) {
                     clearTimeout(cpuMoveTimeout);
                     cpuMoveTimeout = null;
                 }
+            }
+            // For CPU vs CPU, cpuMoveLoop will detect game_over via /api/board-state
+            // and handle the restart automatically
+        } else {
+            // Game is not over - continue
+            // In CPU vs CPU mode, DO NOT recursively call getEngineMove here
+            // The cpuMoveLoop() function handles the loop - calling it here causes duplicate API calls
+            // In user_vs_cpu mode, after engine move, it's user's turn again
+            if (currentGameMode === "user_vs_cpu" && !isGamePaused) {
                 document.getElementById('click-status').textContent = 
-                    'Error: Engines not ready. Please wait for game to initialize.';
-                return;
+                    'Your turn! Make your move.';
+                showPositionAnalysis();
             }
-            // For other errors, throw to be caught by the catch block
-            throw new Error(result.message);
+            // Note: cpuMoveLoop() will handle the next move in CPU vs CPU mode
         }
-        
-        // Log timing information
-        const thinkingTime = (2000 / currentSpeed).toFixed(0);
-        console.log(`Move completed in ${moveTime.toFixed(0)}ms (speed: ${currentSpeed} G/sec, engine thinking: ~${thinkingTime}ms)`);
-        
-        if (result.status === 'success' && result.engine_move) {
-            // Update the board using the Pi's board state
-            if (result.board_state) {
-                updateBoardFromPiState(result.board_state);
-            } else {
-                // Fallback to individual move if no board state
-                applyEngineMove(result.engine_move);
-            }
-            
-            // Record the move
-            recordMove(result.engine_move.piece, result.engine_move.from, result.engine_move.to);
-            
-            // Save board state
-            saveBoardState();
-            
-            document.getElementById('click-status').textContent = 
-                `Engine moved: ${result.engine_move.from} to ${result.engine_move.to}`;
-            
-            // Update current player from backend response
-            if (result.current_player) {
-                currentPlayer = result.current_player;
-            }
-            
-            // Check if game is over
-            if (result.game_over) {
-                // In CPU vs CPU mode, let cpuMoveLoop() handle game end and restart
-                // Only handle game end here for user_vs_cpu mode
-                if (currentGameMode === "user_vs_cpu") {
-                    handleGameEnd(result.winner);
-                    // Stop the CPU loop if it's running
-                    if (cpuMoveTimeout) {
-                        clearTimeout(cpuMoveTimeout);
-                        cpuMoveTimeout = null;
-                    }
-                }
-                // For CPU vs CPU, cpuMoveLoop will detect game_over via /api/board-state
-                // and handle the restart automatically
-            } else {
-                // Game is not over - continue
-                // In CPU vs CPU mode, DO NOT recursively call getEngineMove here
-                // The cpuMoveLoop() function handles the loop - calling it here causes duplicate API calls
-                // In user_vs_cpu mode, after engine move, it's user's turn again
-                if (currentGameMode === "user_vs_cpu" && !isGamePaused) {
-                    document.getElementById('click-status').textContent = 
-                        'Your turn! Make your move.';
-                }
-                // Note: cpuMoveLoop() will handle the next move in CPU vs CPU mode
+    // click error
+    } else {
+        document.getElementById('click-status').textContent = 
+            `Engine error: ${result.message}`;
+    }
+}
+
+// Shortest engine think time (seconds) worth opening a live search stream for
+const LIVE_SEARCH_MIN_SECONDS = 0.5;
+
+//------------------------------------------------------------------------------
+//
+// function: watchEngineSearch
+//
+// arguments:
+//  none
+//
+// returns:
+//  EventSource - the open stream (the caller closes it when the move arrives)
+//
+// description:
+//  Subscribes to /api/search-stream, which relays the thinking Pi's search as it
+//  deepens, and shows each update (eval, depth, principal variation) in the
+//  engine info line while the engine-move request is still running.
+//
+//------------------------------------------------------------------------------
+
+function watchEngineSearch() {
+    const stream = new EventSource(API_BASE + '/api/search-stream');
+    
+    stream.onmessage = (message) => {
+        const update = JSON.parse(message.data);
+        if (update.event === 'info') {
+            showEngineInfo(update, 'Thinking');
+        } else if (update.event === 'done' || update.event === 'error') {
+            stream.close();
+        }
+    };
+    
+    // Don't let the browser reconnect on its own; the next move opens a new stream
+    stream.onerror = () => stream.close();
+    
+    return stream;
+}
+
+//------------------------------------------------------------------------------
+//
+// function: showEngineInfo
+//
+// arguments:
+//  info: search telemetry (score/WDL from White's view), or null to hide the line
+//  label: optional text shown in front, e.g. 'Thinking' for live updates
+//
+// returns:
+//  nothing
+//
+// description:
+//  Shows the evaluation, win/draw/loss chances, depth, nodes, speed, think time
+//  and principal variation of an engine search. Hides the line when there is no info.
+//
+//------------------------------------------------------------------------------
+
+function showEngineInfo(info, label) {
+    const infoElement = document.getElementById('engine-info');
+    if (!infoElement) return;
+    if (!info) {
+        infoElement.style.display = 'none';
+        return;
+    }
+
+    const parts = [];
+    if (info.mate !== null && info.mate !== undefined) {
+        parts.push(`Eval ${info.mate > 0 ? '' : '-'}M${Math.abs(info.mate)}`);
+    } else if (info.score_cp !== null && info.score_cp !== undefined) {
+        parts.push(`Eval ${info.score_cp >= 0 ? '+' : ''}${(info.score_cp / 100).toFixed(2)}`);
+    }
+    if (info.wdl) {
+        const [wins, draws, losses] = info.wdl.map(value => (value / 10).toFixed(0));
+        parts.push(`W/D/L ${wins}/${draws}/${losses}%`);
+    }
+    if (info.depth) {
+        parts.push(`depth ${info.depth}/${info.seldepth || info.depth}`);
+    }
+    if (info.nodes) {
+        parts.push(`${(info.nodes / 1000).toFixed(0)}k nodes`);
+    }
+    if (info.nps) {
+        parts.push(`${(info.nps / 1000).toFixed(0)} knps`);
+    }
+    if (info.elapsed !== null && info.elapsed !== undefined) {
+        parts.push(`${info.elapsed.toFixed(2)}s`);
+    }
+    if (info.pv && info.pv.length) {
+        parts.push(`PV ${info.pv.join(' ')}`);
+    }
+    if (label && parts.length) {
+        parts.unshift(label);
+    }
+
+    infoElement.textContent = parts.join(' | ');
+    infoElement.style.display = parts.length ? 'inline-block' : 'none';
+}
+
+// Latest showPositionAnalysis call; an older one stops polling when a newer one starts
+let positionAnalysisRequest = 0;
+
+//------------------------------------------------------------------------------
+//
+// function: showPositionAnalysis
+//
+// arguments:
+//  none
+//
+// returns:
+//  nothing
+//
+// description:
+//  Shows the idle Pi's full-strength analysis of the current position (best
+//  line and eval) in the engine info line. The backend queues the position
+//  when it is not analysed yet, so this asks again a few times, and gives up
+//  when the position changes or no idle Pi is available.
+//
+//------------------------------------------------------------------------------
+
+async function showPositionAnalysis() {
+    const request = ++positionAnalysisRequest;
+    for (let attempt = 0; attempt < 6; attempt++) {
+        try {
+            const response = await fetch(API_BASE + '/api/analysis');
+            const result = await response.json();
+            if (request !== positionAnalysisRequest) return;
+            if (result.analysis && result.analysis.lines && result.analysis.lines.length) {
+                showEngineInfo(result.analysis.lines[0], 'Analysis');
             }
-        // click error
-        } else {
-            document.getElementById('click-status').textContent = 
-                `Engine error: ${result.message}`;
+            if (!result.pending || !result.analysis_pis || !result.analysis_pis.length) return;
+        } catch (error) {
+            console.log('Position analysis unavailable:', error);
+            return;
         }
-    // Move Error
-    } catch (error) {
-        console.error('Engine move error:', error);
-        document.getElementById('click-status').textContent = 
-            'Failed to get engine move. Please try again.';
+        await new Promise(resolve => setTimeout(resolve, 1000));
+        if (request !== positionAnalysisRequest) return;
     }
 }
 
@@ -587,33 +1073,28 @@ function updateScoreDisplay() {
 //
 // arguments:
 //  boardState: direction mapping positions to piece symbols
+//  legalMoveMap: legal moves of that position {from: [to, ...]} (optional)
 //
 // returns:
 //  nothing
 //
 // description:
-//  Updates entire board state based on the board state sent from PI
+//  Updates the board to the state sent from the Pi. Only squares whose piece
+//  changed are redrawn (see renderBoard). Keeps the legal move map that came
+//  with it for click validation and highlighting.
 //
 //------------------------------------------------------------------------------
 
-function updateBoardFromPiState(boardState) {
-    // Clear all pieces first
-    const squares = document.querySelectorAll('.square');
-    squares.forEach(square => {
-        removePieceFromSquare(square);
-    });
+function updateBoardFromPiState(boardState, legalMoveMap) {
+    legalMoves = legalMoveMap || null;
+    
+    const model = new Array(64).fill(null);
     
-    // Add pieces based on Pi's board state
+    // Convert chess library piece symbols to our piece codes
     for (const [position, pieceSymbol] of Object.entries(boardState)) {
-        const square = document.querySelector(`.square[data-position="${position}"]`);
-        if (square) {
-            // Convert chess library piece symbols to our piece codes
-            const pieceCode = convertPieceSymbolToCode(pieceSymbol);
-            if (pieceCode) {
-                addPieceToSquare(square, pieceCode);
-            }
-        }
+        model[squareIndex(position)] = convertPieceSymbolToCode(pieceSymbol);
     }
+    renderBoard(model);
 }
 
 //------------------------------------------------------------------------------
@@ -655,18 +1136,15 @@ function convertPieceSymbolToCode(pieceSymbol) {
 //------------------------------------------------------------------------------
 
 function applyEngineMove(engineMove) {
-    const fromSquare = document.querySelector(`.square[data-position="${engineMove.from}"]`);
-    const toSquare = document.querySelector(`.square[data-position="${engineMove.to}"]`);
+    legalMoves = null; // Unknown until the next full board update
     
-    if (fromSquare && toSquare) {
-        const pieceCode = fromSquare.dataset.piece;
-        
-        // Remove piece from original square
-        removePieceFromSquare(fromSquare);
-        
-        // Add piece to target square
-        addPieceToSquare(toSquare, pieceCode);
-    }
+    const model = getBoardModel().slice();
+    const fromIndex = squareIndex(engineMove.from);
+    
+    // Move the piece from its original square to the target square
+    model[squareIndex(engineMove.to)] = model[fromIndex];
+    model[fromIndex] = null;
+    renderBoard(model);
 }
 
 //------------------------------------------------------------------------------
@@ -701,9 +1179,10 @@ async function resetGame() {
 	isGamePaused = true;
         
         document.getElementById('click-status').textContent = 'Resetting game...';
+        showEngineInfo(null);
         
         // Send reset command to backend
-        const response = await fetch('/api/game-control', {
+        const response = await fetch(API_BASE + '/api/game-control', {
             method: 'POST',
             headers: {
                 'Content-Type': 'application/json',
@@ -716,10 +1195,10 @@ async function resetGame() {
         if (result.status === 'success') {
             // Reset the frontend board to starting position
             setupPieces();
+            legalMoves = result.legal_moves || null;
 	    gameMoves = [];
-	    boardHistory = [];
+	    clearBoardHistory();
 	    moveNumber = 1;
-	    currentMoveIdx = -1;
 
 	    saveBoardState();
 	    initializeMovesPanel();
@@ -752,7 +1231,7 @@ async function resetGame() {
 		resetToBotSelector();
 		document.getElementById('click-status').textContent = 'Game reset successfully! Select a bot to start a new game.';
 	    }
-        } else {
+        } else if (!watchIfSpectator(result)) {
             document.getElementById('click-status').textContent = `Reset failed: ${result.message}`;
 	    gameStarted = wasGameStarted; // Restore previous state on failure
 	    isGamePaused = false;
@@ -121,7 +121,7 @@ async function startGame() {
         document.getElementById('click-status').textContent = 'Starting game...';
         
         // Send bot selection to backend
-        const response = await fetch('/api/set-bot-difficulty', {
+        const response = await fetch(API_BASE + '/api/set-bot-difficulty', {
             method: 'POST',
             headers: {
                 'Content-Type': 'application/json',
@@ -145,7 +145,7 @@ async function startGame() {
             
             // Update the board with the Pi's board state if provided
             if (result.board_state) {
-                updateBoardFromPiState(result.board_state);
+                updateBoardFromPiState(result.board_state, result.legal_moves);
             } else {
                 // Fallback: reset the board to starting position
                 setupPieces();
@@ -271,8 +271,7 @@ function resetToBotSelector() {
     // Reset game state
     gameMoves = [];
     moveNumber = 1;
-    boardHistory = [];
-    currentMoveIndex = -1;
+    clearBoardHistory();
 
     // Disable game controls
     disableGameControls();
@@ -404,7 +403,7 @@ async function cpuMoveLoop() {
     
     // Check if game is over by checking board state
     try {
-        const boardStateResponse = await fetch('/api/board-state');
+        const boardStateResponse = await fetch(API_BASE + '/api/board-state');
 	if (!boardStateResponse.ok) {
 	    console.error("Failed to fetch board state:", boardStateResponse.status);
             // Wait and retry
@@ -470,7 +469,7 @@ async function cpuMoveLoop() {
         // Double-check board state in case getEngineMove didn't catch game_over
         // (shouldn't happen, but safety check)
         try {
-            const boardStateCheck = await fetch('/api/board-state');
+            const boardStateCheck = await fetch(API_BASE + '/api/board-state');
             if (boardStateCheck.ok) {
                 const boardState = await boardStateCheck.json();
                 if (boardState.game_over) {
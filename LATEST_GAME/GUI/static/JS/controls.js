@@ -244,6 +244,22 @@ function interruptGame() {
         updateScoreDisplay();
     }
 
+    // The server resets the Pis, archives the game and lets the board go
+    fetch(API_BASE + '/api/game-control', {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+        },
+        body: JSON.stringify({ command: 'interrupt' })
+    })
+    .then(response => response.json())
+    .then(result => {
+        if (!watchIfSpectator(result) && result.status !== 'success') {
+            console.error('Interrupt failed:', result.message);
+        }
+    })
+    .catch(error => console.error('Interrupt error:', error));
+
     const modeOverlay = document.getElementById('mode-overlay');
     if (modeOverlay) {
         modeOverlay.style.display = 'flex';
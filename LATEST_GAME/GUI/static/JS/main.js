@@ -19,7 +19,14 @@ let gameMoves = [];
 let moveNumber = 1;
 let isGamePaused = false; // Tracks if the game is Pausesd
 let currentMoveIndex = -1; // -1 means at the beginning, 0+ means at that move
-let boardHistory = []; // Store board states for navigation
+let boardHistory = []; // Square changes of each saved position: [[index, before, after], ...]
+let boardKeyframes = []; // Full 64-entry boards, one every HISTORY_KEYFRAME_INTERVAL saved positions
+let historyBoard = null; // Latest saved board (the next saveBoardState diffs against it)
+let boardModel = new Array(64).fill(null); // Piece code drawn on each square (index 0 = a8 ... 63 = h1)
+let squareElements = []; // Cached square elements, indexed like boardModel
+let pendingBoardModel = null; // Board to draw on the next animation frame
+let boardRenderFrame = null; // requestAnimationFrame id of the scheduled board render
+let legalMoves = null; // Legal moves of the current position {from: [to, ...]} from the Pi, null if unknown
 let gameSpeed = 10; // Game speed in G/sec
 let piConnected = false;
 let connectionCheckInterval = null;
@@ -29,6 +36,8 @@ let currentPlayer = "white"; // Track current player (white/black)
 let cpuMoveTimeout = null; // To track the active loop
 let interruptRequested = false; // Track if interrupt button was pressed
 let gameScore = { white: 0, black: 0, draws: 0 }; // Track game scores
+let spectatorMode = false; // Another browser plays this board; this one only watches
+let spectatorPollInterval = null; // Board-state poll while watching
 
 //------------------------------------------------------------------------------
 //
@@ -55,6 +64,9 @@ document.addEventListener('DOMContentLoaded', function() {
     
     // Initially disable game controls until bot is selected
     disableGameControls();
+    
+    // Watching browsers can take over a board whose player has gone quiet
+    document.getElementById('take-over-btn').addEventListener('click', takeOverBoard);
 
         // --- Overlay mode & difficulty flow ---
     const modeOverlay = document.getElementById('mode-overlay');
@@ -265,7 +277,7 @@ document.addEventListener('DOMContentLoaded', function() {
 
         // POST to server
         try {
-            const response = await fetch('/api/set-game-mode', {
+            const response = await fetch(API_BASE + '/api/set-game-mode', {
                 method: 'POST',
                 headers: { 'Content-Type': 'application/json' },
                 body: JSON.stringify(payload)
@@ -290,6 +302,7 @@ document.addEventListener('DOMContentLoaded', function() {
                 // Initialize game state
                 gameStarted = true;
                 currentPlayer = 'white'; // Always start with white
+                legalMoves = data.legal_moves || null;
                 
                 // Reset board to starting position
                 setupPieces();
@@ -314,7 +327,7 @@ document.addEventListener('DOMContentLoaded', function() {
                     document.getElementById('click-status').textContent = 
                         `Game started! You are White. CPU (Black) is ${chosenBlackElo} ELO. Make your move!`;
                 }
-            } else {
+            } else if (!watchIfSpectator(data)) {
                 alert('Error setting mode: ' + (data.message || 'unknown'));
                 difficultyOverlay.style.display = 'flex';
             }
@@ -355,7 +368,7 @@ document.addEventListener('DOMContentLoaded', function() {
             payload.white_elo = parseInt(document.getElementById("white-elo").value);
             payload.black_elo = parseInt(document.getElementById("black-elo").value);
             
-            fetch("/api/set-game-mode", {
+            fetch(API_BASE + "/api/set-game-mode", {
                 method: "POST",
                 headers: {"Content-Type": "application/json"},
                 body: JSON.stringify(payload)
@@ -365,7 +378,7 @@ document.addEventListener('DOMContentLoaded', function() {
                 if (data.status === "success") {
                     currentGameMode = mode;
                     startCpuVsCpuGame();
-                } else {
+                } else if (!watchIfSpectator(data)) {
                     alert("Error: " + data.message);
                 }
             })
@@ -395,7 +408,7 @@ document.addEventListener('DOMContentLoaded', function() {
 
 async function checkPiConnection() {
     try {
-        const response = await fetch('/api/pi-status');
+        const response = await fetch(API_BASE + '/api/pi-status');
         const result = await response.json();
         
         if (result.status === 'connected') {
@@ -406,10 +419,17 @@ async function checkPiConnection() {
             } else {
                 updateConnectionStatus('Connected to Raspberry Pi', 'connected');
             }
+        } else if (result.status === 'fallback') {
+            // A Pi is down; the GUI server plays its side on its own engine
+            piConnected = true;
+            updateConnectionStatus(result.message, 'fallback');
         } else {
             piConnected = false;
             updateConnectionStatus('Disconnected from Raspberry Pi', 'disconnected');
         }
+        
+        // Watch while another browser plays this board
+        updateSessionRole(result.session);
     } catch (error) {
         piConnected = false;
         updateConnectionStatus('Cannot connect to Raspberry Pi', 'disconnected');
@@ -459,7 +479,7 @@ function updateConnectionStatus(message, status) {
     const originalText = statusElement.textContent;
     
     // Add connection indicator
-    const indicator = status === 'connected' ? '🟢' : '🔴';
+    const indicator = status === 'connected' ? '🟢' : status === 'fallback' ? '🟡' : '🔴';
     statusElement.textContent = `${indicator} ${message}`;
     
     // If this was just a status check and not an error, restore original text after 2 seconds
@@ -496,6 +516,7 @@ function resetSelection() {
         selectedPiece.element.classList.remove('selected');
         selectedPiece = null;
     }
+    clearLegalMoveHighlights();
     
     if (piConnected) {
         document.getElementById('click-status').textContent = 'Click on a square to test interaction';
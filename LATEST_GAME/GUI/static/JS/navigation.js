@@ -4,6 +4,31 @@ Date: 10/08/2025
 file: /AI_Chess_Senior_Design/GUI/static/CSS/navigation.js
 */
 
+// A full board is kept every this many saved positions; the rest are stored as square changes
+const HISTORY_KEYFRAME_INTERVAL = 20;
+
+//------------------------------------------------------------------------------
+//
+// function: clearBoardHistory
+//
+// arguments:
+//  none
+//
+// returns:
+//  nothing
+//
+// description:
+//  Forgets every saved position (new game / reset).
+//
+//------------------------------------------------------------------------------
+
+function clearBoardHistory() {
+    boardHistory = [];
+    boardKeyframes = [];
+    historyBoard = null;
+    currentMoveIndex = -1;
+}
+
 //------------------------------------------------------------------------------
 //
 // function: saveBoardState
@@ -15,26 +40,62 @@ file: /AI_Chess_Senior_Design/GUI/static/CSS/navigation.js
 //  nothing
 //
 // description:
-//  Captures the current state of the chessboard by recording each square's
-//  position and piece (if present). Saves the state to the `boardHistory`
-//  array and updates the `currentMoveIndex`.
+//  Records the current board (including a render that is still pending) as the
+//  next entry of `boardHistory`. Only the squares that changed since the last
+//  saved position are stored ([index, before, after], 2-4 per move), plus a full
+//  keyframe every HISTORY_KEYFRAME_INTERVAL entries, so memory per ply stays
+//  constant. Updates `currentMoveIndex`.
 //
 //------------------------------------------------------------------------------
 
 function saveBoardState() {
-    const boardState = [];
-    const squares = document.querySelectorAll('.square');
+    const board = getBoardModel().slice();
+    const changes = [];
     
-    squares.forEach(square => {
-        const position = square.dataset.position;
-        const piece = square.dataset.piece || null;
-        boardState.push({ position, piece });
-    });
+    if (historyBoard) {
+        for (let index = 0; index < 64; index++) {
+            if (board[index] !== historyBoard[index]) {
+                changes.push([index, historyBoard[index], board[index]]);
+            }
+        }
+    }
     
-    boardHistory.push(boardState);
+    boardHistory.push(changes);
+    if ((boardHistory.length - 1) % HISTORY_KEYFRAME_INTERVAL === 0) {
+        boardKeyframes.push(board.slice());
+    }
+    historyBoard = board;
     currentMoveIndex = boardHistory.length - 1;
 }
 
+//------------------------------------------------------------------------------
+//
+// function: boardAtMove
+//
+// arguments:
+//  moveIndex: integer index into `boardHistory`
+//
+// returns:
+//  array - the 64-entry board saved at that index
+//
+// description:
+//  Rebuilds a saved position from the nearest keyframe at or before it by
+//  replaying at most HISTORY_KEYFRAME_INTERVAL - 1 sets of square changes.
+//
+//------------------------------------------------------------------------------
+
+function boardAtMove(moveIndex) {
+    const keyframe = Math.floor(moveIndex / HISTORY_KEYFRAME_INTERVAL);
+    const board = boardKeyframes[keyframe].slice();
+    
+    for (let index = keyframe * HISTORY_KEYFRAME_INTERVAL + 1; index <= moveIndex; index++) {
+        for (const [square, , after] of boardHistory[index]) {
+            board[square] = after;
+        }
+    }
+    return board;
+}
+
 //------------------------------------------------------------------------------
 //
 // function: loadBoardState
@@ -47,31 +108,31 @@ function saveBoardState() {
 //
 // description:
 //  Loads a specific board state from `boardHistory` based on `moveIndex`.
-//  Clears all current pieces from the board, restores the saved configuration,
-//  updates `currentMoveIndex`, and refreshes navigation button states.
+//  One step forward or back applies or reverts that move's square changes on
+//  the board being shown; longer jumps rebuild from a keyframe. Redraws only
+//  the squares that differ, updates `currentMoveIndex`, and refreshes
+//  navigation button states.
 //
 //------------------------------------------------------------------------------
 
 function loadBoardState(moveIndex) {
     if (moveIndex < 0 || moveIndex >= boardHistory.length) return;
     
-    const boardState = boardHistory[moveIndex];
-    
-    // Clear all pieces
-    const squares = document.querySelectorAll('.square');
-    squares.forEach(square => {
-        removePieceFromSquare(square);
-    });
-    
-    // Restore pieces
-    boardState.forEach(({ position, piece }) => {
-        if (piece) {
-            const square = document.querySelector(`.square[data-position="${position}"]`);
-            if (square) {
-                addPieceToSquare(square, piece);
-            }
+    let board;
+    if (moveIndex === currentMoveIndex + 1) {
+        board = getBoardModel().slice();
+        for (const [square, , after] of boardHistory[moveIndex]) {
+            board[square] = after;
         }
-    });
+    } else if (moveIndex === currentMoveIndex - 1) {
+        board = getBoardModel().slice();
+        for (const [square, before] of boardHistory[currentMoveIndex]) {
+            board[square] = before;
+        }
+    } else {
+        board = boardAtMove(moveIndex);
+    }
+    renderBoard(board);
     
     currentMoveIndex = moveIndex;
     updateNavigationButtons();
@@ -0,0 +1,203 @@
+/*
+Spectator JavaScript - Watching a board another browser plays
+Date: 10/08/2025
+file: /AI_Chess_Senior_Design/GUI/static/JS/spectator.js
+*/
+
+// How often a watching browser reads the board (milliseconds)
+const SPECTATOR_POLL_MS = 2000;
+
+//------------------------------------------------------------------------------
+//
+// function: watchIfSpectator
+//
+// arguments:
+//  result: the backend's JSON answer to a request that changes the game
+//
+// returns:
+//  true if the answer says another browser plays the board, otherwise false
+//
+// description:
+//  The server answers 409 with role 'spectator' when another browser is the
+//  board's player. This browser then stops playing and watches instead.
+//
+//------------------------------------------------------------------------------
+
+function watchIfSpectator(result) {
+    if (!result || result.status !== 'error' || result.role !== 'spectator') {
+        return false;
+    }
+    enterSpectatorMode(result);
+    return true;
+}
+
+//------------------------------------------------------------------------------
+//
+// function: updateSessionRole
+//
+// arguments:
+//  session: the 'session' part of /api/pi-status (role, can_take_over, ...)
+//
+// returns:
+//  nothing
+//
+// description:
+//  Watches the board while another browser plays it, and goes back to the
+//  game mode menu once the player has let the board go.
+//
+//------------------------------------------------------------------------------
+
+function updateSessionRole(session) {
+    if (!session) return;
+    if (session.role === 'spectator') {
+        enterSpectatorMode(session);
+    } else if (spectatorMode) {
+        leaveSpectatorMode();
+    }
+}
+
+//------------------------------------------------------------------------------
+//
+// function: enterSpectatorMode
+//
+// arguments:
+//  session: the server's view of this browser (role, can_take_over, ...)
+//
+// returns:
+//  nothing
+//
+// description:
+//  Stops this browser's own game (CPU loop, moves, controls), hides the menus
+//  and polls /api/board-state to show the player's game.
+//
+//------------------------------------------------------------------------------
+
+function enterSpectatorMode(session) {
+    // Stop everything that would keep asking the server to change the game
+    if (cpuMoveTimeout) {
+        clearTimeout(cpuMoveTimeout);
+        cpuMoveTimeout = null;
+    }
+    gameStarted = false;
+    resetSelection();
+    disableGameControls();
+
+    const modeOverlay = document.getElementById('mode-overlay');
+    const difficultyOverlay = document.getElementById('difficulty-overlay');
+    if (modeOverlay) modeOverlay.style.display = 'none';
+    if (difficultyOverlay) difficultyOverlay.style.display = 'none';
+
+    const takeOverBtn = document.getElementById('take-over-btn');
+    if (takeOverBtn) {
+        takeOverBtn.style.display = 'inline-block';
+        takeOverBtn.disabled = !session.can_take_over;
+        takeOverBtn.title = session.can_take_over ? '' :
+            `Possible once the player has not moved for ${session.takeover_after} seconds`;
+    }
+
+    if (!spectatorMode) {
+        spectatorMode = true;
+        console.log('Another browser plays this board - watching');
+        pollSpectatedBoard();
+        spectatorPollInterval = setInterval(pollSpectatedBoard, SPECTATOR_POLL_MS);
+    }
+}
+
+//------------------------------------------------------------------------------
+//
+// function: pollSpectatedBoard
+//
+// arguments:
+//  none
+//
+// returns:
+//  nothing
+//
+// description:
+//  Shows the position of the game being watched. No legal moves are kept,
+//  so the board cannot be played from here.
+//
+//------------------------------------------------------------------------------
+
+async function pollSpectatedBoard() {
+    try {
+        const response = await fetch(API_BASE + '/api/board-state');
+        const result = await response.json();
+        if (!spectatorMode || result.status !== 'success') return;
+
+        updateBoardFromPiState(result.board_state, null);
+        currentPlayer = result.current_player || currentPlayer;
+        currentGameMode = result.game_mode || currentGameMode;
+        document.getElementById('click-status').textContent =
+            `Watching - another browser is playing this board (${currentPlayer} to move)`;
+    } catch (error) {
+        console.error('Spectator board poll failed:', error);
+    }
+}
+
+//------------------------------------------------------------------------------
+//
+// function: leaveSpectatorMode
+//
+// arguments:
+//  none
+//
+// returns:
+//  nothing
+//
+// description:
+//  Stops watching and goes back to the game mode menu.
+//
+//------------------------------------------------------------------------------
+
+function leaveSpectatorMode() {
+    if (spectatorPollInterval) {
+        clearInterval(spectatorPollInterval);
+        spectatorPollInterval = null;
+    }
+    spectatorMode = false;
+
+    const takeOverBtn = document.getElementById('take-over-btn');
+    if (takeOverBtn) takeOverBtn.style.display = 'none';
+
+    setupPieces();
+    legalMoves = null;
+    resetToBotSelector();
+}
+
+//------------------------------------------------------------------------------
+//
+// function: takeOverBoard
+//
+// arguments:
+//  none
+//
+// returns:
+//  nothing
+//
+// description:
+//  Asks the server to make this browser the board's player, which it allows
+//  once the player has stopped changing the game (a forgotten tab).
+//
+//------------------------------------------------------------------------------
+
+async function takeOverBoard() {
+    try {
+        const response = await fetch(API_BASE + '/api/session/take-over', { method: 'POST' });
+        const result = await response.json();
+
+        if (result.status === 'success') {
+            leaveSpectatorMode();
+            document.getElementById('click-status').textContent =
+                'This browser now plays the board. Select game mode to start playing';
+        } else {
+            enterSpectatorMode(result);
+            document.getElementById('click-status').textContent = result.message;
+        }
+    } catch (error) {
+        console.error('Take over failed:', error);
+        document.getElementById('click-status').textContent = 'Failed to take over the board.';
+    }
+}
+//
+// End of file
@@ -4,6 +4,10 @@ Date: 10/08/2025
 file: /AI_Chess_Senior_Design/GUI/static/CSS/utils.js
 */
 
+// Prefix of the API routes: '' on the default board's page, '/boards/<id>' on the
+// other boards' pages (the server puts it on <body data-api-base>)
+const API_BASE = document.body.dataset.apiBase || '';
+
 //------------------------------------------------------------------------------
 //
 // function: formatTime
@@ -13,14 +13,17 @@ import chess
 import chess.engine
 import json
 import os
-from config import FLASK_HOST, FLASK_PORT, FLASK_DEBUG, ENGINE_TIMEOUT
+from config import (
+    FLASK_HOST, FLASK_PORT, FLASK_DEBUG, ENGINE_TIMEOUT,
+    ENGINE_POOL_SIZE, ENGINE_IDLE_TIMEOUT, STOCKFISH_CACHE_FILE
+)
+from chess_engine import EnginePool
 
 """ Determin the root path """
 app = Flask(__name__)
 
 # Global game state
 board = chess.Board()
-engine = None
 game_active = False
 current_player = 'white'  # 'white' for human, 'black' for engine
 
@@ -31,40 +34,16 @@ engine_black = None
 white_elo = 1350
 black_elo = 1350
 
+# Stockfish processes, reused across game modes (one per color at most)
+engine_pool = EnginePool(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), STOCKFISH_CACHE_FILE),
+    max_size=ENGINE_POOL_SIZE, idle_timeout=ENGINE_IDLE_TIMEOUT
+)
+
 def initialize_engine():
-    """Initialize the Stockfish chess engine locally"""
-    global engine
+    """Find Stockfish and start the first engine so the first game does not wait for it"""
     try:
-        # Try common Stockfish paths
-        stockfish_paths = [
-            "/usr/games/stockfish",  # Linux
-            "/usr/local/bin/stockfish",  # macOS (Homebrew)
-            "stockfish",  # If in PATH
-            "/opt/homebrew/bin/stockfish",  # macOS (Apple Silicon Homebrew)
-        ]
-        
-        # Also check if STOCKFISH_PATH environment variable is set
-        if os.getenv('STOCKFISH_PATH'):
-            stockfish_paths.insert(0, os.getenv('STOCKFISH_PATH'))
-        
-        engine = None
-        for path in stockfish_paths:
-            try:
-                engine = chess.engine.SimpleEngine.popen_uci(path)
-                print(f"Stockfish initialized from: {path}")
-                break
-            except:
-                continue
-        
-        if not engine:
-            raise Exception("Stockfish not found. Please install Stockfish or set STOCKFISH_PATH environment variable.")
-        
-        # Configure engine with default settings
-        engine.configure({
-            "Skill Level": 10,          # Range: 0 (weakest) to 20 (strongest)
-            "UCI_LimitStrength": True,  # Force it to play below max strength
-            "UCI_Elo": 1350            # Target playing strength
-        })
+        engine_pool.warm()
         print("Chess engine initialized successfully")
         return True
     except Exception as e:
@@ -75,28 +54,24 @@ def initialize_engine():
         print("  Or download from: https://stockfishchess.org/download/")
         return False
 
-def create_engine(stockfish_path = None):
+def checkout_engine(color, elo):
     """
-    Allows for the program to add another Stockfish
-    cpu vs cpu play
+    Take an engine from the pool for one side, playing at the given ELO
+    Returns None if no engine could be started
     """
-    paths = ["/usr/games/stockfish", "/usr/local/bin/stockfish", "stockfish", "/opt/homebrew/bin/stockfish"]
-
-    # insert the stockfish path to the list
-    if stockfish_path:
-        paths.insert(0, stockfish_path)
-    
-    # Also check if STOCKFISH_PATH environment variable is set
-    if os.getenv('STOCKFISH_PATH'):
-        paths.insert(0, os.getenv('STOCKFISH_PATH'))
+    try:
+        return engine_pool.checkout(color, {"UCI_LimitStrength": True, "UCI_Elo": elo})
+    except Exception as e:
+        print(f"Failed to get {color} engine: {e}")
+        return None
 
-    for p in paths:
-        try:
-            return chess.engine.SimpleEngine.popen_uci(p)
-        except:
-            continue
-    # return None if engine creation fails
-    return None
+def release_engines():
+    """Return the engines of the current game mode to the pool"""
+    global engine_white, engine_black
+    engine_pool.checkin(engine_white)
+    engine_pool.checkin(engine_black)
+    engine_white = None
+    engine_black = None
 
 @app.route('/api/set-game-mode', methods=['POST'])
 def set_game_mode():
@@ -117,27 +92,27 @@ def set_game_mode():
 
     # Reset board to starting position
     board = chess.Board()
+
+    # The previous mode's engines go back to the pool (and are usually handed out again below)
+    release_engines()
     
     # Initialize current_player based on game mode
     if mode == "user_vs_cpu":
         # User plays white, CPU plays black
         current_player = 'white'
-        engine_white = None
-        engine_black = create_engine()
+        engine_black = checkout_engine('black', black_elo)
         if engine_black is None:
             return jsonify({"status": "error", "message": "Failed to create engine"}), 500
-        engine_black.configure({"UCI_LimitStrength": True, "UCI_Elo": black_elo})
         print(f"User vs CPU mode: User=White, CPU=Black ({black_elo} ELO)")
 
     elif mode == "cpu_vs_cpu":
         # Both sides are CPU
         current_player = 'white'  # White starts
-        engine_white = create_engine()
-        engine_black = create_engine()
+        engine_white = checkout_engine('white', white_elo)
+        engine_black = checkout_engine('black', black_elo)
         if engine_white is None or engine_black is None:
+            release_engines()
             return jsonify({"status": "error", "message": "Failed to create engines"}), 500
-        engine_white.configure({"UCI_LimitStrength": True, "UCI_Elo": white_elo})
-        engine_black.configure({"UCI_LimitStrength": True, "UCI_Elo": black_elo})
         print(f"CPU vs CPU mode: White={white_elo} ELO, Black={black_elo} ELO")
 
     return jsonify({
@@ -187,6 +162,7 @@ def make_move(from_square, to_square):
 
 def get_engine_move():
     """Get the engine's move"""
+    engine = get_engine_for_turn()
     if not engine:
         print("Engine not initialized")
         return None
@@ -255,11 +231,12 @@ def check_pi_status():
     """
     # In standalone mode, if the server is running, the engine should be initialized
     # But we check anyway to be safe
-    if engine is not None:
+    if engine_pool.ready():
         return jsonify({
             'status': 'connected',
             'message': 'Standalone mode - Stockfish engine ready',
-            'engine_connected': True
+            'engine_connected': True,
+            'engine_pool': engine_pool.stats()
         })
     else:
         # This shouldn't happen if server started properly, but handle it gracefully
@@ -499,7 +476,7 @@ def set_bot_difficulty():
     
     """
     try:
-        if not engine:
+        if not engine_pool.ready():
             return jsonify({
                 'status': 'error',
                 'message': 'Engine not initialized'
@@ -527,12 +504,13 @@ def set_bot_difficulty():
         elif skill > 20:
             skill = 20
         
-        # Configure the engine with the new settings
-        engine.configure({
-            "Skill Level": skill,
-            "UCI_LimitStrength": True,
-            "UCI_Elo": elo
-        })
+        # Configure the CPU side's engine with the new settings (it keeps them until the next mode change)
+        if engine_black is not None:
+            engine_pool.configure(engine_black, {
+                "Skill Level": skill,
+                "UCI_LimitStrength": True,
+                "UCI_Elo": elo
+            })
         
         # Reset the board to starting position when setting difficulty
         global board
@@ -627,10 +605,9 @@ def handle_game_control():
 
 def cleanup():
     """Cleanup resources"""
-    global engine
-    if engine:
-        engine.quit()
-        print("Chess engine closed")
+    release_engines()
+    engine_pool.close()
+    print("Chess engines closed")
 
 """ 
 Send in:
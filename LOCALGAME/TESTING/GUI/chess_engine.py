@@ -1 +1,226 @@
-# Chess settings
\ No newline at end of file
+"""
+Stockfish Engine Pool for the Standalone Server
+file: /AI_Chess_Senior_Design/GUI/chess_engine.py
+
+app.py used to start a new Stockfish process on every game mode change and
+never quit the old ones. The pool keeps a bounded number of engine processes
+and hands them out per color:
+
+    engine = engine_pool.checkout('black', {"UCI_LimitStrength": True, "UCI_Elo": 1500})
+    ...
+    engine_pool.checkin(engine)
+
+- Stockfish is found once (stockfish_discovery.py, cached on disk) and
+  every process is started straight from that path.
+- checkout() prefers the idle engine that last played the same color, so a
+  mode switch reuses a warm process instead of spawning one.
+- Options are diffed against what the engine already has; only changed
+  options are sent, and options a previous game set but this one does not
+  ask for go back to the engine's defaults.
+- Engines idle for longer than idle_timeout are quit (one is kept warm).
+"""
+
+import threading
+import time
+
+import chess.engine
+
+from stockfish_discovery import discover_stockfish
+
+
+class PooledEngine:
+    """An engine process with the bookkeeping the pool needs"""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.options = {}       # options set through the pool (name -> value)
+        self.color = None       # color of the last checkout
+        self.in_use = False
+        self.idle_since = time.monotonic()
+
+
+class EnginePool:
+    """Bounded set of Stockfish processes checked out per color"""
+
+    def __init__(self, cache_path, max_size=2, idle_timeout=300, keep_warm=1):
+        self.cache_path = cache_path
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.keep_warm = keep_warm
+        self.engine_info = None  # path, id name and UCI options from stockfish_discovery
+        self.spawned = 0
+        self.reused = 0
+        self.evicted = 0
+        self.options_sent = 0
+        self._entries = []
+        self._by_engine = {}    # id(engine) -> PooledEngine
+        self._cond = threading.Condition()
+        self._closed = False
+        self._reaper = threading.Thread(target=self._reap, name="engine-pool-reaper", daemon=True)
+        self._reaper.start()
+
+    @property
+    def stockfish_path(self):
+        return self.engine_info['path'] if self.engine_info else None
+
+    def _spawn(self):
+        """Start a new engine process; the first call also finds Stockfish"""
+        if self.engine_info is None:
+            info, engine = discover_stockfish(self.cache_path)
+            self.engine_info = info
+            if engine is not None:
+                # The discovery handshake already started a process; keep it
+                return engine
+        try:
+            return chess.engine.SimpleEngine.popen_uci(self.engine_info['path'])
+        except (OSError, chess.engine.EngineError):
+            # The cached binary stopped working; search again once
+            info, engine = discover_stockfish(self.cache_path, refresh=True)
+            self.engine_info = info
+            return engine
+
+    def _configure(self, entry, options):
+        """Send only the options that differ from what the engine already has"""
+        known = self.engine_info['options']
+        for name in [name for name in options if name not in known]:
+            print(f"Engine pool: {self.engine_info['name']} has no option {name!r}, ignored")
+            del options[name]
+        target = {}
+        for name in set(entry.options) | set(options):
+            if name in options:
+                target[name] = options[name]
+            else:
+                # Set by an earlier checkout but not wanted now: back to the engine default
+                target[name] = known[name]['default']
+        changed = {name: value for name, value in target.items() if entry.options.get(name) != value}
+        if changed:
+            entry.engine.configure(changed)
+            self.options_sent += len(changed)
+        entry.options = {name: value for name, value in target.items() if name in options}
+
+    def _pick_idle(self, color, options):
+        """Best idle engine: same color first, then the one needing the fewest option changes"""
+        idle = [entry for entry in self._entries if not entry.in_use]
+        if not idle:
+            return None
+        return min(idle, key=lambda entry: (
+            entry.color != color,
+            sum(entry.options.get(name) != value for name, value in options.items())
+        ))
+
+    def checkout(self, color, options=None, timeout=30):
+        """Take an engine for a color and configure it; waits up to timeout if all are in use"""
+        options = dict(options or {})
+        with self._cond:
+            deadline = time.monotonic() + timeout
+            while True:
+                if self._closed:
+                    raise RuntimeError("Engine pool is closed")
+                entry = self._pick_idle(color, options)
+                if entry is not None:
+                    self.reused += 1
+                    break
+                if len(self._entries) < self.max_size:
+                    entry = None
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise RuntimeError(f"No engine available (all {self.max_size} in use)")
+                self._cond.wait(remaining)
+
+            if entry is None:
+                # Spawn while holding the lock so two checkouts cannot exceed max_size
+                entry = PooledEngine(self._spawn())
+                self._entries.append(entry)
+                self._by_engine[id(entry.engine)] = entry
+                self.spawned += 1
+            entry.in_use = True
+            entry.color = color
+
+        try:
+            self._configure(entry, options)
+        except Exception:
+            self.checkin(entry.engine, broken=True)
+            raise
+        return entry.engine
+
+    def configure(self, engine, options):
+        """Change the options of an engine that is checked out (only changed ones are sent)"""
+        with self._cond:
+            entry = self._by_engine.get(id(engine))
+        if entry is None:
+            raise ValueError("Engine does not belong to this pool")
+        self._configure(entry, dict(options))
+
+    def checkin(self, engine, broken=False):
+        """Give an engine back; a broken one is quit instead of reused"""
+        if engine is None:
+            return
+        with self._cond:
+            entry = self._by_engine.get(id(engine))
+            if entry is None:
+                return
+            if broken or self._closed:
+                self._remove(entry)
+            else:
+                entry.in_use = False
+                entry.idle_since = time.monotonic()
+            self._cond.notify_all()
+
+    def warm(self, options=None):
+        """Start one engine ahead of the first game (also checks Stockfish can be found)"""
+        self.checkin(self.checkout(None, options))
+
+    def _remove(self, entry):
+        self._entries.remove(entry)
+        del self._by_engine[id(entry.engine)]
+        try:
+            entry.engine.quit()
+        except (chess.engine.EngineError, chess.engine.EngineTerminatedError, OSError):
+            pass
+
+    def evict_idle(self):
+        """Quit engines idle longer than idle_timeout, keeping keep_warm idle ones"""
+        with self._cond:
+            now = time.monotonic()
+            idle = sorted((entry for entry in self._entries if not entry.in_use),
+                          key=lambda entry: entry.idle_since)
+            expired = [entry for entry in idle if now - entry.idle_since > self.idle_timeout]
+            for entry in expired[:max(0, len(idle) - self.keep_warm)]:
+                self._remove(entry)
+                self.evicted += 1
+                print(f"Engine pool: quit an engine idle for {now - entry.idle_since:.0f}s")
+
+    def _reap(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._closed, timeout=max(1.0, self.idle_timeout / 4))
+                if self._closed:
+                    return
+            self.evict_idle()
+
+    def ready(self):
+        """True once Stockfish has been found and started"""
+        return self.stockfish_path is not None and not self._closed
+
+    def close(self):
+        """Quit every engine process"""
+        with self._cond:
+            self._closed = True
+            for entry in list(self._entries):
+                self._remove(entry)
+            self._cond.notify_all()
+
+    def stats(self):
+        with self._cond:
+            return {
+                'stockfish_path': self.stockfish_path,
+                'engine_name': self.engine_info['name'] if self.engine_info else None,
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'in_use': sum(entry.in_use for entry in self._entries),
+                'spawned': self.spawned,
+                'reused': self.reused,
+                'evicted': self.evicted,
+                'options_sent': self.options_sent,
+            }
@@ -23,5 +23,12 @@ ENGINE_SKILL_LEVEL = 10  # Range: 0 (weakest) to 20 (strongest)
 ENGINE_ELO_RATING = 1350  # Target playing strength
 ENGINE_THINK_TIME = 2.0  # Seconds for engine to think
 
+# Stockfish location, id and options found on the first start (delete to search again)
+STOCKFISH_CACHE_FILE = "stockfish_cache.json"
+
+# Engine pool: Stockfish processes are reused across game modes
+ENGINE_POOL_SIZE = 2  # One per side in CPU vs CPU
+ENGINE_IDLE_TIMEOUT = 300  # Seconds before an unused engine is quit (one stays warm)
+
 # Game settings
 ENGINE_TIMEOUT = 15  # Seconds to wait for engine response
@@ -0,0 +1,144 @@
+"""
+Stockfish Binary Discovery
+file: /AI_Chess_Senior_Design/GUI/stockfish_discovery.py
+
+Finds the Stockfish binary without starting a process per guess:
+
+1. STOCKFISH_PATH (environment variable), if set
+2. `stockfish` on the PATH (shutil.which)
+3. The usual install locations (Linux, Homebrew on Intel and Apple Silicon)
+
+Candidates are checked with the file system only (exists and is executable).
+The first one is validated with a single UCI handshake, and the result is
+saved to a small JSON file: the path, the binary's size and modification
+time, the engine's `id name`/`id author` and its UCI options with their
+defaults and limits. On the next start the cached entry is used as long as
+the binary is unchanged, so neither the search nor the handshake happens again.
+"""
+
+import json
+import os
+import shutil
+
+import chess.engine
+
+# Checked in order after STOCKFISH_PATH and the PATH
+STOCKFISH_LOCATIONS = [
+    "/usr/games/stockfish",  # Linux
+    "/usr/local/bin/stockfish",  # macOS (Homebrew)
+    "/opt/homebrew/bin/stockfish",  # macOS (Apple Silicon Homebrew)
+]
+
+CACHE_VERSION = 1
+
+
+def is_executable(path):
+    return os.path.isfile(path) and os.access(path, os.X_OK)
+
+
+def candidate_paths():
+    """Possible Stockfish binaries, in order of preference (nothing is started)"""
+    candidates = []
+    if os.getenv('STOCKFISH_PATH'):
+        candidates.append(os.getenv('STOCKFISH_PATH'))
+    on_path = shutil.which('stockfish')
+    if on_path:
+        candidates.append(on_path)
+    candidates.extend(STOCKFISH_LOCATIONS)
+    return [os.path.abspath(path) for path in candidates]
+
+
+def binary_signature(path):
+    """Size and modification time of a binary, to notice it was upgraded or replaced"""
+    stat = os.stat(path)
+    return {'size': stat.st_size, 'mtime': stat.st_mtime}
+
+
+def describe_options(engine):
+    """The engine's UCI options as JSON-serializable dicts"""
+    return {
+        option.name: {
+            'type': option.type,
+            'default': option.default,
+            'min': option.min,
+            'max': option.max,
+            'var': list(option.var) if option.var else [],
+        }
+        for option in engine.options.values()
+    }
+
+
+def handshake(path):
+    """Start the engine once and read its id and options; returns (info, running engine)"""
+    engine = chess.engine.SimpleEngine.popen_uci(path)
+    info = {
+        'version': CACHE_VERSION,
+        'path': path,
+        'signature': binary_signature(path),
+        'name': engine.id.get('name'),
+        'author': engine.id.get('author'),
+        'options': describe_options(engine),
+    }
+    return info, engine
+
+
+def load_cache(cache_path):
+    try:
+        with open(cache_path) as f:
+            info = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return info if isinstance(info, dict) and info.get('version') == CACHE_VERSION else None
+
+
+def save_cache(cache_path, info):
+    """Write the cache atomically (a half-written file would only force a new discovery)"""
+    temp_path = f"{cache_path}.tmp"
+    try:
+        with open(temp_path, 'w') as f:
+            json.dump(info, f, indent=2)
+        os.replace(temp_path, cache_path)
+    except OSError as e:
+        print(f"Could not write Stockfish cache {cache_path}: {e}")
+
+
+def cache_is_valid(info):
+    """A cached entry is reused if its binary is unchanged and still the preferred choice"""
+    path = info.get('path')
+    if not path or not is_executable(path):
+        return False
+    if binary_signature(path) != info.get('signature'):
+        return False
+    # STOCKFISH_PATH set to something else since the cache was written
+    if os.getenv('STOCKFISH_PATH') and os.path.abspath(os.getenv('STOCKFISH_PATH')) != path:
+        return False
+    return True
+
+
+def discover_stockfish(cache_path, refresh=False):
+    """Find and describe Stockfish, using the cache when it is still valid
+
+    Returns (info, engine). engine is the process started for the handshake
+    (the caller may keep it as its first engine) or None when the info came
+    from the cache. Raises RuntimeError if no working binary is found.
+    """
+    if not refresh:
+        info = load_cache(cache_path)
+        if info is not None and cache_is_valid(info):
+            return info, None
+
+    tried = []
+    for path in candidate_paths():
+        if path in tried or not is_executable(path):
+            continue
+        tried.append(path)
+        try:
+            info, engine = handshake(path)
+        except (OSError, chess.engine.EngineError) as e:
+            print(f"Stockfish candidate {path} failed the UCI handshake: {e}")
+            continue
+        save_cache(cache_path, info)
+        print(f"Found {info['name'] or 'UCI engine'} at {path} (cached in {cache_path})")
+        return info, engine
+
+    raise RuntimeError("Stockfish not found. Please install Stockfish or set STOCKFISH_PATH environment variable.")
@@ -0,0 +1,167 @@
+"""
+Ordered Move Delivery to the Opponent PI (PI vs PI mode)
+file: /AI_Chess_Senior_Design/Board_apps/opponent_outbox.py
+
+Moves for the opponent PI go into an outbox instead of being posted inline.
+A single sender thread delivers them in order over one kept-alive HTTP
+connection and keeps retrying the oldest move (with backoff) until the
+opponent acknowledges it, so a dropped packet or a busy opponent delays the
+game instead of stalling it.
+
+Every message carries:
+    seq: outbox sequence number (counts up for the life of the server)
+    ply: half-move number of the move in the game (1 = white's first move)
+
+A retry whose first attempt did arrive is harmless: the receiver compares
+`ply` with its own board and acknowledges moves it has already played.
+"""
+
+import threading
+import time
+from collections import deque
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Connect timeout is short so a missing opponent is noticed quickly; the read
+# timeout only covers applying the move, not the opponent's engine search
+CONNECT_TIMEOUT = 3
+READ_TIMEOUT = 10
+
+# Seconds to wait before each retry of the same move (the last value repeats)
+RETRY_DELAYS = (0.1, 0.25, 0.5, 1.0, 2.0)
+
+
+def create_opponent_session():
+    """Create a requests session that keeps one connection open to the opponent"""
+    session = requests.Session()
+    # Retries are handled by the outbox, so urllib3 should not retry on its own
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=2, max_retries=0)
+    session.mount("http://", adapter)
+    session.headers.update({'Connection': 'keep-alive'})
+    return session
+
+
+class OpponentOutbox:
+    """Deliver moves to the opponent PI in order, retrying until acknowledged
+
+    on_delivered(message, seconds), if given, is called from the sender thread
+    after each acknowledged move with the time from send() to the acknowledgement.
+    """
+
+    def __init__(self, base_url, path='/api/receive-opponent-move', on_delivered=None):
+        self.url = f"{base_url}{path}"
+        self.on_delivered = on_delivered
+        self.session = create_opponent_session()
+        self.seq = 0
+        self.queued = 0
+        self.delivered = 0
+        self.retries = 0
+        self.rejected = 0
+        self.dropped = 0
+        self.last_error = None
+        self.last_delivery_time = None
+        self.total_delivery_time = 0.0
+        self._cond = threading.Condition()
+        self._queue = deque()   # (message, time queued)
+        self._generation = 0    # bumped by clear() so an in-flight retry loop gives up
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="opponent-outbox", daemon=True)
+        self._thread.start()
+
+    def send(self, move_data, ply):
+        """Queue a move for the opponent; returns its sequence number"""
+        with self._cond:
+            self.seq += 1
+            message = dict(move_data, seq=self.seq, ply=ply)
+            self._queue.append((message, time.perf_counter()))
+            self.queued += 1
+            self._cond.notify_all()
+            return self.seq
+
+    def clear(self):
+        """Forget undelivered moves (new game)"""
+        with self._cond:
+            self.dropped += len(self._queue)
+            self._queue.clear()
+            self._generation += 1
+            self._cond.notify_all()
+
+    def close(self, timeout=1.0):
+        """Stop the sender thread and close the connection"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+        self.session.close()
+
+    def _post(self, message):
+        """Send one message; returns (acknowledged, worth retrying, error text)"""
+        try:
+            response = self.session.post(self.url, json=message,
+                                         timeout=(CONNECT_TIMEOUT, READ_TIMEOUT))
+        except requests.exceptions.RequestException as e:
+            return False, True, str(e)
+        if response.status_code == 200:
+            return True, False, None
+        error = f"HTTP {response.status_code}: {response.text[:200]}"
+        # 5xx means the opponent could not process it right now; 4xx will not change on retry
+        return False, response.status_code >= 500, error
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._queue or self._closed)
+                if self._closed:
+                    return
+                message, queued_at = self._queue[0]
+                generation = self._generation
+
+            attempt = 0
+            delivery_time = None
+            while True:
+                acknowledged, retry, error = self._post(message)
+                with self._cond:
+                    if self._closed or generation != self._generation:
+                        break
+                    if acknowledged:
+                        self._queue.popleft()
+                        self.delivered += 1
+                        delivery_time = time.perf_counter() - queued_at
+                        self.last_delivery_time = delivery_time
+                        self.total_delivery_time += delivery_time
+                        if attempt:
+                            print(f"Move {message['seq']} (ply {message['ply']}) delivered after {attempt} retries")
+                        break
+                    self.last_error = error
+                    if not retry:
+                        self._queue.popleft()
+                        self.rejected += 1
+                        print(f"Opponent rejected move {message['seq']} (ply {message['ply']}): {error}")
+                        break
+                    self.retries += 1
+                    delay = RETRY_DELAYS[min(attempt, len(RETRY_DELAYS) - 1)]
+                    attempt += 1
+                    print(f"Sending move {message['seq']} (ply {message['ply']}) failed, retry {attempt} in {delay}s: {error}")
+                    self._cond.wait_for(lambda: self._closed or generation != self._generation,
+                                        timeout=delay)
+
+            if delivery_time is not None and self.on_delivered:
+                self.on_delivered(message, delivery_time)
+
+    def stats(self):
+        """Counters for the status endpoint"""
+        with self._cond:
+            return {
+                'queued': self.queued,
+                'delivered': self.delivered,
+                'pending': len(self._queue),
+                'retries': self.retries,
+                'rejected': self.rejected,
+                'dropped': self.dropped,
+                'last_error': self.last_error,
+                'last_delivery_ms': round(self.last_delivery_time * 1000, 1)
+                                    if self.last_delivery_time is not None else None,
+                'avg_delivery_ms': round(self.total_delivery_time * 1000 / self.delivered, 1)
+                                   if self.delivered else None,
+            }
@@ -11,9 +11,10 @@ import chess.engine
 from flask import Flask, request, jsonify
 import json
 import threading
+import queue
 import time
-import requests
 import os
+from opponent_outbox import OpponentOutbox
 
 app = Flask(__name__)
 
@@ -31,6 +32,7 @@ current_player = 'white'  # 'white' for human, 'black' for engine
 PI_COLOR_CONFIG = None
 OPPONENT_IP_CONFIG = None
 OPPONENT_PORT_CONFIG = None
+THINK_TIME_CONFIG = None
 
 try:
     # Try to import config if it exists in the same directory
@@ -44,6 +46,7 @@ try:
         PI_COLOR_CONFIG = getattr(pi_config, 'PI_COLOR', None)
         OPPONENT_IP_CONFIG = getattr(pi_config, 'OPPONENT_IP', None)
         OPPONENT_PORT_CONFIG = getattr(pi_config, 'OPPONENT_PORT', None)
+        THINK_TIME_CONFIG = getattr(pi_config, 'THINK_TIME', None)
         print(f"Loaded PI vs PI config from pi_config.py")
 except Exception as e:
     print(f"Could not load pi_config.py: {e}")
@@ -55,9 +58,37 @@ OPPONENT_PORT = int(os.environ.get('OPPONENT_PORT', OPPONENT_PORT_CONFIG or '500
 OPPONENT_BASE_URL = f"http://{OPPONENT_IP}:{OPPONENT_PORT}" if OPPONENT_IP else None
 PI_VS_PI_MODE = OPPONENT_IP is not None
 
+# Seconds the engine thinks per move (can be changed at runtime through /api/engine-config)
+engine_think_time = float(os.environ.get('THINK_TIME', THINK_TIME_CONFIG or 2.0))
+
+# Where each auto-played ply spends its time (seconds):
+#   queue_delay: turn event queued -> move worker starts searching
+#   search:      engine search
+#   send:        move queued for the opponent -> opponent acknowledged it
+move_timing = {name: {'count': 0, 'total': 0.0, 'last': None, 'max': 0.0}
+               for name in ('queue_delay', 'search', 'send')}
+timing_lock = threading.Lock()
+
+# Moves for the opponent go through an ordered, retrying outbox on one kept-alive connection
+opponent_outbox = OpponentOutbox(
+    OPPONENT_BASE_URL,
+    on_delivered=lambda message, seconds: record_timing('send', seconds)
+) if PI_VS_PI_MODE else None
+
+# Turn events for the move worker ("it may be my turn now"), each is the time it was queued
+turn_events = queue.Queue()
+
+# Opponent moves that arrived again after they were already applied (retries)
+duplicate_moves_received = 0
+
 # Move processing lock to prevent race conditions
 move_lock = threading.Lock()
 
+# One command at a time on the engine: a search runs without move_lock, and
+# python-chess would cancel it if a configure or another search came in.
+# Always taken after move_lock, never the other way round
+engine_lock = threading.Lock()
+
 def initialize_engine():
     """Initialize the Stockfish chess engine"""
     global engine
@@ -85,7 +116,14 @@ def get_board_state():
             board_state[square_name] = piece_symbol
     return board_state
 
-def is_valid_move(from_square, to_square, piece_code):
+def build_move(from_square, to_square, promotion=None):
+    """Create a move object from square names and an optional promotion piece ('q', 'r', 'b', 'n')"""
+    from_sq = chess.parse_square(from_square)
+    to_sq = chess.parse_square(to_square)
+    promotion_piece = chess.PIECE_SYMBOLS.index(promotion.lower()) if promotion else None
+    return chess.Move(from_sq, to_sq, promotion=promotion_piece)
+
+def is_valid_move(from_square, to_square, piece_code, promotion=None):
     """Validate if a move is legal"""
     try:
         print(f"Validating move: {from_square} to {to_square}")
@@ -97,7 +135,7 @@ def is_valid_move(from_square, to_square, piece_code):
         print(f"Parsed squares: {from_sq} to {to_sq}")
         
         # Create move object
-        move = chess.Move(from_sq, to_sq)
+        move = build_move(from_square, to_square, promotion)
         
         print(f"Created move object: {move}")
         print(f"Move in legal moves: {move in board.legal_moves}")
@@ -108,12 +146,10 @@ def is_valid_move(from_square, to_square, piece_code):
         print(f"Move validation error: {e}")
         return False
 
-def make_move(from_square, to_square):
+def make_move(from_square, to_square, promotion=None):
     """Make a move on the board"""
     try:
-        from_sq = chess.parse_square(from_square)
-        to_sq = chess.parse_square(to_square)
-        move = chess.Move(from_sq, to_sq)
+        move = build_move(from_square, to_square, promotion)
         
         if move in board.legal_moves:
             board.push(move)
@@ -122,6 +158,42 @@ def make_move(from_square, to_square):
     except:
         return False
 
+def search_engine_move(position, think_time):
+    """Ask the engine for a move in `position` (the board is not changed); returns the move or None"""
+    with engine_lock:
+        result = engine.play(position, chess.engine.Limit(time=think_time))
+    move = result.move
+    
+    print(f"Engine suggested move: {move}")
+    
+    # Validate the move before making it
+    if move not in position.legal_moves:
+        print(f"Engine tried illegal move: {move}")
+        return None
+    return move
+
+def apply_engine_move(move):
+    """Play an engine move on the board and return the move information"""
+    global current_player
+    
+    # Compute piece and SAN before pushing
+    piece = board.piece_at(move.from_square).symbol() if board.piece_at(move.from_square) else None
+    san_notation = board.san(move)
+    
+    # Make the move
+    board.push(move)
+    current_player = 'black' if current_player == 'white' else 'white'
+    print(f"Engine move applied: {move}")
+    
+    # Return move information
+    return {
+        'from': chess.square_name(move.from_square),
+        'to': chess.square_name(move.to_square),
+        'piece': piece,
+        'promotion': chess.piece_symbol(move.promotion) if move.promotion else None,
+        'san': san_notation
+    }
+
 def get_engine_move():
     """Get the engine's move"""
     if not engine:
@@ -134,62 +206,51 @@ def get_engine_move():
     
     try:
         print(f"Getting engine move. Board FEN: {board.fen()}")
-        print(f"Legal moves: {[board.san(move) for move in board.legal_moves]}")
-        
-        # Give engine 2 seconds to think
-        result = engine.play(board, chess.engine.Limit(time=2.0))
-        move = result.move
+        print(f"Legal moves: {board.legal_moves.count()}")
         
-        print(f"Engine suggested move: {move}")
-        
-        # Validate the move before making it
-        if move not in board.legal_moves:
-            print(f"Engine tried illegal move: {move}")
+        move = search_engine_move(board, engine_think_time)
+        if move is None:
             return None
-        
-        # Compute piece and SAN before pushing
-        piece = board.piece_at(move.from_square).symbol() if board.piece_at(move.from_square) else None
-        san_notation = board.san(move)
-        
-        # Make the move
-        board.push(move)
-        global current_player
-        current_player = 'black' if current_player == 'white' else 'white'
-        print(f"Engine move applied: {move}")
-        
-        # Return move information
-        return {
-            'from': chess.square_name(move.from_square),
-            'to': chess.square_name(move.to_square),
-            'piece': piece,
-            'san': san_notation
-        }
+        return apply_engine_move(move)
     except Exception as e:
         print(f"Engine move error: {e}")
         return None
 
+def record_timing(name, seconds):
+    """Add one measurement to the move_timing counters"""
+    with timing_lock:
+        timing = move_timing[name]
+        timing['count'] += 1
+        timing['total'] += seconds
+        timing['last'] = seconds
+        timing['max'] = max(timing['max'], seconds)
+
+def timing_stats():
+    """move_timing in milliseconds for the status endpoint"""
+    with timing_lock:
+        return {
+            name: {
+                'count': timing['count'],
+                'last_ms': round(timing['last'] * 1000, 1) if timing['last'] is not None else None,
+                'avg_ms': round(timing['total'] * 1000 / timing['count'], 1) if timing['count'] else None,
+                'max_ms': round(timing['max'] * 1000, 1)
+            }
+            for name, timing in move_timing.items()
+        }
+
 def send_move_to_opponent(move_data):
-    """Send a move to the opponent PI in PI vs PI mode"""
-    if not PI_VS_PI_MODE or not OPPONENT_BASE_URL:
+    """Queue a move for the opponent PI in PI vs PI mode
+
+    The move is tagged with its ply (the move just played on this board) and
+    delivered in the background; the outbox retries until the opponent
+    acknowledges it.
+    """
+    if not PI_VS_PI_MODE or not opponent_outbox:
         return False
     
-    try:
-        print(f"Sending move to opponent PI at {OPPONENT_BASE_URL}/api/receive-opponent-move")
-        response = requests.post(
-            f"{OPPONENT_BASE_URL}/api/receive-opponent-move",
-            json=move_data,
-            timeout=10
-        )
-        
-        if response.status_code == 200:
-            print(f"Move successfully sent to opponent PI")
-            return True
-        else:
-            print(f"Failed to send move to opponent: {response.status_code}")
-            return False
-    except Exception as e:
-        print(f"Error sending move to opponent PI: {e}")
-        return False
+    seq = opponent_outbox.send(move_data, ply=board.ply())
+    print(f"Queued move {seq} (ply {board.ply()}) for opponent PI at {OPPONENT_BASE_URL}")
+    return True
 
 def is_my_turn():
     """Check if it's this PI's turn to move"""
@@ -200,36 +261,82 @@ def is_my_turn():
     is_white_turn = board.turn  # True if white to move, False if black to move
     return (PI_COLOR == 'white' and is_white_turn) or (PI_COLOR == 'black' and not is_white_turn)
 
-def auto_make_move():
-    """Automatically make a move if it's this PI's turn (for PI vs PI mode)"""
-    if not PI_VS_PI_MODE or not is_my_turn():
+def request_auto_move():
+    """Tell the move worker it may be this PI's turn (PI vs PI mode)"""
+    if PI_VS_PI_MODE:
+        turn_events.put(time.perf_counter())
+
+def auto_make_move(requested_at=None):
+    """Make this PI's move if it's its turn (PI vs PI mode, runs on the move worker)
+
+    The engine searches a copy of the board without holding move_lock, so
+    opponent moves, retries and status requests are never stuck behind a
+    search. The move is only played if the board did not change meanwhile.
+    """
+    if not PI_VS_PI_MODE or not engine:
         return
     
-    if board.is_game_over():
-        print("Game is over, cannot make move")
+    with move_lock:
+        if not is_my_turn():
+            return
+        if board.is_game_over():
+            print("Game is over, cannot make move")
+            return
+        position = board.copy()
+    
+    started = time.perf_counter()
+    if requested_at is not None:
+        record_timing('queue_delay', started - requested_at)
+    
+    print(f"PI {PI_COLOR}: It's my turn, making engine move...")
+    try:
+        move = search_engine_move(position, engine_think_time)
+    except Exception as e:
+        print(f"Engine move error: {e}")
+        move = None
+    record_timing('search', time.perf_counter() - started)
+    
+    if move is None:
+        print(f"PI {PI_COLOR}: Failed to get engine move")
         return
     
     with move_lock:
-        # Double-check it's still our turn after acquiring lock
-        if not is_my_turn():
+        # A reset or resync while the engine was thinking makes this move stale
+        if board.move_stack != position.move_stack:
+            print(f"PI {PI_COLOR}: Board changed during search, discarding {move}")
             return
         
-        print(f"PI {PI_COLOR}: It's my turn, making engine move...")
-        engine_move = get_engine_move()
-        
-        if engine_move:
-            # Send move to opponent PI
-            move_data = {
-                'from': engine_move['from'],
-                'to': engine_move['to'],
-                'piece': engine_move['piece'],
-                'san': engine_move['san'],
-                'board_state': get_board_state()
-            }
-            send_move_to_opponent(move_data)
-            print(f"PI {PI_COLOR}: Move made and sent to opponent")
-        else:
-            print(f"PI {PI_COLOR}: Failed to get engine move")
+        engine_move = apply_engine_move(move)
+        
+        # Send move to opponent PI
+        move_data = {
+            'from': engine_move['from'],
+            'to': engine_move['to'],
+            'piece': engine_move['piece'],
+            'promotion': engine_move['promotion'],
+            'san': engine_move['san'],
+            'board_state': get_board_state()
+        }
+        send_move_to_opponent(move_data)
+    print(f"PI {PI_COLOR}: Move made and sent to opponent")
+
+def move_worker():
+    """The single long-lived thread that plays this PI's moves in PI vs PI mode"""
+    while True:
+        requested_at = turn_events.get()
+        # Events that piled up during a search are all answered by one look at the board
+        while True:
+            try:
+                turn_events.get_nowait()
+            except queue.Empty:
+                break
+        try:
+            auto_make_move(requested_at)
+        except Exception as e:
+            print(f"PI {PI_COLOR}: Move worker error: {e}")
+
+if PI_VS_PI_MODE:
+    threading.Thread(target=move_worker, name="move-worker", daemon=True).start()
 
 @app.route('/api/status', methods=['GET'])
 def status():
@@ -243,7 +350,13 @@ def status():
         'pi_vs_pi_mode': PI_VS_PI_MODE,
         'pi_color': PI_COLOR,
         'opponent_ip': OPPONENT_IP,
-        'is_my_turn': is_my_turn() if PI_VS_PI_MODE else None
+        'is_my_turn': is_my_turn() if PI_VS_PI_MODE else None,
+        'ply': board.ply(),
+        'outbox': opponent_outbox.stats() if opponent_outbox else None,
+        'duplicate_moves_received': duplicate_moves_received,
+        'think_time': engine_think_time,
+        'turn_events_pending': turn_events.qsize(),
+        'move_timing': timing_stats() if PI_VS_PI_MODE else None
     })
 
 @app.route('/api/debug', methods=['GET'])
@@ -384,6 +497,7 @@ def handle_engine_move():
                         'from': engine_move['from'],
                         'to': engine_move['to'],
                         'piece': engine_move['piece'],
+                        'promotion': engine_move['promotion'],
                         'san': engine_move['san'],
                         'board_state': get_board_state()
                     }
@@ -404,7 +518,13 @@ def handle_engine_move():
 
 @app.route('/api/receive-opponent-move', methods=['POST'])
 def receive_opponent_move():
-    """Receive a move from the opponent PI in PI vs PI mode"""
+    """Receive a move from the opponent PI in PI vs PI mode
+
+    Moves carry the ply they were played at. A ply this board has already
+    played is acknowledged again without being applied (the sender retried
+    after a lost response); a ply from the future means a move went missing.
+    """
+    global duplicate_moves_received
     try:
         if not PI_VS_PI_MODE:
             return jsonify({
@@ -415,8 +535,10 @@ def receive_opponent_move():
         data = request.get_json()
         from_square = data.get('from')
         to_square = data.get('to')
+        promotion = data.get('promotion')
+        ply = data.get('ply')
         
-        print(f"PI {PI_COLOR}: Received move from opponent: {from_square} to {to_square}")
+        print(f"PI {PI_COLOR}: Received move {data.get('seq')} (ply {ply}) from opponent: {from_square} to {to_square}")
         
         if not from_square or not to_square:
             return jsonify({
@@ -425,8 +547,36 @@ def receive_opponent_move():
             }), 400
         
         with move_lock:
+            # A ply we already played is a retry of a move whose acknowledgement was lost
+            if ply is not None and ply <= board.ply():
+                if ply < 1 or board.move_stack[ply - 1] != build_move(from_square, to_square, promotion):
+                    print(f"PI {PI_COLOR}: Move for ply {ply} does not match this board")
+                    return jsonify({
+                        'status': 'error',
+                        'message': f'Ply {ply} was a different move on this board',
+                        'expected_ply': board.ply() + 1
+                    }), 409
+                duplicate_moves_received += 1
+                print(f"PI {PI_COLOR}: Ply {ply} already applied, acknowledging duplicate")
+                return jsonify({
+                    'status': 'success',
+                    'move_accepted': True,
+                    'duplicate': True,
+                    'board_state': get_board_state(),
+                    'game_over': board.is_game_over(),
+                    'winner': None
+                })
+            
+            if ply is not None and ply != board.ply() + 1:
+                print(f"PI {PI_COLOR}: Expected ply {board.ply() + 1}, received ply {ply}")
+                return jsonify({
+                    'status': 'error',
+                    'message': f'Out of order move: expected ply {board.ply() + 1}, got {ply}',
+                    'expected_ply': board.ply() + 1
+                }), 409
+            
             # Validate the move
-            if not is_valid_move(from_square, to_square, None):
+            if not is_valid_move(from_square, to_square, None, promotion):
                 print(f"PI {PI_COLOR}: Invalid move received from opponent")
                 return jsonify({
                     'status': 'error',
@@ -434,7 +584,7 @@ def receive_opponent_move():
                 }), 400
             
             # Make the move
-            if make_move(from_square, to_square):
+            if make_move(from_square, to_square, promotion):
                 # Check if game is over
                 game_over = board.is_game_over()
                 winner = None
@@ -453,8 +603,8 @@ def receive_opponent_move():
                 # If it's now our turn and game is not over, make our move
                 if not game_over and is_my_turn():
                     print(f"PI {PI_COLOR}: It's now my turn, making move...")
-                    # Schedule our move in a separate thread
-                    threading.Thread(target=auto_make_move, daemon=True).start()
+                    # Hand the turn to the move worker
+                    request_auto_move()
                 
                 return jsonify({
                     'status': 'success',
@@ -503,6 +653,8 @@ def sync_board():
         # Reset the board to starting position
         global board
         board = chess.Board()
+        if opponent_outbox:
+            opponent_outbox.clear()
         
         # Apply moves one by one to reconstruct the board state
         # This is a simple approach - in a real implementation you'd want to track moves
@@ -543,11 +695,14 @@ def game_control():
             with move_lock:
                 board = chess.Board()
                 current_player = 'white'
+                # Moves still waiting for delivery belong to the old game
+                if opponent_outbox:
+                    opponent_outbox.clear()
                 
                 # In PI vs PI mode, if we're white, we start the game
                 if PI_VS_PI_MODE and PI_COLOR == 'white':
-                    # Schedule first move in a separate thread
-                    threading.Thread(target=auto_make_move, daemon=True).start()
+                    # Hand the first move to the move worker
+                    request_auto_move()
                 
                 return jsonify({
                     'status': 'success',
@@ -566,7 +721,7 @@ def game_control():
             game_active = True
             # In PI vs PI mode, if it's our turn, make a move
             if PI_VS_PI_MODE and is_my_turn():
-                threading.Thread(target=auto_make_move, daemon=True).start()
+                request_auto_move()
             return jsonify({
                 'status': 'success',
                 'message': 'Game resumed'
@@ -610,16 +765,19 @@ def set_bot_difficulty():
         elif skill > 20:
             skill = 20
         
-        # Configure the engine with the new settings
-        engine.configure({
-            "Skill Level": skill,
-            "UCI_LimitStrength": True,
-            "UCI_Elo": elo
-        })
+        # Configure the engine with the new settings (after any search in progress)
+        with engine_lock:
+            engine.configure({
+                "Skill Level": skill,
+                "UCI_LimitStrength": True,
+                "UCI_Elo": elo
+            })
         
         # Reset the board to starting position when setting difficulty
         global board
         board = chess.Board()
+        if opponent_outbox:
+            opponent_outbox.clear()
         
         print(f"Bot difficulty set: ELO {elo}, Skill Level {skill}")
         print(f"Board reset to starting position")
@@ -653,15 +811,23 @@ def configure_engine():
         skill_level = data.get('skill_level', 10)
         elo_rating = data.get('elo_rating', 1350)
         
-        engine.configure({
-            "Skill Level": skill_level,
-            "UCI_LimitStrength": True,
-            "UCI_Elo": elo_rating
-        })
+        # Optional time budget per move; used from the next search on
+        global engine_think_time
+        think_time = max(0.05, float(data['think_time'])) if data.get('think_time') is not None else None
+        
+        with engine_lock:
+            engine.configure({
+                "Skill Level": skill_level,
+                "UCI_LimitStrength": True,
+                "UCI_Elo": elo_rating
+            })
+            if think_time is not None:
+                engine_think_time = think_time
         
         return jsonify({
             'status': 'success',
-            'message': f'Engine configured: Skill Level {skill_level}, ELO {elo_rating}'
+            'message': f'Engine configured: Skill Level {skill_level}, ELO {elo_rating}, think time {engine_think_time}s',
+            'think_time': engine_think_time
         })
         
     except Exception as e:
@@ -673,6 +839,8 @@ def configure_engine():
 def cleanup():
     """Cleanup resources"""
     global engine
+    if opponent_outbox:
+        opponent_outbox.close()
     if engine:
         engine.quit()
         print("Chess engine closed")
@@ -685,6 +853,7 @@ if __name__ == '__main__':
         print(f"PI vs PI Mode: ENABLED")
         print(f"This PI plays: {PI_COLOR.upper()}")
         print(f"Opponent PI: {OPPONENT_IP}:{OPPONENT_PORT}")
+        print(f"Think time: {engine_think_time}s per move")
     else:
         print("PI vs PI Mode: DISABLED (User vs PI mode)")
     
@@ -695,11 +864,7 @@ if __name__ == '__main__':
         # In PI vs PI mode, if we're white, start the game after a short delay
         if PI_VS_PI_MODE and PI_COLOR == 'white':
             print(f"PI {PI_COLOR.upper()}: Will make first move in 2 seconds...")
-            def start_game():
-                time.sleep(2)
-                if not board.is_game_over():
-                    auto_make_move()
-            threading.Thread(target=start_game, daemon=True).start()
+            threading.Timer(2.0, request_auto_move).start()
         
         try:
             app.run(host='0.0.0.0', port=5002, debug=False)
@@ -5,5 +5,6 @@
 PI_COLOR = 'black'
 OPPONENT_IP = '192.168.10.2'
 OPPONENT_PORT = 5002
+THINK_TIME = 2.0  # Seconds the engine thinks per move
 
 
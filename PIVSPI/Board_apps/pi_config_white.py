@@ -5,5 +5,6 @@
 PI_COLOR = 'white'
 OPPONENT_IP = '192.168.10.3'
 OPPONENT_PORT = 5002
+THINK_TIME = 2.0  # Seconds the engine thinks per move
 
 
@@ -1,5 +1,3 @@
-import board
-import neopixel
 import time
 import math
 from random import randint
@@ -11,21 +9,28 @@ BLUE = (0,0,255, 0)
 GREY = (0,0,0, 120)
 ORANGE = (139, 64, 0, 0)
 
-pixel_pin = board.D18
+pixel_pin = 'D18'
 
 # The number of NeoPixels
 num_pixels = 16
 
 # The order of the pixel colors - RGB or GRB. Some NeoPixels have red and green reversed!
 # For RGBW NeoPixels, simply change the ORDER to RGBW or GRBW.
-ORDER = neopixel.GRBW
+ORDER = 'GRBW'
 
 class RingLed:
-    def __init__(self, pixel_pin, num_pixels, ORDER):
+    def __init__(self, pixel_pin=pixel_pin, num_pixels=num_pixels, ORDER=ORDER, pixels=None, sleep=time.sleep):
         self.pixel_pin = pixel_pin
         self.num_pixels = num_pixels
         self.ORDER = ORDER
-        self.pixels = neopixel.NeoPixel(self.pixel_pin, self.num_pixels, brightness=0.3, auto_write=False, pixel_order=self.ORDER)
+        # pixels: any NeoPixel-compatible buffer (e.g. FramebufferPixels from
+        # LATEST_GAME/Board_apps/display_backends.py); defaults to the real ring
+        if pixels is None:
+            import board
+            import neopixel
+            pixels = neopixel.NeoPixel(getattr(board, self.pixel_pin), self.num_pixels, brightness=0.3, auto_write=False, pixel_order=self.ORDER)
+        self.pixels = pixels
+        self.sleep = sleep
 
     def _norm(self, num):
         return (num / 255.0) * 0.2
@@ -36,11 +41,11 @@ class RingLed:
         original_brightness = self.pixels.brightness
         start_time = time.time()
         while time.time() - start_time < duration:
-            for head in range(num_pixels):
+            for head in range(self.num_pixels):
                 self.pixels.fill((0, 0, 0))
 
                 for t in range(trail_length):
-                    index = (head - t) % num_pixels
+                    index = (head - t) % self.num_pixels
                     # Fade brightness for trailing pixels
                     brightness = int(max_brightness * (1 - t / trail_length))
                     fade = 1 - (t / trail_length)  # 1.0 → 0.0
@@ -50,7 +55,7 @@ class RingLed:
                         #self.pixels[index] = (255,165,0)
                         self.pixels[index] = tuple(int(c * fade) for c in color)
                 self.pixels.show()
-                time.sleep(delay)
+                self.sleep(delay)
         self.pixels.brightness = original_brightness  # RESTORE
 
 
@@ -71,7 +76,7 @@ class RingLed:
                 self.pixels.fill(fill_color)
                 self.pixels.brightness = (float(self._norm(green)))
                 self.pixels.show()
-                time.sleep(delay)
+                self.sleep(delay)
 
             for i in range(max_brightness, min_brightness, -1):
                 green = int((i/max_brightness) * max_brightness)
@@ -85,7 +90,7 @@ class RingLed:
                 self.pixels.fill(fill_color)
                 self.pixels.brightness = (float(self._norm(green)))
                 self.pixels.show()
-                time.sleep(delay)
+                self.sleep(delay)
         self.pixels.brightness = original_brightness  # RESTORE
 
     def _breath(self, delay = 0.0001, duration = 3, steps = 1000, min_brightness = 1, max_brightness = 255, color = None ):
@@ -94,7 +99,7 @@ class RingLed:
         t = 0
         while time.time() - start_time < duration:
             # Sin wave: 0 → 1 → 0
-            for index in range(num_pixels):
+            for index in range(self.num_pixels):
                 breathe = (math.sin(0.1*t) + 1) / 2
                 # Brightness scaling
                 brightness_scale = 0.2 + 0.5 * breathe  # never fully off
@@ -113,7 +118,7 @@ class RingLed:
 
                 self.pixels.show()
                 t += 0.08
-                time.sleep(delay)
+                self.sleep(delay)
         self.pixels.brightness = original_brightness  # RESTORE
 
     def game_win(self):
@@ -136,17 +141,18 @@ class RingLed:
         return()
 
 
-player = RingLed(pixel_pin, num_pixels, ORDER)
-while True:
-    #LED Pattern for player Victory
-    #player.under_attack()
- #   time.sleep(0.25)
-    #player.game_win()
-   # time.sleep(0.25)
-    #player.game_lose()
-    #time.sleep(0.25)
-    player.game_draw()
-    #time.sleep(0.25)
-    #player.under_attack()
-    #time.sleep(0.25)
-    #player.thinking()
\ No newline at end of file
+if __name__ == '__main__':
+    player = RingLed(pixel_pin, num_pixels, ORDER)
+    while True:
+        #LED Pattern for player Victory
+        #player.under_attack()
+     #   time.sleep(0.25)
+        #player.game_win()
+       # time.sleep(0.25)
+        #player.game_lose()
+        #time.sleep(0.25)
+        player.game_draw()
+        #time.sleep(0.25)
+        #player.under_attack()
+        #time.sleep(0.25)
+        #player.thinking()
\ No newline at end of file